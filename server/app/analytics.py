@@ -0,0 +1,237 @@
+"""Time-bucketed rollups of views, reactions and comments per post and per category.
+
+Activity is summed in memory per (post, minute) and flushed every
+``ANALYTICS_FLUSH_INTERVAL`` seconds as one unordered bulk of ``$inc`` upserts
+into minute, hour and day buckets, for the post and for its category. The
+number of writes therefore follows the number of active posts, not events.
+Views and reactions arrive already batched from the write-behind counters'
+flush listeners; comments are recorded as they are added.
+
+Minute and hour buckets carry an ``expires_at`` for the TTL index; day buckets
+are kept. Workers each flush their own buffer; ``$inc`` makes that safe.
+
+A failed flush keeps only the bucket updates that were not applied and retries
+them under the same exponential backoff as the write-behind counters. While
+flushes keep failing, new activity past ``ANALYTICS_MAX_PENDING`` entries is
+dropped and counted in ``write_behind_dropped_total{buffer="rollups"}``.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .archive import ARCHIVE_COLLECTION
+from .cache import TTLCache
+from .counters import FlushBackoff, failed_indexes
+from .metrics import WRITE_BEHIND_DROPPED
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+METRICS = ("views", "likes", "dislikes", "comments")
+
+# Granularity -> bucket length; retention comes from settings (None = kept).
+GRANULARITIES = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+# (post id, minute bucket start) -> metric -> delta
+Pending = Dict[Tuple[ObjectId, datetime], Dict[str, int]]
+# (bucket filter, update, failed attempts) of a bucket update to write again.
+Retry = Tuple[Dict[str, Any], Dict[str, Any], int]
+
+
+def bucket_start(moment: datetime, granularity: str) -> datetime:
+    if granularity == "minute":
+        return moment.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def retention(granularity: str) -> Optional[timedelta]:
+    if granularity == "minute":
+        return timedelta(hours=settings.ANALYTICS_MINUTE_RETENTION_HOURS)
+    if granularity == "hour":
+        return timedelta(days=settings.ANALYTICS_HOUR_RETENTION_DAYS)
+    return None
+
+
+class RollupWriter:
+    def __init__(self) -> None:
+        self._pending: Pending = {}
+        # post id -> category ("" when uncategorized), so flushes rarely need a lookup.
+        self._categories: TTLCache[str] = TTLCache(settings.ANALYTICS_CATEGORY_CACHE_SIZE, ttl=3600)
+        self._retry: List[Retry] = []
+        self._backoff = FlushBackoff(settings.ANALYTICS_FLUSH_INTERVAL, settings.FLUSH_RETRY_MAX_DELAY)
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending) + len(self._retry)
+
+    def record(self, post_id: ObjectId, metric: str, amount: int = 1, *, at: Optional[datetime] = None) -> None:
+        if not settings.ANALYTICS_ENABLED or not amount:
+            return
+        if self._backoff.failing and self.pending_count >= settings.ANALYTICS_MAX_PENDING:
+            WRITE_BEHIND_DROPPED.inc("rollups", amount=abs(amount))
+            return
+        minute = bucket_start(at or datetime.utcnow(), "minute")
+        metrics = self._pending.setdefault((post_id, minute), {})
+        metrics[metric] = metrics.get(metric, 0) + amount
+
+    async def on_counter_flush(self, batch: Dict[ObjectId, Dict[str, int]]) -> None:
+        now = datetime.utcnow()
+        for post_id, deltas in batch.items():
+            for metric, amount in deltas.items():
+                if metric in METRICS:
+                    self.record(post_id, metric, amount, at=now)
+
+    def forget_category(self, post_id: ObjectId) -> None:
+        self._categories.pop(post_id)
+
+    async def _resolve_categories(self, post_ids: Iterable[ObjectId]) -> Dict[ObjectId, str]:
+        assert self._db is not None
+        categories: Dict[ObjectId, str] = {}
+        unknown: List[ObjectId] = []
+        for post_id in post_ids:
+            cached = self._categories.get(post_id)
+            if cached is None:
+                unknown.append(post_id)
+            else:
+                categories[post_id] = cached
+        for collection in ("posts", ARCHIVE_COLLECTION):
+            if not unknown:
+                break
+            async for post in self._db[collection].find({"_id": {"$in": unknown}}, {"category": 1}):
+                categories[post["_id"]] = post.get("category") or ""
+                self._categories.set(post["_id"], categories[post["_id"]])
+            unknown = [post_id for post_id in unknown if post_id not in categories]
+        return categories
+
+    def _updates(self, batch: Pending, categories: Dict[ObjectId, str]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        # (granularity, scope, key, bucket start) -> metric -> delta
+        merged: Dict[Tuple[str, str, Any, datetime], Dict[str, int]] = {}
+        for (post_id, minute), deltas in batch.items():
+            category = categories.get(post_id, "")
+            for granularity in GRANULARITIES:
+                start = bucket_start(minute, granularity)
+                keys = [(granularity, "post", post_id, start)]
+                if category:
+                    keys.append((granularity, "category", category, start))
+                for key in keys:
+                    target = merged.setdefault(key, {})
+                    for metric, amount in deltas.items():
+                        target[metric] = target.get(metric, 0) + amount
+
+        updates = []
+        for (granularity, scope, key, start), deltas in merged.items():
+            on_insert: Dict[str, Any] = {}
+            keep_for = retention(granularity)
+            if keep_for is not None:
+                on_insert["expires_at"] = start + GRANULARITIES[granularity] + keep_for
+            if scope == "post":
+                # Lets trending filter by category without joining posts.
+                on_insert["category"] = categories.get(key) or None
+            update: Dict[str, Any] = {"$inc": deltas}
+            if on_insert:
+                update["$setOnInsert"] = on_insert
+            bucket = {"g": granularity, "scope": scope, "key": key, "t": start}
+            updates.append((bucket, update))
+        return updates
+
+    async def flush(self) -> int:
+        if self._db is None or not (self._pending or self._retry):
+            return 0
+        # Swap before awaiting so activity during the write lands in the next batch.
+        batch, self._pending = self._pending, {}
+        retry, self._retry = self._retry, []
+        try:
+            categories = await self._resolve_categories({post_id for post_id, _ in batch})
+        except Exception:
+            self._backoff.failed()
+            logger.exception("Failed to resolve rollup categories; retrying in %.1fs", self._backoff.delay())
+            self._retry = retry + self._retry
+            for key, deltas in batch.items():
+                metrics = self._pending.setdefault(key, {})
+                for metric, amount in deltas.items():
+                    metrics[metric] = metrics.get(metric, 0) + amount
+            return 0
+        updates = retry + [(bucket, update, 0) for bucket, update in self._updates(batch, categories)]
+        operations = [UpdateOne(bucket, update, upsert=True) for bucket, update, _ in updates]
+        try:
+            await self._db[settings.ANALYTICS_COLLECTION].bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            failed = failed_indexes(exc)
+            self._backoff.failed()
+            logger.error(
+                "%d of %d rollup updates failed (%s); retrying in %.1fs",
+                len(failed),
+                len(operations),
+                exc.details.get("writeErrors", [{}])[0].get("errmsg"),
+                self._backoff.delay(),
+            )
+            self._retry_failed([updates[index] for index in sorted(failed)])
+            return len(operations) - len(failed)
+        except Exception:
+            # Nothing is known to be applied; an outage does not count against the updates.
+            self._backoff.failed()
+            logger.exception("Failed to flush analytics rollups; retrying in %.1fs", self._backoff.delay())
+            self._retry = updates + self._retry
+            return 0
+        self._backoff.succeeded()
+        return len(operations)
+
+    def _retry_failed(self, updates: List[Retry]) -> None:
+        for bucket, update, attempts in updates:
+            attempts += 1
+            if attempts >= settings.FLUSH_RETRY_ATTEMPTS:
+                logger.error("Dropping rollup update for %s after %d failed attempts", bucket, attempts)
+                WRITE_BEHIND_DROPPED.inc("rollups", amount=sum(abs(amount) for amount in update["$inc"].values()))
+                continue
+            self._retry.append((bucket, update, attempts))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._backoff.delay())
+            await self.flush()
+
+    async def ensure_indexes(self, db: AsyncIOMotorDatabase) -> None:
+        await db[settings.ANALYTICS_COLLECTION].create_indexes(
+            [
+                # Upsert target and time-series reads for one post or category.
+                IndexModel(
+                    [("scope", ASCENDING), ("key", ASCENDING), ("g", ASCENDING), ("t", ASCENDING)],
+                    name="scope_key_g_t",
+                    unique=True,
+                ),
+                # Trending: every post bucket of one granularity inside a window.
+                IndexModel([("g", ASCENDING), ("scope", ASCENDING), ("t", DESCENDING)], name="g_scope_t"),
+                IndexModel([("expires_at", ASCENDING)], name="expires_at", expireAfterSeconds=0),
+            ]
+        )
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        if not settings.ANALYTICS_ENABLED:
+            return
+        self._db = db
+        await self.ensure_indexes(db)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+rollups = RollupWriter()
@@ -0,0 +1,104 @@
+"""Hot/cold tiering: old, idle posts move from ``posts`` to ``posts_archive``.
+
+``archive_posts`` copies a batch into the archive before deleting it from the
+hot collection, so a post is always in at least one of them. Archived bodies
+are zlib-compressed when ``ARCHIVE_COMPRESS_BODY`` is set. Reads by id fall
+back to the archive and views keep counting there; any write to an archived
+post first restores it, which also resets its idle clock. Comments stay in ``comments`` either way.
+"""
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import Binary, ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+from pymongo.errors import DuplicateKeyError
+
+from .counters import archive_view_counter
+from .ranking import SCORE_FIELD, popularity_score
+from .settings import settings
+
+ARCHIVE_COLLECTION = "posts_archive"
+COMPRESSED_BODY = "body_z"
+ARCHIVED_AT = "archived_at"
+
+
+def archive_cutoffs(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Posts older than ``ARCHIVE_AFTER_DAYS`` with no activity for ``ARCHIVE_IDLE_DAYS``."""
+    now = now or datetime.utcnow()
+    return {
+        "created_at": {"$lt": now - timedelta(days=settings.ARCHIVE_AFTER_DAYS)},
+        "updated_at": {"$lt": now - timedelta(days=settings.ARCHIVE_IDLE_DAYS)},
+    }
+
+
+def pack(post: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    doc = {**post, ARCHIVED_AT: now}
+    # Archived posts never rank; drop the score so it cannot leak back on restore.
+    doc.pop(SCORE_FIELD, None)
+    if settings.ARCHIVE_COMPRESS_BODY and isinstance(doc.get("body"), str):
+        doc[COMPRESSED_BODY] = Binary(zlib.compress(doc.pop("body").encode("utf-8")))
+    return doc
+
+
+def unpack(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Archive document -> post document; ``archived_at`` is kept so responses can flag it."""
+    if COMPRESSED_BODY in doc:
+        doc["body"] = zlib.decompress(doc.pop(COMPRESSED_BODY)).decode("utf-8")
+    return doc
+
+
+async def archive_posts(
+    db: AsyncIOMotorDatabase, *, batch_size: int, now: Optional[datetime] = None, dry_run: bool = False
+) -> int:
+    """Archive one batch of eligible posts; returns how many moved (or would move)."""
+    now = now or datetime.utcnow()
+    query = archive_cutoffs(now)
+    posts = await db["posts"].find(query).sort("created_at", 1).limit(batch_size).to_list(length=batch_size)
+    if dry_run or not posts:
+        return len(posts)
+    ids = [post["_id"] for post in posts]
+    # Replace, not insert, so a batch interrupted after this step can simply be rerun.
+    await db[ARCHIVE_COLLECTION].bulk_write(
+        [ReplaceOne({"_id": post["_id"]}, pack(post, now), upsert=True) for post in posts], ordered=False
+    )
+    # Repeating the cutoffs keeps posts written to since they were read in the hot collection.
+    result = await db["posts"].delete_many({"_id": {"$in": ids}, **query})
+    if result.deleted_count < len(ids):
+        kept = [post["_id"] async for post in db["posts"].find({"_id": {"$in": ids}}, {"_id": 1})]
+        await db[ARCHIVE_COLLECTION].delete_many({"_id": {"$in": kept}})
+    return result.deleted_count
+
+
+async def find_archived(
+    db: AsyncIOMotorDatabase, post_ids: List[ObjectId], projection: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    docs = await db[ARCHIVE_COLLECTION].find({"_id": {"$in": post_ids}}, projection).to_list(length=len(post_ids))
+    return [unpack(doc) for doc in docs]
+
+
+async def find_one_archived(
+    db: AsyncIOMotorDatabase, post_id: ObjectId, projection: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    docs = await find_archived(db, [post_id], projection)
+    return docs[0] if docs else None
+
+
+async def restore_post(db: AsyncIOMotorDatabase, post_id: ObjectId) -> bool:
+    """Move an archived post back to ``posts``; False if it is not archived."""
+    doc = await db[ARCHIVE_COLLECTION].find_one({"_id": post_id})
+    if doc is None:
+        return False
+    post = unpack(doc)
+    post.pop(ARCHIVED_AT, None)
+    # Views buffered for the archive document would be flushed into a deleted document.
+    post["views"] = post.get("views", 0) + archive_view_counter.pending(post_id, "views")
+    post["updated_at"] = datetime.utcnow()
+    post[SCORE_FIELD] = popularity_score(post)
+    try:
+        await db["posts"].insert_one(post)
+    except DuplicateKeyError:
+        pass  # a concurrent request restored it first
+    await db[ARCHIVE_COLLECTION].delete_one({"_id": post_id})
+    return True
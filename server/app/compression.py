@@ -0,0 +1,148 @@
+"""``Accept-Encoding`` negotiation and gzip/brotli/zstd response compression.
+
+``CompressionMiddleware`` compresses single-message responses (everything
+except streams such as SSE and ranged media) above ``COMPRESSION_MIN_SIZE``.
+Cached responses skip it: ``response_cache`` keeps each compressed variant
+next to the identity body, so a hot list is compressed once per encoding.
+Bodies above ``COMPRESSION_THREAD_THRESHOLD`` are compressed in a worker
+thread; all three codecs release the GIL while they run.
+
+brotli and zstd are used when their packages are importable; gzip always is.
+"""
+import asyncio
+import gzip
+from typing import Callable, Dict, List, Optional
+
+from .settings import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def _gzip(body: bytes, level: Optional[int] = None) -> bytes:
+    return gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL if level is None else level, mtime=0)
+
+
+def _brotli(body: bytes, level: Optional[int] = None) -> bytes:
+    return brotli.compress(body, quality=settings.COMPRESSION_BROTLI_LEVEL if level is None else level)
+
+
+def _zstd(body: bytes, level: Optional[int] = None) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL if level is None else level).compress(body)
+
+
+CODECS: Dict[str, Callable[..., bytes]] = {"gzip": _gzip}
+if brotli is not None:
+    CODECS["br"] = _brotli
+if zstandard is not None:
+    CODECS["zstd"] = _zstd
+
+
+def server_preference() -> List[str]:
+    return [name.strip() for name in settings.COMPRESSION_ENCODINGS.split(",") if name.strip() in CODECS]
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the encoding the client weights highest, breaking ties by server preference."""
+    if not accept_encoding or not settings.COMPRESSION_ENABLED:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name.strip().lower()] = quality
+    best: Optional[str] = None
+    best_quality = 0.0
+    for name in server_preference():
+        quality = weights.get(name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+def is_compressible(content_type: str, size: int) -> bool:
+    return size >= settings.COMPRESSION_MIN_SIZE and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+async def compress(encoding: str, body: bytes) -> bytes:
+    if len(body) >= settings.COMPRESSION_THREAD_THRESHOLD:
+        return await asyncio.to_thread(CODECS[encoding], body)
+    return CODECS[encoding](body)
+
+
+def _vary(headers: List, value: bytes = b"accept-encoding") -> List:
+    for index, (name, existing) in enumerate(headers):
+        if name.lower() == b"vary":
+            if value not in existing.lower():
+                headers[index] = (name, existing + b", " + value)
+            return headers
+    return headers + [(b"vary", value)]
+
+
+class CompressionMiddleware:
+    """Pure ASGI so streaming responses pass through untouched."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+        accept = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = negotiate(accept)
+
+        start_message: Optional[dict] = None
+
+        async def send_wrapper(message) -> None:
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body shows whether this is a single-message response.
+                start_message = message
+                return
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+            start, start_message = start_message, None
+            headers = list(start.get("headers", []))
+            header_map = {name.lower(): value for name, value in headers}
+            body = message.get("body", b"")
+            content_type = header_map.get(b"content-type", b"").decode("latin-1")
+            if (
+                message.get("more_body")
+                or b"content-encoding" in header_map
+                or start["status"] < 200
+                or start["status"] in (204, 206, 304)
+                or not is_compressible(content_type, len(body))
+            ):
+                await send(start)
+                await send(message)
+                return
+            headers = _vary(headers)
+            if encoding is not None:
+                body = await compress(encoding, body)
+                headers = [(name, value) for name, value in headers if name.lower() != b"content-length"]
+                headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(body)).encode())]
+            await send({**start, "headers": headers})
+            await send({**message, "body": body})
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from .metrics import WRITE_BEHIND_DROPPED
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def failed_indexes(error: BulkWriteError) -> Set[int]:
+    """Positions of the operations an unordered bulk_write did not apply; the others were."""
+    return {write_error["index"] for write_error in error.details.get("writeErrors", [])}
+
+
+class FlushBackoff:
+    """Doubles the delay between flush attempts while they keep failing, up to ``max_delay``."""
+
+    def __init__(self, interval: float, max_delay: float) -> None:
+        self.interval = interval
+        self.max_delay = max_delay
+        self.failures = 0
+
+    @property
+    def failing(self) -> bool:
+        return self.failures > 0
+
+    def delay(self) -> float:
+        if not self.failures:
+            return self.interval
+        return min(self.interval * 2 ** min(self.failures, 16), self.max_delay)
+
+    def failed(self) -> None:
+        self.failures += 1
+
+    def succeeded(self) -> None:
+        self.failures = 0
+
+
+class WriteBehindCounter:
+    """Buffers ``$inc`` deltas per document and flushes them with one bulk_write.
+
+    A flush happens every ``interval`` seconds, as soon as ``max_pending``
+    increments are buffered, and once more on shutdown. ``max_pending`` is
+    therefore about the most increments a crashed process can lose.
+
+    When a flush fails, only the updates that were not applied go back into the
+    buffer and the next attempts back off exponentially. While flushes keep
+    failing, increments that would grow the buffer past ``max_pending`` are
+    dropped and counted in ``write_behind_dropped_total``. An update that keeps
+    failing on its own (a write error, not an outage) is dropped after
+    ``FLUSH_RETRY_ATTEMPTS`` tries.
+    """
+
+    def __init__(self, name: str, collection: str, *, interval: float, max_pending: int) -> None:
+        self.name = name
+        self.collection = collection
+        self.interval = interval
+        self.max_pending = max_pending
+        self._pending: Dict[ObjectId, Dict[str, int]] = {}
+        self._pending_total = 0
+        # Failed write attempts per document, for updates that hit a write error.
+        self._attempts: Dict[ObjectId, int] = {}
+        self._backoff = FlushBackoff(interval, settings.FLUSH_RETRY_MAX_DELAY)
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+        # Called with each successfully written batch, e.g. to broadcast counter deltas.
+        self.flush_listeners: List[Callable[[Dict[ObjectId, Dict[str, int]]], Awaitable[None]]] = []
+
+    def increment(self, doc_id: ObjectId, field: str, amount: int = 1) -> None:
+        if self._backoff.failing and self._pending_total >= self.max_pending:
+            WRITE_BEHIND_DROPPED.inc(self.name, amount=abs(amount))
+            return
+        self._add(doc_id, field, amount)
+        if self._pending_total >= self.max_pending:
+            self._wake.set()
+
+    def _add(self, doc_id: ObjectId, field: str, amount: int) -> None:
+        fields = self._pending.setdefault(doc_id, {})
+        fields[field] = fields.get(field, 0) + amount
+        self._pending_total += abs(amount)
+
+    def _requeue(self, items: Iterable[Tuple[ObjectId, Dict[str, int]]]) -> None:
+        # Owed increments go back even past max_pending; only new ones are dropped.
+        for doc_id, fields in items:
+            for field, amount in fields.items():
+                self._add(doc_id, field, amount)
+
+    def pending(self, doc_id: ObjectId, field: str) -> int:
+        return self._pending.get(doc_id, {}).get(field, 0)
+
+    async def flush(self) -> int:
+        if self._db is None or not self._pending:
+            return 0
+        # Swap the buffer before awaiting so increments during the write land in the next batch.
+        batch, self._pending, self._pending_total = self._pending, {}, 0
+        items = list(batch.items())
+        operations = [UpdateOne({"_id": doc_id}, {"$inc": fields}) for doc_id, fields in items]
+        try:
+            await self._db[self.collection].bulk_write(operations, ordered=False)
+        except BulkWriteError as exc:
+            failed = failed_indexes(exc)
+            self._backoff.failed()
+            logger.error(
+                "%d of %d %s counter updates failed (%s); retrying in %.1fs",
+                len(failed),
+                len(operations),
+                self.name,
+                exc.details.get("writeErrors", [{}])[0].get("errmsg"),
+                self._backoff.delay(),
+            )
+            self._retry_failed(items[index] for index in sorted(failed))
+            written = {doc_id: fields for index, (doc_id, fields) in enumerate(items) if index not in failed}
+        except Exception:
+            # Nothing is known to be applied; the driver already retried once (retryable writes).
+            self._backoff.failed()
+            logger.exception("Failed to flush %s counters; retrying in %.1fs", self.name, self._backoff.delay())
+            self._requeue(items)
+            return 0
+        else:
+            self._backoff.succeeded()
+            written = batch
+        for doc_id in written:
+            self._attempts.pop(doc_id, None)
+        if written:
+            for listener in self.flush_listeners:
+                try:
+                    await listener(written)
+                except Exception:
+                    logger.exception("%s counter flush listener failed", self.name)
+        return len(written)
+
+    def _retry_failed(self, items: Iterable[Tuple[ObjectId, Dict[str, int]]]) -> None:
+        retry = []
+        for doc_id, fields in items:
+            attempts = self._attempts.get(doc_id, 0) + 1
+            if attempts >= settings.FLUSH_RETRY_ATTEMPTS:
+                self._attempts.pop(doc_id, None)
+                logger.error("Dropping %s counter update for %s after %d failed attempts", self.name, doc_id, attempts)
+                WRITE_BEHIND_DROPPED.inc(self.name, amount=sum(abs(amount) for amount in fields.values()))
+                continue
+            self._attempts[doc_id] = attempts
+            retry.append((doc_id, fields))
+        self._requeue(retry)
+
+    async def _run(self) -> None:
+        while True:
+            if self._backoff.failing:
+                # Early wake-ups would turn an outage into a hot retry loop.
+                await asyncio.sleep(self._backoff.delay())
+            else:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wake.clear()
+            await self.flush()
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._db = db
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+view_counter = WriteBehindCounter(
+    "views",
+    "posts",
+    interval=settings.VIEW_FLUSH_INTERVAL,
+    max_pending=settings.VIEW_FLUSH_MAX_PENDING,
+)
+
+# Views of archived posts are counted in place; a view alone does not restore a post.
+archive_view_counter = WriteBehindCounter(
+    "archive_views",
+    "posts_archive",
+    interval=settings.VIEW_FLUSH_INTERVAL,
+    max_pending=settings.VIEW_FLUSH_MAX_PENDING,
+)
+
+reaction_counter = WriteBehindCounter(
+    "reactions",
+    "posts",
+    interval=settings.REACTION_FLUSH_INTERVAL,
+    max_pending=settings.REACTION_FLUSH_MAX_PENDING,
+)
@@ -1,9 +1,82 @@
-from typing import Optional
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
 
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel, monitoring, read_preferences
 
+from .metrics import MongoCommandMetrics
 from .settings import settings
 
+logger = logging.getLogger(__name__)
+
+
+class SlowCommandLogger(monitoring.CommandListener):
+    """Logs commands that take longer than ``MONGO_SLOW_QUERY_MS``."""
+
+    def __init__(self, threshold_ms: int) -> None:
+        self.threshold_ms = threshold_ms
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        duration_ms = event.duration_micros / 1000
+        if duration_ms >= self.threshold_ms:
+            logger.warning("Slow Mongo %s took %.1f ms (request %s)", event.command_name, duration_ms, event.request_id)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        pass
+
+
+def client_options() -> Dict[str, Any]:
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+    }
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    listeners: List[monitoring.CommandListener] = []
+    if settings.MONGO_SLOW_QUERY_MS:
+        listeners.append(SlowCommandLogger(settings.MONGO_SLOW_QUERY_MS))
+    if settings.METRICS_ENABLED:
+        listeners.append(MongoCommandMetrics())
+    if listeners:
+        options["event_listeners"] = listeners
+    return options
+
+
+READ_PREFERENCES = {
+    "primary": read_preferences.Primary,
+    "primaryPreferred": read_preferences.PrimaryPreferred,
+    "secondary": read_preferences.Secondary,
+    "secondaryPreferred": read_preferences.SecondaryPreferred,
+    "nearest": read_preferences.Nearest,
+}
+
+
+def read_preference() -> read_preferences._ServerMode:
+    """``MONGO_READ_PREFERENCE`` with its staleness bound, for reads that tolerate lag."""
+    mode = READ_PREFERENCES.get(settings.MONGO_READ_PREFERENCE)
+    if mode is None:
+        raise ValueError(f"Unknown MONGO_READ_PREFERENCE {settings.MONGO_READ_PREFERENCE!r}")
+    if mode is read_preferences.Primary:
+        return mode()
+    return mode(max_staleness=settings.MONGO_MAX_STALENESS_SECONDS)
+
+
+def stale_ok(db: AsyncIOMotorDatabase, name: str) -> AsyncIOMotorCollection:
+    """Collection handle whose reads may go to a secondary within the configured staleness.
+
+    Only for listings, where a few seconds of replication lag is already
+    hidden by the response cache TTL; lookups after a write stay on the primary.
+    """
+    return db.get_collection(name, read_preference=read_preference())
+
 
 class Mongo:
     """Holds a singleton Motor client + database reference."""
@@ -18,7 +91,7 @@ mongo = Mongo()
 async def connect_to_mongo() -> None:
     if mongo.client:
         return
-    mongo.client = AsyncIOMotorClient(settings.MONGO_URI)
+    mongo.client = AsyncIOMotorClient(settings.MONGO_URI, **client_options())
     mongo.db = mongo.client.get_default_database()
     if mongo.db is None:
         mongo.db = mongo.client["memo-app"]
@@ -36,3 +109,56 @@ async def get_db() -> AsyncIOMotorDatabase:
         await connect_to_mongo()
     assert mongo.db is not None
     return mongo.db
+
+
+async def ping(db: AsyncIOMotorDatabase, timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(db.command("ping"), timeout)
+    except Exception:
+        return False
+    return True
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """Create every index the routes rely on. Idempotent, so it runs on each startup."""
+    await db["users"].create_indexes([IndexModel([("username", ASCENDING)], name="username", unique=True)])
+    listing_indexes = [
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel([("views", DESCENDING), ("_id", DESCENDING)], name="views_id"),
+        IndexModel([("likes", DESCENDING), ("_id", DESCENDING)], name="likes_id"),
+        IndexModel(
+            [("category", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="category_created_at_id",
+        ),
+        IndexModel([("category", ASCENDING), ("views", DESCENDING), ("_id", DESCENDING)], name="category_views_id"),
+        IndexModel([("category", ASCENDING), ("likes", DESCENDING), ("_id", DESCENDING)], name="category_likes_id"),
+        # _id order inside each gram lets search take the newest candidates without a sort.
+        IndexModel([("search_grams", ASCENDING), ("_id", DESCENDING)], name="search_grams_id"),
+        IndexModel(
+            [("author", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="author_created_at_id",
+        ),
+    ]
+    await db["posts"].create_indexes(
+        [
+            *listing_indexes,
+            IndexModel([("hot", DESCENDING), ("_id", DESCENDING)], name="hot_id"),
+            IndexModel([("category", ASCENDING), ("hot", DESCENDING), ("_id", DESCENDING)], name="category_hot_id"),
+        ]
+    )
+    # Archived posts are listed and searched (on request) the same ways, but never ranked.
+    await db["posts_archive"].create_indexes(listing_indexes)
+    await db["comments"].create_indexes(
+        [
+            IndexModel(
+                [("post_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="post_created_at_id"
+            ),
+            IndexModel(
+                [("author", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="author_created_at_id",
+            ),
+        ]
+    )
+    await db["reactions"].create_indexes(
+        [IndexModel([("post_id", ASCENDING), ("user_id", ASCENDING)], name="post_user", unique=True)]
+    )
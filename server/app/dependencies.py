@@ -1,14 +1,26 @@
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from .cache import TTLCache
 from .database import get_db
 from .security import decode_token
+from .settings import settings
 from .utils import ensure_object_id
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Never keep password hashes around in memory.
+USER_PROJECTION = {"password": 0}
+
+# token -> (decoded payload, user document). Entries are never invalidated (the API has no
+# logout and never changes users), so a cached user is reused for the full AUTH_CACHE_TTL.
+auth_cache: TTLCache[Tuple[Dict[str, Any], Dict[str, Any]]] = TTLCache(
+    settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL
+)
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
@@ -18,6 +30,10 @@ async def get_current_user(
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No token provided")
 
     token = credentials.credentials
+    cached = auth_cache.get(token)
+    if cached is not None:
+        return cached[1]
+
     try:
         payload = decode_token(token)
     except Exception:
@@ -27,8 +43,21 @@ async def get_current_user(
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
 
-    user = await db["users"].find_one({"_id": ensure_object_id(user_id)})
+    user = await db["users"].find_one({"_id": ensure_object_id(user_id)}, USER_PROJECTION)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
 
+    # Never serve a cached entry past the token's own expiry.
+    remaining = payload["exp"] - time.time() if "exp" in payload else settings.AUTH_CACHE_TTL
+    auth_cache.set(token, (payload, user), ttl=remaining)
     return user
+
+
+async def get_optional_user(
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db=Depends(get_db),
+) -> Optional[Dict[str, Any]]:
+    """The caller's user when a token is sent (a bad token is still a 401), else None."""
+    if credentials is None:
+        return None
+    return await get_current_user(credentials, db)
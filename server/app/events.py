@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Dict, Optional, Set
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+RESYNC_EVENT = {"type": "resync"}
+SHUTDOWN_EVENT = {"type": "shutdown"}
+
+# The oplog no longer holds the change stream's resume point.
+CHANGE_STREAM_HISTORY_LOST = 286
+
+INSERTS = [{"$match": {"operationType": "insert"}}]
+
+
+class Subscriber:
+    """One connected client. Its queue is bounded so a slow reader cannot grow memory.
+
+    Shutdown bypasses the queue: ``close`` sets a flag that ``next_event``
+    checks first, so even a client whose queue is full gets it.
+    """
+
+    def __init__(self, max_queue: int) -> None:
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self._closed = asyncio.Event()
+
+    def close(self) -> None:
+        self._closed.set()
+
+    async def next_event(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """The next queued event, ``SHUTDOWN_EVENT`` once closed, or None after ``timeout`` seconds."""
+        if self._closed.is_set():
+            return SHUTDOWN_EVENT
+        if not self.queue.empty():
+            return self.queue.get_nowait()
+        getter = asyncio.ensure_future(self.queue.get())
+        closed = asyncio.ensure_future(self._closed.wait())
+        done, pending = await asyncio.wait({getter, closed}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+        if closed in done:
+            return SHUTDOWN_EVENT
+        return getter.result() if getter in done else None
+
+    def offer(self, event: Dict[str, Any]) -> None:
+        if self._closed.is_set():
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog and ask the client to refetch instead of blocking publishers.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+
+class EventBroker:
+    """In-process pub/sub for change events, optionally shared across workers.
+
+    With ``EVENTS_BACKEND=mongo`` every event is also appended to a capped
+    collection that each worker follows with a change stream, so clients
+    connected to any worker see changes made through the others. Change
+    streams resume from the last seen token in oplog order; ObjectIds from
+    different processes are not ordered, so an ``_id`` cursor could skip
+    events when it reopens. They need a replica set (one node is enough).
+    """
+
+    def __init__(self) -> None:
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._subscribers: Set[Subscriber] = set()
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._tail_task: Optional[asyncio.Task] = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(settings.EVENTS_QUEUE_SIZE)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    def _deliver(self, event: Dict[str, Any]) -> None:
+        for subscriber in self._subscribers:
+            subscriber.offer(event)
+
+    async def publish(self, event: Dict[str, Any]) -> None:
+        self._deliver(event)
+        if self._db is not None:
+            try:
+                await self._db[settings.EVENTS_COLLECTION].insert_one({"origin": self.origin, "event": event})
+            except Exception:
+                logger.exception("Failed to forward %s event to other workers", event.get("type"))
+
+    async def _ensure_capped_collection(self) -> None:
+        assert self._db is not None
+        try:
+            await self._db.create_collection(
+                settings.EVENTS_COLLECTION, capped=True, size=settings.EVENTS_CAPPED_BYTES
+            )
+        except CollectionInvalid:
+            pass  # already exists
+
+    def _deliver_remote(self, change: Dict[str, Any]) -> None:
+        doc = change["fullDocument"]
+        if doc.get("origin") != self.origin:
+            self._deliver(doc["event"])
+
+    async def _tail(self, resume_token: Optional[Dict[str, Any]]) -> None:
+        assert self._db is not None
+        collection = self._db[settings.EVENTS_COLLECTION]
+        while True:
+            try:
+                async with collection.watch(INSERTS, resume_after=resume_token) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        self._deliver_remote(change)
+            except asyncio.CancelledError:
+                raise
+            except OperationFailure as exc:
+                if exc.code != CHANGE_STREAM_HISTORY_LOST:
+                    logger.exception("Event change stream failed; resuming")
+                else:
+                    # Events in between are gone; start from now and have clients refetch.
+                    logger.warning("Event change stream fell off the oplog; resyncing clients")
+                    resume_token = None
+                    self._deliver(RESYNC_EVENT)
+            except Exception:
+                logger.exception("Event change stream failed; resuming")
+            await asyncio.sleep(1)
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        if settings.EVENTS_BACKEND != "mongo":
+            return
+        hello = await db.client.admin.command("hello")
+        if "setName" not in hello and hello.get("msg") != "isdbgrid":
+            raise RuntimeError("EVENTS_BACKEND=mongo needs a replica set or sharded cluster for change streams")
+        self._db = db
+        await self._ensure_capped_collection()
+        # Opened here so events published once start() returns are never missed.
+        async with db[settings.EVENTS_COLLECTION].watch(INSERTS, max_await_time_ms=100) as stream:
+            change = await stream.try_next()
+            if change is not None:
+                self._deliver_remote(change)
+            resume_token = stream.resume_token
+        self._tail_task = asyncio.create_task(self._tail(resume_token))
+
+    async def stop(self) -> None:
+        if self._tail_task is not None:
+            self._tail_task.cancel()
+            try:
+                await self._tail_task
+            except asyncio.CancelledError:
+                pass
+            self._tail_task = None
+        self._db = None
+        self.close_streams()
+
+    def close_streams(self) -> None:
+        """Tell every connected client to go away; EventSource reconnects to another worker."""
+        for subscriber in self._subscribers:
+            subscriber.close()
+
+
+broker = EventBroker()
+
+
+async def publish_counter_deltas(batch: Dict[ObjectId, Dict[str, int]]) -> None:
+    await broker.publish(
+        {"type": "counters", "posts": {str(post_id): deltas for post_id, deltas in batch.items()}}
+    )
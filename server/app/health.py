@@ -0,0 +1,92 @@
+"""Liveness, readiness and warm-up state for one worker.
+
+A worker is live while its event loop answers ``/livez``. It is ready once
+warm-up has run and until a drain starts, and only while Mongo answers a ping
+within ``READY_PING_TIMEOUT``; load balancers route on ``/readyz``.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List
+
+from .database import get_db, ping
+from .events import broker
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class Health:
+    def __init__(self) -> None:
+        self.warmed_up = False
+        self.draining = False
+
+    async def readiness(self) -> Dict[str, Any]:
+        checks = {
+            "warmedUp": self.warmed_up,
+            "draining": self.draining,
+            "mongo": await ping(await get_db(), settings.READY_PING_TIMEOUT),
+        }
+        return {"ok": checks["warmedUp"] and not checks["draining"] and checks["mongo"], **checks}
+
+    def start_drain(self) -> None:
+        """Fail readiness and end event streams so connections close before the listener does."""
+        if self.draining:
+            return
+        self.draining = True
+        broker.close_streams()
+
+
+health = Health()
+
+
+def warmup_paths() -> List[str]:
+    return [path.strip() for path in settings.WARMUP_PATHS.split(",") if path.strip()]
+
+
+async def _replay(app, path: str) -> int:
+    """Run one GET through the full middleware stack in-process; returns the status code."""
+    raw_path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": raw_path,
+        "raw_path": raw_path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", b"warmup")],
+        "client": ("127.0.0.1", 0),
+        "server": ("warmup", 80),
+    }
+    status = 0
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def warm_up(app) -> None:
+    """Open pool connections and fill the response cache for the hottest pages.
+
+    Failures are logged, not raised: a cold worker is still better than none.
+    """
+    paths = warmup_paths()
+    try:
+        statuses = await asyncio.wait_for(
+            asyncio.gather(*(_replay(app, path) for path in paths)), settings.WARMUP_TIMEOUT
+        )
+        for path, status in zip(paths, statuses):
+            if status >= 400:
+                logger.warning("Warm-up request %s answered %d", path, status)
+    except Exception:
+        logger.exception("Warm-up did not finish; serving cold")
+    health.warmed_up = True
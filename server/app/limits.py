@@ -0,0 +1,216 @@
+"""Per-client token-bucket rate limits and global load shedding.
+
+Rate limits are FastAPI dependencies: ``Depends(rate_limit("login"))`` keys
+the bucket by client IP, ``rate_limit("comments", per_user=True)`` by the
+authenticated user id and ``rate_limit("views", per_viewer=True)`` by the user
+id when a valid token is sent, else by IP under the ``<name>_anonymous`` rule.
+Each rule comes from a ``RATE_LIMIT_<NAME>`` setting of
+the form ``"<burst>/<seconds>"``: up to ``burst`` requests at once, refilled
+at ``burst`` per ``seconds``. Buckets live in process memory, or with
+``RATE_LIMIT_BACKEND=mongo`` in a collection shared by all workers.
+
+``LoadShedMiddleware`` caps requests in flight at ``SHED_MAX_CONCURRENCY``.
+A request that cannot start within ``SHED_MAX_QUEUE_MS`` gets an immediate
+503 instead of queueing behind the backlog.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from starlette.responses import JSONResponse
+
+from .cache import TTLCache
+from .database import get_db
+from .dependencies import bearer_scheme, get_current_user
+from .metrics import LOAD_SHED, RATE_LIMITED
+from .settings import settings
+
+
+class Rule(NamedTuple):
+    burst: float
+    per_second: float
+
+
+def parse_rule(spec: str) -> Optional[Rule]:
+    """``"10/60"`` -> burst 10, refilled at 10 per 60 seconds. Empty or ``0`` disables the rule."""
+    if not spec or spec.strip() in ("0", "off"):
+        return None
+    burst, _, seconds = spec.partition("/")
+    return Rule(float(burst), float(burst) / float(seconds or 1))
+
+
+def _refill(tokens: float, updated: float, now: float, rule: Rule) -> float:
+    return min(rule.burst, tokens + (now - updated) * rule.per_second)
+
+
+class MemoryStore:
+    def __init__(self, max_size: int) -> None:
+        # key -> (tokens, updated); an idle bucket expires once it would be full again.
+        self._buckets: TTLCache[Tuple[float, float]] = TTLCache(max_size, ttl=24 * 3600)
+
+    async def take(self, key: str, rule: Rule, now: float, cost: int = 1) -> float:
+        """Consume ``cost`` tokens; returns 0 when allowed, else seconds until they are available."""
+        tokens, updated = self._buckets.get(key) or (rule.burst, now)
+        tokens = _refill(tokens, updated, now, rule)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self._buckets.set(key, (tokens, now), ttl=(rule.burst - tokens) / rule.per_second + 1)
+        return 0.0 if allowed else (cost - tokens) / rule.per_second
+
+
+class MongoStore:
+    """Buckets as documents, refilled and consumed atomically by a pipeline update."""
+
+    def __init__(self, collection: str) -> None:
+        self.collection = collection
+        self._db: Optional[AsyncIOMotorDatabase] = None
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._db = db
+        await db[self.collection].create_index("expires_at", name="expires_at", expireAfterSeconds=0)
+
+    async def take(self, key: str, rule: Rule, now: float, cost: int = 1) -> float:
+        assert self._db is not None
+        refilled = {
+            "$min": [
+                rule.burst,
+                {
+                    "$add": [
+                        {"$ifNull": ["$tokens", rule.burst]},
+                        {"$multiply": [{"$subtract": [now, {"$ifNull": ["$updated", now]}]}, rule.per_second]},
+                    ]
+                },
+            ]
+        }
+        pipeline = [
+            {"$set": {"tokens": refilled, "updated": now}},
+            {"$set": {"allowed": {"$gte": ["$tokens", cost]}}},
+            {
+                "$set": {
+                    "tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", cost]}, "$tokens"]},
+                    "expires_at": datetime.utcnow() + timedelta(seconds=rule.burst / rule.per_second + 1),
+                }
+            },
+        ]
+        bucket = await self._db[self.collection].find_one_and_update(
+            {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return 0.0 if bucket["allowed"] else (cost - bucket["tokens"]) / rule.per_second
+
+
+class RateLimiter:
+    def __init__(self) -> None:
+        self.store: Any = MemoryStore(settings.RATE_LIMIT_STORE_SIZE)
+        self._rules: Dict[str, Optional[Rule]] = {}
+
+    async def start(self, db: AsyncIOMotorDatabase) -> None:
+        if settings.RATE_LIMIT_BACKEND == "mongo":
+            store = MongoStore(settings.RATE_LIMIT_COLLECTION)
+            await store.start(db)
+            self.store = store
+
+    def rule(self, name: str) -> Optional[Rule]:
+        if name not in self._rules:
+            self._rules[name] = parse_rule(getattr(settings, f"RATE_LIMIT_{name.upper()}", ""))
+        return self._rules[name]
+
+    async def check(self, name: str, identity: str, cost: int = 1) -> None:
+        """Charge ``cost`` requests to ``identity``'s bucket; raises 429 when they do not fit."""
+        rule = self.rule(name)
+        if not settings.RATE_LIMIT_ENABLED or rule is None:
+            return
+        retry_after = await self.store.take(f"{name}:{identity}", rule, time.time(), cost)
+        if retry_after > 0:
+            RATE_LIMITED.inc(name)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, round(retry_after)))},
+            )
+
+
+limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    # Behind a proxy run uvicorn with --proxy-headers so this is the forwarded client address.
+    return request.client.host if request.client else "unknown"
+
+
+def viewer_bucket(name: str, request: Request, user: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    """(rule, identity) for a per-viewer limit: signed-in users get their own bucket, others share their IP's."""
+    if user is not None:
+        return name, str(user["_id"])
+    return f"{name}_anonymous", client_ip(request)
+
+
+def rate_limit(name: str, *, per_user: bool = False, per_viewer: bool = False) -> Callable[..., Any]:
+    if per_viewer:
+
+        async def by_viewer(
+            request: Request,
+            credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+            db=Depends(get_db),
+        ) -> None:
+            user = None
+            if credentials is not None:
+                try:
+                    user = await get_current_user(credentials, db)
+                except HTTPException:
+                    # An expired token must not block an anonymous action; it is charged by IP.
+                    user = None
+            await limiter.check(*viewer_bucket(name, request, user))
+
+        return by_viewer
+
+    if per_user:
+
+        async def by_user(current_user=Depends(get_current_user)) -> None:
+            await limiter.check(name, str(current_user["_id"]))
+
+        return by_user
+
+    async def by_ip(request: Request) -> None:
+        await limiter.check(name, client_ip(request))
+
+    return by_ip
+
+
+class LoadShedMiddleware:
+    """Bounds concurrent requests; sheds with 503 once the queue wait passes the threshold."""
+
+    def __init__(self, app, *, exempt_prefixes: Tuple[str, ...] = ()) -> None:
+        self.app = app
+        self.exempt_prefixes = exempt_prefixes
+        self._slots = asyncio.Semaphore(settings.SHED_MAX_CONCURRENCY) if settings.SHED_MAX_CONCURRENCY else None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if (
+            self._slots is None
+            or scope["type"] != "http"
+            or scope["path"] == "/"  # health check
+            or scope["path"].startswith(self.exempt_prefixes)
+        ):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=settings.SHED_MAX_QUEUE_MS / 1000)
+        except asyncio.TimeoutError:
+            LOAD_SHED.inc()
+            response = JSONResponse(
+                {"detail": "Server busy, try again"},
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._slots.release()
@@ -1,28 +1,70 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from .database import close_mongo_connection, connect_to_mongo
-from .routes import auth, posts
+from .analytics import rollups
+from .compression import CompressionMiddleware
+from .counters import archive_view_counter, reaction_counter, view_counter
+from .database import close_mongo_connection, connect_to_mongo, ensure_indexes, get_db, read_preference
+from .dependencies import auth_cache
+from .events import broker, publish_counter_deltas
+from .health import health, warm_up
+from .limits import LoadShedMiddleware, limiter
+from .metrics import MetricsMiddleware, register_gauge, render_metrics
+from .ranking import ranker
+from .response_cache import response_cache
+from .responses import FastJSONResponse
+from .media import shutdown_media_pool
+from .routes import analytics, auth, batch, events, media, posts, reactions, users
+from .security import shutdown_password_pool
 from .settings import settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    read_preference()  # fail fast on a bad MONGO_READ_PREFERENCE
     await connect_to_mongo()
+    db = await get_db()
+    await ensure_indexes(db)
+    await broker.start(db)
+    await limiter.start(db)
+    for counter in (view_counter, reaction_counter):
+        counter.flush_listeners = [publish_counter_deltas, ranker.on_counter_flush, rollups.on_counter_flush]
+        counter.start(db)
+    # Archived posts never rank.
+    archive_view_counter.flush_listeners = [publish_counter_deltas, rollups.on_counter_flush]
+    archive_view_counter.start(db)
+    ranker.start(db)
+    await rollups.start(db)
+    await warm_up(app)
     try:
         yield
     finally:
+        health.start_drain()
+        await view_counter.stop()
+        await reaction_counter.stop()
+        await archive_view_counter.stop()
+        await ranker.stop()
+        # After the counters, whose final flush feeds it.
+        await rollups.stop()
+        await broker.stop()
         await close_mongo_connection()
+        shutdown_password_pool()
+        shutdown_media_pool()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Innermost, so shed 503s still get CORS headers and show up in metrics.
+# Event streams are long-lived and would pin slots forever.
+app.add_middleware(LoadShedMiddleware, exempt_prefixes=("/metrics", "/livez", "/readyz", "/api/events"))
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -30,6 +72,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+# Added last so it is the outermost middleware and times everything below it.
+app.add_middleware(MetricsMiddleware)
+
+register_gauge("auth_cache_hits", "Token cache hits.", lambda: auth_cache.stats()["hits"])
+register_gauge("auth_cache_misses", "Token cache misses.", lambda: auth_cache.stats()["misses"])
+register_gauge("auth_cache_size", "Cached tokens.", lambda: auth_cache.stats()["size"])
+register_gauge("response_cache_hits", "Response cache hits.", lambda: response_cache.backend.stats()["hits"])
+register_gauge("response_cache_misses", "Response cache misses.", lambda: response_cache.backend.stats()["misses"])
+register_gauge("response_cache_size", "Cached responses.", lambda: response_cache.backend.stats()["size"])
+register_gauge("events_subscribers", "Open event streams.", lambda: broker.subscriber_count)
+register_gauge("analytics_pending", "Buffered (post, minute) rollup entries and retried bucket updates.", lambda: rollups.pending_count)
+register_gauge("worker_ready", "Warmed up and not draining.", lambda: int(health.warmed_up and not health.draining))
 
 
 @app.get("/")
@@ -37,5 +92,27 @@ async def health_check():
     return {"ok": True, "message": "FastAPI server running"}
 
 
+@app.get("/livez", include_in_schema=False)
+async def liveness():
+    return {"ok": True}
+
+
+@app.get("/readyz", include_in_schema=False)
+async def readiness():
+    result = await health.readiness()
+    return FastJSONResponse(result, status_code=200 if result["ok"] else 503)
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(auth.router)
 app.include_router(posts.router)
+app.include_router(reactions.router)
+app.include_router(events.router)
+app.include_router(media.router)
+app.include_router(batch.router)
+app.include_router(users.router)
+app.include_router(analytics.router)
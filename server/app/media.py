@@ -0,0 +1,243 @@
+"""Content-addressed image storage with thumbnails built in a process pool.
+
+Uploads are streamed from the multipart body straight into a temp file while
+their SHA-256 is computed, so memory use does not depend on the file size.
+File writes run in the threadpool, never on the event loop. Images whose
+header declares more than ``MEDIA_MAX_PIXELS`` pixels are rejected before
+any pixel data is decoded.
+The digest names the stored file (``MEDIA_DIR/ab/<sha256>.<ext>``), which
+deduplicates identical uploads and lets them be cached forever. Each image
+gets a ``<sha256>.thumb.webp`` sibling at most ``MEDIA_THUMB_SIZE`` pixels on
+its longest side.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from multipart.multipart import MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from .settings import settings
+
+FORMAT_EXTENSIONS = {"JPEG": "jpg", "PNG": "png", "GIF": "gif", "WEBP": "webp"}
+CONTENT_TYPES = {"jpg": "image/jpeg", "png": "image/png", "gif": "image/gif", "webp": "image/webp"}
+THUMB_SUFFIX = ".thumb.webp"
+
+MEDIA_NAME = re.compile(r"^(?P<digest>[0-9a-f]{64})(?:\.(?P<ext>jpg|png|gif|webp)|\.thumb\.webp)$")
+MEDIA_URL = re.compile(r"^(?P<prefix>.*/api/media/)(?P<digest>[0-9a-f]{64})\.(?:jpg|png|gif|webp)$")
+
+_media_executor: Optional[ProcessPoolExecutor] = None
+
+
+class ImageTooLarge(ValueError):
+    """The image header declares more pixels than ``MEDIA_MAX_PIXELS``."""
+
+
+def media_path(name: str) -> str:
+    return os.path.join(settings.MEDIA_DIR, name[:2], name)
+
+
+def content_type_for(name: str) -> str:
+    return "image/webp" if name.endswith(THUMB_SUFFIX) else CONTENT_TYPES[name.rsplit(".", 1)[1]]
+
+
+def thumbnail_url_for(image_url: Optional[str]) -> Optional[str]:
+    """Thumbnail URL for an uploaded image URL (relative or absolute); None for external images."""
+    match = MEDIA_URL.match(image_url or "")
+    if not match:
+        return None
+    return f"{match['prefix']}{match['digest']}{THUMB_SUFFIX}"
+
+
+def process_image(temp_path: str, digest: str, media_dir: str, thumb_size: int, max_pixels: int) -> Dict[str, Any]:
+    """Runs in a worker process: validate, move into place and thumbnail unless already stored."""
+    from PIL import Image, ImageOps
+
+    # Backstop for decoders that grow the image past its declared size.
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(temp_path) as image:
+        ext = FORMAT_EXTENSIONS.get(image.format or "")
+        if ext is None:
+            raise ValueError(f"unsupported image format {image.format}")
+        # Image.open only parsed the header; a tiny file can declare a huge canvas.
+        width, height = image.size
+        if width * height > max_pixels:
+            raise ImageTooLarge(f"{width}x{height} exceeds {max_pixels} pixels")
+        name = f"{digest}.{ext}"
+        directory = os.path.join(media_dir, digest[:2])
+        os.makedirs(directory, exist_ok=True)
+        final_path = os.path.join(directory, name)
+        thumb_path = os.path.join(directory, digest + THUMB_SUFFIX)
+        deduplicated = os.path.exists(final_path) and os.path.exists(thumb_path)
+        if not deduplicated:
+            thumb = ImageOps.exif_transpose(image)
+            thumb.thumbnail((thumb_size, thumb_size))
+            if thumb.mode not in ("RGB", "RGBA"):
+                thumb = thumb.convert("RGBA")
+            # Write then rename so readers never see a half-written file.
+            temp_thumb = f"{thumb_path}.{os.getpid()}.tmp"
+            thumb.save(temp_thumb, "WEBP", quality=80)
+            os.replace(temp_thumb, thumb_path)
+    if deduplicated:
+        os.remove(temp_path)
+    else:
+        os.replace(temp_path, final_path)
+    return {"name": name, "width": width, "height": height, "deduplicated": deduplicated}
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _media_executor
+    if _media_executor is None:
+        _media_executor = ProcessPoolExecutor(max_workers=settings.MEDIA_WORKERS)
+    return _media_executor
+
+
+def shutdown_media_pool() -> None:
+    global _media_executor
+    if _media_executor is not None:
+        _media_executor.shutdown(wait=False, cancel_futures=True)
+        _media_executor = None
+
+
+class _FileSink:
+    """MultipartParser callbacks that stream the ``file`` part into a temp file.
+
+    The callbacks only hash and buffer the part's data; ``flush`` writes the
+    buffer out in the threadpool after each chunk the parser consumed.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.path: Optional[str] = None
+        self.size = 0
+        self.hasher = hashlib.sha256()
+        self._handle = None
+        self._started = False
+        self._receiving = False
+        self._pending: List[bytes] = []
+        self._headers: Dict[bytes, bytes] = {}
+        self._field = b""
+        self._value = b""
+
+    def callbacks(self) -> Dict[str, Any]:
+        return {
+            "on_part_begin": self._part_begin,
+            "on_header_field": self._header_field,
+            "on_header_value": self._header_value,
+            "on_header_end": self._header_end,
+            "on_headers_finished": self._headers_finished,
+            "on_part_data": self._part_data,
+            "on_part_end": self._part_end,
+        }
+
+    def _part_begin(self) -> None:
+        self._headers = {}
+
+    def _header_field(self, data: bytes, start: int, end: int) -> None:
+        self._field += data[start:end]
+
+    def _header_value(self, data: bytes, start: int, end: int) -> None:
+        self._value += data[start:end]
+
+    def _header_end(self) -> None:
+        self._headers[self._field.lower()] = self._value
+        self._field = self._value = b""
+
+    def _headers_finished(self) -> None:
+        _, params = parse_options_header(self._headers.get(b"content-disposition", b""))
+        if params.get(b"name") == b"file" and b"filename" in params and not self._started:
+            self._started = self._receiving = True
+
+    def _part_data(self, data: bytes, start: int, end: int) -> None:
+        if not self._receiving:
+            return
+        chunk = data[start:end]
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="File too large")
+        self.hasher.update(chunk)
+        self._pending.append(chunk)
+
+    def _part_end(self) -> None:
+        self._receiving = False
+
+    def _write_pending(self) -> None:
+        if self._pending:
+            if self._handle is None:
+                fd, self.path = tempfile.mkstemp(prefix="upload-", dir=self.directory)
+                self._handle = os.fdopen(fd, "wb")
+            self._handle.writelines(self._pending)
+            self._pending = []
+        if not self._receiving and self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    async def flush(self) -> None:
+        if self._pending or (not self._receiving and self._handle is not None):
+            await run_in_threadpool(self._write_pending)
+
+    def discard(self) -> None:
+        self._pending = []
+        self._receiving = False
+        self._write_pending()
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+async def store_upload(content_type: str, stream: AsyncIterator[bytes]) -> Dict[str, Any]:
+    mime, params = parse_options_header(content_type)
+    boundary = params.get(b"boundary")
+    if mime != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected multipart/form-data")
+
+    temp_dir = os.path.join(settings.MEDIA_DIR, "tmp")
+    os.makedirs(temp_dir, exist_ok=True)
+    sink = _FileSink(temp_dir, settings.MEDIA_MAX_BYTES)
+    parser = MultipartParser(boundary, sink.callbacks())
+    try:
+        async for chunk in stream:
+            parser.write(chunk)
+            await sink.flush()
+        parser.finalize()
+        await sink.flush()
+        if sink.path is None or sink.size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing file")
+        digest = sink.hasher.hexdigest()
+        loop = asyncio.get_running_loop()
+        try:
+            info = await loop.run_in_executor(
+                _executor(),
+                process_image,
+                sink.path,
+                digest,
+                settings.MEDIA_DIR,
+                settings.MEDIA_THUMB_SIZE,
+                settings.MEDIA_MAX_PIXELS,
+            )
+        except ImageTooLarge as exc:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Image dimensions too large"
+            ) from exc
+        except (OSError, ValueError) as exc:
+            # PIL.UnidentifiedImageError is an OSError.
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported image") from exc
+    finally:
+        await run_in_threadpool(sink.discard)
+
+    name = info["name"]
+    return {
+        "id": digest,
+        "url": f"/api/media/{name}",
+        "thumbnailUrl": f"/api/media/{digest}{THUMB_SUFFIX}",
+        "contentType": content_type_for(name),
+        "size": sink.size,
+        "width": info["width"],
+        "height": info["height"],
+        "deduplicated": info["deduplicated"],
+    }
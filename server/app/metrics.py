@@ -0,0 +1,229 @@
+"""Request and MongoDB instrumentation exported in Prometheus text format.
+
+Every request updates per-route latency/size histograms and an in-flight
+gauge. A sampled fraction (``METRICS_SAMPLE_RATE``) also gets its Mongo
+commands attributed to it through a context variable, which feeds the
+``mongo_commands_per_request`` histogram and a ``Server-Timing`` header. That
+is where N+1 query patterns show up.
+"""
+import bisect
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+from .settings import settings
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labels: Sequence[str], buckets: Sequence[float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> (per-bucket counts incl. +Inf, sum)
+        self._values: Dict[LabelValues, Tuple[List[int], float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[labels] = (counts, total + value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Time to first response byte.", ("method", "route"), LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram("http_response_size_bytes", "Response body size.", ("method", "route"), SIZE_BUCKETS)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled.")
+MONGO_COMMANDS = Counter("mongo_commands_total", "MongoDB commands issued.", ("command", "outcome"))
+MONGO_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command round trip time.", ("command",), LATENCY_BUCKETS
+)
+MONGO_PER_REQUEST = Histogram(
+    "mongo_commands_per_request", "MongoDB commands per sampled request.", ("method", "route"), COUNT_BUCKETS
+)
+RATE_LIMITED = Counter("rate_limited_total", "Requests rejected by a rate limit rule.", ("rule",))
+LOAD_SHED = Counter("load_shed_total", "Requests shed with 503 because the queue wait was too long.")
+WRITE_BEHIND_DROPPED = Counter(
+    "write_behind_dropped_total", "Buffered increments dropped because flushes kept failing.", ("buffer",)
+)
+
+METRICS = [
+    REQUESTS,
+    REQUEST_LATENCY,
+    RESPONSE_SIZE,
+    IN_FLIGHT,
+    MONGO_COMMANDS,
+    MONGO_LATENCY,
+    MONGO_PER_REQUEST,
+    RATE_LIMITED,
+    LOAD_SHED,
+    WRITE_BEHIND_DROPPED,
+]
+
+# Extra gauges computed at scrape time, e.g. cache statistics: name -> (help, callback).
+_collectors: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+
+def register_gauge(name: str, documentation: str, callback: Callable[[], float]) -> None:
+    _collectors[name] = (documentation, callback)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    for name, (documentation, callback) in sorted(_collectors.items()):
+        lines += [f"# HELP {name} {documentation}", f"# TYPE {name} gauge", f"{name} {callback()}"]
+    return "\n".join(lines) + "\n"
+
+
+class RequestMongoStats:
+    __slots__ = ("commands", "duration", "_lock")
+
+    def __init__(self) -> None:
+        self.commands = 0
+        self.duration = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self.commands += 1
+            self.duration += seconds
+
+
+# Motor copies the context into its executor threads, so listeners see the request's stats.
+current_mongo_stats: ContextVar[Optional[RequestMongoStats]] = ContextVar("current_mongo_stats", default=None)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def _record(self, command: str, outcome: str, duration_micros: int) -> None:
+        seconds = duration_micros / 1_000_000
+        MONGO_COMMANDS.inc(command, outcome)
+        MONGO_LATENCY.observe(seconds, command)
+        stats = current_mongo_stats.get()
+        if stats is not None:
+            stats.record(seconds)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._record(event.command_name, "ok", event.duration_micros)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._record(event.command_name, "error", event.duration_micros)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware so streaming responses are measured without buffering."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        sampled = settings.METRICS_SAMPLE_RATE > 0 and random.random() < settings.METRICS_SAMPLE_RATE
+        stats = RequestMongoStats() if sampled else None
+        token = current_mongo_stats.set(stats)
+        state = {"status": 500, "size": 0}
+        IN_FLIGHT.inc()
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                state["first_byte"] = time.perf_counter() - started
+                if stats is not None:
+                    timing = (
+                        f"app;dur={state['first_byte'] * 1000:.1f}, "
+                        f'db;dur={stats.duration * 1000:.1f};desc="{stats.commands} ops"'
+                    )
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"server-timing", timing.encode("latin-1"))
+                    ]}
+            elif message["type"] == "http.response.body":
+                state["size"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            current_mongo_stats.reset(token)
+            route = scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            REQUESTS.inc(method, route_label, str(state["status"]))
+            REQUEST_LATENCY.observe(state.get("first_byte", time.perf_counter() - started), method, route_label)
+            RESPONSE_SIZE.observe(state["size"], method, route_label)
+            if stats is not None:
+                MONGO_PER_REQUEST.observe(stats.commands, method, route_label)
@@ -0,0 +1,92 @@
+"""explain()-based guard against route queries that fall back to a COLLSCAN.
+
+``ROUTE_QUERIES`` mirrors the filters and sorts the routes issue, with
+placeholder values. ``find_collscans`` explains each one against a real
+database and reports those whose winning plan scans the whole collection,
+so it can back a test or the ``scripts/check_query_plans.py`` CLI.
+"""
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+
+class RouteQuery(NamedTuple):
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[Sequence[Tuple[str, int]]] = None
+    limit: int = 0
+
+
+_SAMPLE_ID = ObjectId()
+
+ROUTE_QUERIES: List[RouteQuery] = [
+    RouteQuery("auth.login", "users", {"username": "sample"}),
+    RouteQuery("auth.current_user", "users", {"_id": _SAMPLE_ID}),
+    RouteQuery("posts.list_legacy", "posts", {}, [("created_at", -1)]),
+    RouteQuery("posts.list_latest", "posts", {}, [("created_at", -1), ("_id", -1)], 21),
+    RouteQuery("posts.list_views", "posts", {}, [("views", -1), ("_id", -1)], 21),
+    RouteQuery("posts.list_likes", "posts", {}, [("likes", -1), ("_id", -1)], 21),
+    RouteQuery("posts.list_category", "posts", {"category": "dev"}, [("created_at", -1), ("_id", -1)], 21),
+    RouteQuery("posts.search", "posts", {"search_grams": {"$all": ["샘플"]}}, [("_id", -1)], 1000),
+    RouteQuery("posts.popular", "posts", {}, [("hot", -1), ("_id", -1)], 10),
+    RouteQuery("posts.popular_category", "posts", {"category": "dev"}, [("hot", -1), ("_id", -1)], 10),
+    RouteQuery("posts.by_author", "posts", {"author": _SAMPLE_ID}, [("created_at", -1), ("_id", -1)], 21),
+    RouteQuery(
+        "comments.list", "comments", {"post_id": _SAMPLE_ID}, [("created_at", 1), ("_id", 1)], 51
+    ),
+    RouteQuery("comments.for_page", "comments", {"post_id": {"$in": [_SAMPLE_ID]}}),
+    RouteQuery("comments.by_author", "comments", {"author": _SAMPLE_ID}, [("created_at", -1), ("_id", -1)], 51),
+    RouteQuery("comments.count_by_author", "comments", {"author": _SAMPLE_ID}),
+    RouteQuery(
+        "archive.by_author", "posts_archive", {"author": _SAMPLE_ID}, [("created_at", -1), ("_id", -1)], 21
+    ),
+    RouteQuery("reactions.mine", "reactions", {"post_id": {"$in": [_SAMPLE_ID]}, "user_id": _SAMPLE_ID}),
+]
+
+
+def _winning_plans(explain: Any) -> Iterator[Dict[str, Any]]:
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan" and isinstance(value, dict):
+                yield value
+            else:
+                yield from _winning_plans(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from _winning_plans(item)
+
+
+def _stages(plan: Any) -> Iterator[str]:
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from _stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from _stages(item)
+
+
+def plan_has_collscan(explain: Dict[str, Any]) -> bool:
+    return any(stage == "COLLSCAN" for plan in _winning_plans(explain) for stage in _stages(plan))
+
+
+async def explain_query(db: AsyncIOMotorDatabase, query: RouteQuery) -> Dict[str, Any]:
+    command: Dict[str, Any] = {"find": query.collection, "filter": query.filter}
+    if query.sort:
+        command["sort"] = dict(query.sort)
+    if query.limit:
+        command["limit"] = query.limit
+    return await db.command({"explain": command, "verbosity": "queryPlanner"})
+
+
+async def find_collscans(
+    db: AsyncIOMotorDatabase, queries: Sequence[RouteQuery] = ROUTE_QUERIES
+) -> List[RouteQuery]:
+    offenders = []
+    for query in queries:
+        if plan_has_collscan(await explain_query(db, query)):
+            offenders.append(query)
+    return offenders
@@ -0,0 +1,124 @@
+import asyncio
+import logging
+import math
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from .settings import settings
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELD = "hot"
+
+SCORE_INPUTS = {"views": 1, "likes": 1, "dislikes": 1, "commentCount": 1, "comments": 1, "created_at": 1}
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def popularity_score(post: Dict[str, Any]) -> float:
+    """Reddit style hot score: log10 of engagement points plus creation time over ``POPULAR_TIME_SCALE``.
+
+    The score does not depend on the current time, so it only changes when a
+    post's counters do; newer posts still win because every ``POPULAR_TIME_SCALE``
+    seconds of age is worth a factor of ten in points.
+    """
+    comment_count = post.get("commentCount", 0) + len(post.get("comments") or [])
+    points = (
+        post.get("likes", 0)
+        - post.get("dislikes", 0)
+        + settings.POPULAR_VIEW_WEIGHT * post.get("views", 0)
+        + settings.POPULAR_COMMENT_WEIGHT * comment_count
+    )
+    order = math.log10(max(abs(points), 1))
+    sign = 1 if points > 0 else -1 if points < 0 else 0
+    created_at = post.get("created_at") or datetime.utcnow()
+    return sign * order + (created_at - EPOCH).total_seconds() / settings.POPULAR_TIME_SCALE
+
+
+class PopularityRanker:
+    """Keeps the indexed ``hot`` field on posts up to date.
+
+    New posts are scored when they are inserted. Posts whose counters change
+    are marked dirty and rescored within ``POPULAR_DIRTY_INTERVAL`` seconds;
+    nothing else ever needs a write. On start, posts without a score (written
+    before this scheme, or by imports) are scored once in the background.
+    """
+
+    def __init__(self) -> None:
+        self._dirty: Set[ObjectId] = set()
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def mark_dirty(self, post_ids: Iterable[ObjectId]) -> None:
+        self._dirty.update(post_ids)
+
+    async def on_counter_flush(self, batch: Dict[ObjectId, Dict[str, int]]) -> None:
+        self.mark_dirty(batch)
+
+    async def _rescore(self, query: Dict[str, Any]) -> int:
+        assert self._db is not None
+        operations = []
+        rescored = 0
+        async for post in self._db["posts"].find(query, SCORE_INPUTS):
+            operations.append(UpdateOne({"_id": post["_id"]}, {"$set": {SCORE_FIELD: popularity_score(post)}}))
+            if len(operations) >= 1000:
+                await self._db["posts"].bulk_write(operations, ordered=False)
+                rescored += len(operations)
+                operations = []
+        if operations:
+            await self._db["posts"].bulk_write(operations, ordered=False)
+            rescored += len(operations)
+        return rescored
+
+    async def rescore_dirty(self) -> None:
+        if self._db is None or not self._dirty:
+            return
+        dirty, self._dirty = list(self._dirty), set()
+        try:
+            await self._rescore({"_id": {"$in": dirty}})
+        except Exception:
+            # Keep them for the next pass; posts marked meanwhile are merged in.
+            self._dirty.update(dirty)
+            raise
+
+    async def backfill(self) -> int:
+        if self._db is None:
+            return 0
+        rescored = await self._rescore({SCORE_FIELD: {"$exists": False}})
+        if rescored:
+            logger.info("Scored %d posts that had no %s score", rescored, SCORE_FIELD)
+        return rescored
+
+    async def _run(self) -> None:
+        try:
+            await self.backfill()
+        except Exception:
+            logger.exception("Popularity score backfill failed")
+        while True:
+            try:
+                await self.rescore_dirty()
+            except Exception:
+                logger.exception("Popularity ranking update failed")
+            await asyncio.sleep(settings.POPULAR_DIRTY_INTERVAL)
+
+    def start(self, db: AsyncIOMotorDatabase) -> None:
+        self._db = db
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.rescore_dirty()
+
+
+ranker = PopularityRanker()
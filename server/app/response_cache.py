@@ -0,0 +1,119 @@
+import hashlib
+from typing import Any, Dict, NamedTuple, Optional
+
+from bson import ObjectId
+from fastapi import Request, Response, status
+
+from .cache import TTLCache
+from .compression import compress, is_compressible, negotiate
+from .responses import dumps
+from .settings import settings
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    # encoding -> compressed body, filled on first request for that encoding
+    variants: Dict[str, bytes]
+
+
+def render_json(data: Any) -> CachedBody:
+    body = dumps(data)
+    return CachedBody(body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"', {})
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    # Encoded variants carry the entity tag plus "-<encoding>"; any of them validates the entity.
+    variant_prefix = etag[:-1] + "-"
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or any(
+        candidate == etag or candidate.startswith(variant_prefix) for candidate in candidates
+    )
+
+
+async def json_response(request: Request, entry: CachedBody) -> Response:
+    encoding = None
+    if is_compressible("application/json", len(entry.body)):
+        encoding = negotiate(request.headers.get("accept-encoding"))
+    etag = entry.etag if encoding is None else f'{entry.etag[:-1]}-{encoding}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if encoding is None:
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+    body = entry.variants.get(encoding)
+    if body is None:
+        body = entry.variants[encoding] = await compress(encoding, entry.body)
+    headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class MemoryBackend:
+    """Per-process LRU. Any object with the same async methods can replace it."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._cache: TTLCache[CachedBody] = TTLCache(max_size, ttl)
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, entry: CachedBody) -> None:
+        self._cache.set(key, entry)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        self._cache.discard_where(lambda key, _entry: str(key).startswith(prefix))
+
+    async def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+
+class ResponseCache:
+    """Serialized GET responses for post reads, invalidated by the mutating routes."""
+
+    LIST_PREFIX = "list:"
+    POST_PREFIX = "post:"
+
+    def __init__(self, backend) -> None:
+        self.backend = backend
+        # Bumped on every invalidation; a response built across a bump is not stored.
+        self.generation = 0
+
+    @classmethod
+    def list_key(cls, request: Request) -> str:
+        return cls.LIST_PREFIX + request.url.path + "?" + "&".join(sorted(request.url.query.split("&")))
+
+    @classmethod
+    def post_key(cls, post_id: ObjectId) -> str:
+        return cls.POST_PREFIX + str(post_id)
+
+    async def get(self, key: str) -> Optional[CachedBody]:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        return await self.backend.get(key)
+
+    async def store(self, key: str, data: Any, *, generation: int) -> CachedBody:
+        entry = render_json(data)
+        if settings.RESPONSE_CACHE_ENABLED and generation == self.generation:
+            await self.backend.set(key, entry)
+        return entry
+
+    async def invalidate_post(self, post_id: ObjectId) -> None:
+        self.generation += 1
+        await self.backend.delete_prefix(self.post_key(post_id))
+        await self.backend.delete_prefix(self.LIST_PREFIX)
+
+    async def invalidate_lists(self) -> None:
+        self.generation += 1
+        await self.backend.delete_prefix(self.LIST_PREFIX)
+
+    async def clear(self) -> None:
+        self.generation += 1
+        await self.backend.clear()
+
+
+response_cache = ResponseCache(MemoryBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL))
@@ -0,0 +1,138 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pymongo import ASCENDING
+
+from ..analytics import GRANULARITIES, METRICS, bucket_start
+from ..database import get_db, stale_ok
+from ..response_cache import json_response, response_cache
+from ..responses import FastJSONResponse
+from ..settings import settings
+from ..utils import ensure_object_id, isoformat
+from .posts import SUMMARY_PROJECTION, _build_post_responses, _normalize_category
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+# Span of a series when no start is given.
+DEFAULT_SPANS = {"minute": timedelta(hours=1), "hour": timedelta(days=1), "day": timedelta(days=30)}
+
+# Trending window -> (bucket granularity, window length).
+TRENDING_WINDOWS = {
+    "hour": ("minute", timedelta(hours=1)),
+    "day": ("hour", timedelta(days=1)),
+    "week": ("day", timedelta(days=7)),
+}
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+async def _series(
+    db, scope: str, key: Any, granularity: str, start: Optional[datetime], end: Optional[datetime]
+) -> Dict[str, Any]:
+    """Zero-filled buckets between ``start`` and ``end``; activity of the last flush interval is not in yet."""
+    step = GRANULARITIES.get(granularity)
+    if step is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid granularity")
+    end = _naive_utc(end) or datetime.utcnow()
+    first = bucket_start(_naive_utc(start) or end - DEFAULT_SPANS[granularity], granularity)
+    if first > end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid range")
+    if (end - first) / step >= settings.ANALYTICS_MAX_POINTS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Range too large")
+
+    query = {"scope": scope, "key": key, "g": granularity, "t": {"$gte": first, "$lte": end}}
+    buckets = {
+        doc["t"]: doc
+        async for doc in stale_ok(db, settings.ANALYTICS_COLLECTION).find(query).sort("t", ASCENDING)
+    }
+    points: List[Dict[str, Any]] = []
+    moment = first
+    while moment <= end:
+        doc = buckets.get(moment, {})
+        points.append({"t": isoformat(moment), **{metric: doc.get(metric, 0) for metric in METRICS}})
+        moment = bucket_start(moment + step, granularity)
+    return {"granularity": granularity, "points": points}
+
+
+@router.get("/posts/{post_id}")
+async def post_series(
+    post_id: str,
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db=Depends(get_db),
+):
+    post_object_id = ensure_object_id(post_id, field="postId")
+    return FastJSONResponse(await _series(db, "post", post_object_id, granularity, start, end))
+
+
+@router.get("/categories/{category}")
+async def category_series(
+    category: str,
+    granularity: str = "hour",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db=Depends(get_db),
+):
+    normalized = _normalize_category(category)
+    if normalized is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+    return FastJSONResponse(await _series(db, "category", normalized, granularity, start, end))
+
+
+@router.get("/trending")
+async def trending_posts(
+    request: Request,
+    window: str = "hour",
+    metric: str = "views",
+    category: Optional[str] = None,
+    limit: int = Query(10, ge=1),
+    db=Depends(get_db),
+):
+    if window not in TRENDING_WINDOWS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid window")
+    if metric not in METRICS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid metric")
+    key = response_cache.list_key(request)
+    entry = await response_cache.get(key)
+    if entry is not None:
+        return await json_response(request, entry)
+    generation = response_cache.generation
+
+    granularity, span = TRENDING_WINDOWS[window]
+    match: Dict[str, Any] = {
+        "g": granularity,
+        "scope": "post",
+        "t": {"$gte": bucket_start(datetime.utcnow() - span, granularity)},
+    }
+    if category is not None:
+        normalized = _normalize_category(category)
+        if normalized is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+        match["category"] = normalized
+    limit = min(limit, settings.POSTS_MAX_PAGE_SIZE)
+    # Sums at most (posts active in the window) x (buckets per window) small documents.
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": match},
+        {"$group": {"_id": "$key", "score": {"$sum": f"${metric}"}}},
+        {"$match": {"score": {"$gt": 0}}},
+        {"$sort": {"score": -1, "_id": -1}},
+        {"$limit": limit},
+    ]
+    ranked = await stale_ok(db, settings.ANALYTICS_COLLECTION).aggregate(pipeline).to_list(length=limit)
+    scores = {group["_id"]: group["score"] for group in ranked}
+    found = {
+        post["_id"]: post
+        async for post in db["posts"].find({"_id": {"$in": list(scores)}}, SUMMARY_PROJECTION)
+    }
+    posts = [found[group["_id"]] for group in ranked if group["_id"] in found]
+    items = await _build_post_responses(db, posts, summary=True)
+    for item, post in zip(items, posts):
+        item["trend"] = scores[post["_id"]]
+    data = {"window": window, "metric": metric, "items": items}
+    return await json_response(request, await response_cache.store(key, data, generation=generation))
@@ -3,9 +3,12 @@ from datetime import datetime
 from typing import Any, Dict
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from pymongo.errors import DuplicateKeyError
 
 from ..database import get_db
-from ..security import create_access_token, hash_password, verify_password
+from ..limits import rate_limit
+from ..security import create_access_token, hash_password_async, verify_password_async
+from ..user_counts import COMMENTS, POSTS
 from ..utils import str_object_id
 
 logger = logging.getLogger(__name__)
@@ -13,7 +16,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 
-@router.post("/register")
+@router.post("/register", dependencies=[Depends(rate_limit("register"))])
 async def register(payload: Dict[str, Any], db=Depends(get_db)):
     logger.debug("register payload: %s", payload)
     username = (payload.get("username") or "").strip()
@@ -22,20 +25,27 @@ async def register(payload: Dict[str, Any], db=Depends(get_db)):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing fields")
 
     users = db["users"]
-    existing = await users.find_one({"username": username})
+    # Cheap early exit before paying for bcrypt; the unique index settles races below.
+    existing = await users.find_one({"username": username}, {"_id": 1})
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username taken")
 
+    password_hash = await hash_password_async(password)
     now = datetime.utcnow()
     try:
         result = await users.insert_one(
             {
                 "username": username,
-                "password": hash_password(password),
+                "password": password_hash,
+                # New users start with maintained counters; see app/user_counts.py.
+                POSTS: 0,
+                COMMENTS: 0,
                 "created_at": now,
                 "updated_at": now,
             }
         )
+    except DuplicateKeyError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username taken") from exc
     except Exception as exc:  # pragma: no cover - runtime safeguard
         logger.exception("Failed to register user")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Server error") from exc
@@ -45,7 +55,7 @@ async def register(payload: Dict[str, Any], db=Depends(get_db)):
     return {"user": {"id": str_object_id(user_id), "username": username}, "token": token}
 
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
 async def login(payload: Dict[str, Any], db=Depends(get_db)):
     username = (payload.get("username") or "").strip()
     password = payload.get("password") or ""
@@ -55,7 +65,7 @@ async def login(payload: Dict[str, Any], db=Depends(get_db)):
     users = db["users"]
     user = await users.find_one({"username": username})
     logger.debug("login attempt for %s: %s", username, "found" if user else "not found")
-    if not user or not verify_password(password, user["password"]):
+    if not user or not await verify_password_async(password, user["password"]):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid credentials")
 
     token = create_access_token({"id": str_object_id(user["_id"])})
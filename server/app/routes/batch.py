@@ -0,0 +1,152 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+
+from ..archive import find_archived
+from ..database import get_db
+from ..dependencies import get_optional_user
+from ..limits import limiter, viewer_bucket
+from ..settings import settings
+from ..utils import ensure_object_id, str_object_id
+from .posts import (
+    POST_PROJECTION,
+    SUMMARY_PROJECTION,
+    _attach_comments,
+    _collect_post_user_ids,
+    _collect_users,
+    _find_comment_page,
+    _normalize_object_id,
+    _record_views,
+    _serialize_comment,
+    _serialize_post,
+    _serialize_post_summary,
+)
+from .reactions import _viewer_reactions
+
+router = APIRouter(prefix="/api", tags=["batch"])
+
+UsersMap = Dict[ObjectId, Dict[str, Any]]
+# Operations load in parallel and return a renderer; authors of every operation are hydrated
+# with one users query before the renderers run.
+Renderer = Callable[[UsersMap], Any]
+
+
+class BatchContext:
+    def __init__(self, db, request: Request, user: Optional[Dict[str, Any]]) -> None:
+        self.db = db
+        self.request = request
+        self.user = user
+        self.user_ids: Set[ObjectId] = set()
+
+
+def _post_ids(op: Dict[str, Any]) -> List[ObjectId]:
+    ids = op.get("ids")
+    if not isinstance(ids, list) or not ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing ids")
+    if len(ids) > settings.POSTS_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many ids")
+    return [ensure_object_id(value, field="postId") for value in ids]
+
+
+async def _get_posts(ctx: BatchContext, op: Dict[str, Any]) -> Renderer:
+    post_ids = _post_ids(op)
+    summary = bool(op.get("summary"))
+    projection = SUMMARY_PROJECTION if summary else POST_PROJECTION
+    posts = await ctx.db["posts"].find({"_id": {"$in": post_ids}}, projection).to_list(length=len(post_ids))
+    if len(posts) < len(post_ids):
+        found = {post["_id"] for post in posts}
+        posts += await find_archived(ctx.db, [post_id for post_id in post_ids if post_id not in found], projection)
+    if not summary:
+        await _attach_comments(ctx.db, posts)
+    for post in posts:
+        if summary:
+            ctx.user_ids.add(_normalize_object_id(post["author"]))
+        else:
+            _collect_post_user_ids(post, ctx.user_ids)
+    by_id = {post["_id"]: post for post in posts}
+    serialize = _serialize_post_summary if summary else _serialize_post
+
+    def render(users_map: UsersMap) -> Dict[str, Any]:
+        return {
+            "items": [serialize(by_id[post_id], users_map) for post_id in post_ids if post_id in by_id],
+            "missing": [str_object_id(post_id) for post_id in post_ids if post_id not in by_id],
+        }
+
+    return render
+
+
+async def _record_post_views(ctx: BatchContext, op: Dict[str, Any]) -> Renderer:
+    post_ids = _post_ids(op)
+    # Each id is one view, charged to the same bucket as POST /api/posts/{id}/views.
+    await limiter.check(*viewer_bucket("views", ctx.request, ctx.user), cost=len(post_ids))
+    views = await _record_views(ctx.db, post_ids)
+    return lambda _users: {str_object_id(post_id): count for post_id, count in views.items()}
+
+
+async def _my_reactions(ctx: BatchContext, op: Dict[str, Any]) -> Renderer:
+    if ctx.user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No token provided")
+    result = await _viewer_reactions(ctx.db, ctx.user["_id"], _post_ids(op))
+    return lambda _users: result
+
+
+async def _list_comments(ctx: BatchContext, op: Dict[str, Any]) -> Renderer:
+    post_object_id = ensure_object_id(op.get("postId") or "", field="postId")
+    limit = op.get("limit")
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid limit")
+    comments, next_cursor = await _find_comment_page(ctx.db, post_object_id, limit=limit, cursor=op.get("cursor"))
+    ctx.user_ids.update(_normalize_object_id(comment["author"]) for comment in comments)
+
+    def render(users_map: UsersMap) -> Dict[str, Any]:
+        return {"items": [_serialize_comment(c, users_map) for c in comments], "nextCursor": next_cursor}
+
+    return render
+
+
+OPERATIONS: Dict[str, Callable[[BatchContext, Dict[str, Any]], Awaitable[Renderer]]] = {
+    "posts.get": _get_posts,
+    "posts.views": _record_post_views,
+    "reactions.mine": _my_reactions,
+    "comments.list": _list_comments,
+}
+
+
+async def _load(ctx: BatchContext, op: Any) -> Any:
+    """Renderer on success, or an HTTPException to report for this operation only."""
+    try:
+        if not isinstance(op, dict) or op.get("op") not in OPERATIONS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown operation")
+        return await OPERATIONS[op["op"]](ctx, op)
+    except HTTPException as exc:
+        return exc
+
+
+@router.post("/batch")
+async def run_batch(
+    payload: Dict[str, Any],
+    request: Request,
+    db=Depends(get_db),
+    current_user=Depends(get_optional_user),
+):
+    operations = payload.get("operations")
+    if not isinstance(operations, list) or not operations:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing operations")
+    if len(operations) > settings.BATCH_MAX_OPERATIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many operations")
+
+    ctx = BatchContext(db, request, current_user)
+    loaded = await asyncio.gather(*(_load(ctx, op) for op in operations))
+    users_map = await _collect_users(db, ctx.user_ids)
+
+    results = []
+    for op, outcome in zip(operations, loaded):
+        result: Dict[str, Any] = {"id": op.get("id") if isinstance(op, dict) else None}
+        if isinstance(outcome, HTTPException):
+            result.update(status=outcome.status_code, error=outcome.detail)
+        else:
+            result.update(status=status.HTTP_200_OK, data=outcome(users_map))
+        results.append(result)
+    return {"results": results}
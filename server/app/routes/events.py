@@ -0,0 +1,41 @@
+import json
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+
+from ..events import broker
+from ..settings import settings
+
+router = APIRouter(prefix="/api/events", tags=["events"])
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    data = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event['type']}\ndata: {data}\n\n"
+
+
+async def _event_stream() -> AsyncIterator[str]:
+    subscriber = broker.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = await subscriber.next_event(settings.EVENTS_HEARTBEAT)
+            if event is None:
+                # Comment line keeps proxies from closing idle connections.
+                yield ": ping\n\n"
+                continue
+            yield _format_event(event)
+            if event["type"] == "shutdown":
+                return
+    finally:
+        broker.unsubscribe(subscriber)
+
+
+@router.get("")
+async def stream_events():
+    return StreamingResponse(
+        _event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
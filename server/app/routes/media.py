@@ -0,0 +1,100 @@
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+
+from ..dependencies import get_current_user
+from ..limits import rate_limit
+from ..media import MEDIA_NAME, content_type_for, media_path, store_upload
+
+router = APIRouter(prefix="/api/media", tags=["media"])
+
+CHUNK_SIZE = 64 * 1024
+# Names are content hashes, so a URL's bytes never change.
+CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable", "Accept-Ranges": "bytes"}
+SINGLE_RANGE = re.compile(r"^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$", re.IGNORECASE)
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Single ``bytes=start-end`` range -> inclusive (start, end).
+
+    Returns None for a header to ignore (malformed, another unit, several ranges): RFC 9110
+    answers those with the full 200 response. Raises RangeNotSatisfiable when a valid range
+    lies outside the file.
+    """
+    match = SINGLE_RANGE.match(header)
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start, end = int(first), int(last) if last else size - 1
+        if last and end < start:
+            return None
+    else:
+        start, end = size - int(last), size - 1
+        if int(last) == 0:
+            raise RangeNotSatisfiable()
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return max(start, 0), min(end, size - 1)
+
+
+def _read_range(path: str, start: int, end: int) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = handle.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.post("", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("uploads", per_user=True))])
+async def upload_media(request: Request, current_user=Depends(get_current_user)):
+    return await store_upload(request.headers.get("content-type", ""), request.stream())
+
+
+@router.get("/{name}")
+async def get_media(name: str, request: Request):
+    if not MEDIA_NAME.match(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+    path = media_path(name)
+    try:
+        size = os.stat(path).st_size
+    except FileNotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    etag = f'"{name}"'
+    headers = {**CACHE_HEADERS, "ETag": etag}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    media_type = content_type_for(name)
+    range_header = request.headers.get("range")
+    byte_range = None
+    if range_header and request.headers.get("if-range", etag) == etag:
+        try:
+            byte_range = _parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            return Response(
+                status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+                headers={**headers, "Content-Range": f"bytes */{size}"},
+            )
+    if byte_range is not None:
+        start, end = byte_range
+        headers.update({"Content-Range": f"bytes {start}-{end}/{size}", "Content-Length": str(end - start + 1)})
+        return StreamingResponse(
+            _read_range(path, start, end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT,
+            media_type=media_type,
+            headers=headers,
+        )
+    return FileResponse(path, media_type=media_type, headers=headers, stat_result=os.stat(path))
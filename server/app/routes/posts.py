@@ -1,18 +1,64 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+import asyncio
+import heapq
+import itertools
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from bson import ObjectId
-from fastapi import APIRouter, Depends, HTTPException, status
-from pymongo import ReturnDocument
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
 
-from ..database import get_db
+from ..analytics import rollups
+from ..archive import ARCHIVE_COLLECTION, ARCHIVED_AT, find_archived, find_one_archived, restore_post, unpack
+from ..counters import archive_view_counter, view_counter
+from ..database import get_db, stale_ok
 from ..dependencies import get_current_user
-from ..utils import build_author_payload, ensure_object_id, isoformat, str_object_id
+from ..events import broker
+from ..limits import rate_limit
+from ..media import thumbnail_url_for
+from ..ranking import SCORE_FIELD, popularity_score, ranker
+from ..response_cache import json_response, response_cache
+from ..responses import FastJSONResponse
+from ..search import build_search_fields, query_grams, query_words, score_expression
+from ..settings import settings
+from ..user_counts import COMMENTS, POSTS, bump_user_count, bump_user_counts
+from ..utils import (
+    build_author_payload,
+    decode_cursor,
+    encode_cursor,
+    ensure_object_id,
+    isoformat,
+    keyset_filter,
+    str_object_id,
+    utcnow_ms,
+)
 
 router = APIRouter(prefix="/api/posts", tags=["posts"])
 
 VALID_CATEGORIES = {"game", "study", "dev"}
 
+# Public sort names mapped to the indexed post field they order by.
+SORT_FIELDS = {"latest": "created_at", "views": "views", "likes": "likes"}
+
+# Search grams are only needed by the database; never ship them to the app.
+POST_PROJECTION = {"search_grams": 0, "title_grams": 0}
+
+SUMMARY_PROJECTION = {
+    "author": 1,
+    "title": 1,
+    "imageUrl": 1,
+    "category": 1,
+    "views": 1,
+    "likes": 1,
+    "dislikes": 1,
+    "created_at": 1,
+    "updated_at": 1,
+    ARCHIVED_AT: 1,
+    "commentCount": 1,
+    # Posts not yet migrated by scripts/migrate_comments.py still embed their comments;
+    # their ids are enough to count them.
+    "comments._id": 1,
+}
+
 
 async def _collect_users(db, user_ids: Set[ObjectId]) -> Dict[ObjectId, Dict[str, Any]]:
     if not user_ids:
@@ -38,55 +84,416 @@ def _normalize_category(value: Optional[str]) -> Optional[str]:
     return None
 
 
-async def _build_post_response(db, post: Dict[str, Any]) -> Dict[str, Any]:
-    author_id = _normalize_object_id(post["author"])
-    normalized_comments: List[Dict[str, Any]] = []
-    user_ids: Set[ObjectId] = {author_id}
+async def _attach_comments(db, posts: List[Dict[str, Any]]) -> None:
+    """Load the comments of every post on the page with one query."""
+    if not posts:
+        return
+    by_post: Dict[ObjectId, List[Dict[str, Any]]] = {post["_id"]: [] for post in posts}
+    cursor = db["comments"].find({"post_id": {"$in": list(by_post)}}).sort(
+        [("post_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)]
+    )
+    async for comment in cursor:
+        by_post[comment["post_id"]].append(comment)
+    for post in posts:
+        post["comments"] = post.get("comments", []) + by_post[post["_id"]]
+
+
+def _collect_post_user_ids(post: Dict[str, Any], user_ids: Set[ObjectId]) -> None:
+    user_ids.add(_normalize_object_id(post["author"]))
     for comment in post.get("comments", []):
-        comment_author = _normalize_object_id(comment["author"])
-        user_ids.add(comment_author)
-        normalized_comments.append({**comment, "author": comment_author})
+        user_ids.add(_normalize_object_id(comment["author"]))
 
-    users_map = await _collect_users(db, user_ids)
 
-    def map_comment(c: Dict[str, Any]) -> Dict[str, Any]:
-        author_doc = users_map.get(c["author"])
-        return {
-            "_id": str_object_id(c["_id"]),
-            "id": str_object_id(c["_id"]),
-            "content": c.get("content", ""),
-            "author": build_author_payload(author_doc),
-            "createdAt": isoformat(c.get("created_at") or c.get("createdAt")),
-            "updatedAt": isoformat(c.get("updated_at") or c.get("updatedAt")),
-        }
+def _serialize_comment(comment: Dict[str, Any], users_map: Dict[ObjectId, Dict[str, Any]]) -> Dict[str, Any]:
+    author_doc = users_map.get(_normalize_object_id(comment["author"]))
+    return {
+        "_id": str_object_id(comment["_id"]),
+        "id": str_object_id(comment["_id"]),
+        "content": comment.get("content", ""),
+        "author": build_author_payload(author_doc),
+        "createdAt": isoformat(comment.get("created_at") or comment.get("createdAt")),
+        "updatedAt": isoformat(comment.get("updated_at") or comment.get("updatedAt")),
+    }
+
 
-    author_doc = users_map.get(author_id)
+def _serialize_post(post: Dict[str, Any], users_map: Dict[ObjectId, Dict[str, Any]]) -> Dict[str, Any]:
+    author_doc = users_map.get(_normalize_object_id(post["author"]))
     return {
         "_id": str_object_id(post["_id"]),
         "id": str_object_id(post["_id"]),
         "title": post.get("title", ""),
         "body": post.get("body", ""),
         "imageUrl": post.get("imageUrl"),
+        "thumbnailUrl": thumbnail_url_for(post.get("imageUrl")),
         "author": build_author_payload(author_doc),
         "createdAt": isoformat(post.get("created_at") or post.get("createdAt")),
         "updatedAt": isoformat(post.get("updated_at") or post.get("updatedAt")),
-        "comments": [map_comment(c) for c in normalized_comments],
+        "comments": [_serialize_comment(c, users_map) for c in post.get("comments", [])],
         "category": _normalize_category(post.get("category")),
         "views": post.get("views", 0),
         "likes": post.get("likes", 0),
         "dislikes": post.get("dislikes", 0),
+        "archived": ARCHIVED_AT in post,
+    }
+
+
+def _serialize_post_summary(post: Dict[str, Any], users_map: Dict[ObjectId, Dict[str, Any]]) -> Dict[str, Any]:
+    author_doc = users_map.get(_normalize_object_id(post["author"]))
+    return {
+        "_id": str_object_id(post["_id"]),
+        "id": str_object_id(post["_id"]),
+        "title": post.get("title", ""),
+        "imageUrl": post.get("imageUrl"),
+        "thumbnailUrl": thumbnail_url_for(post.get("imageUrl")),
+        "author": build_author_payload(author_doc),
+        "createdAt": isoformat(post.get("created_at") or post.get("createdAt")),
+        "updatedAt": isoformat(post.get("updated_at") or post.get("updatedAt")),
+        "category": _normalize_category(post.get("category")),
+        "views": post.get("views", 0),
+        "likes": post.get("likes", 0),
+        "dislikes": post.get("dislikes", 0),
+        # Comments added after a partial migration are counted on top of those still embedded.
+        "commentCount": post.get("commentCount", 0) + len(post.get("comments") or []),
+        "archived": ARCHIVED_AT in post,
+    }
+
+
+async def _build_post_responses(
+    db,
+    posts: List[Dict[str, Any]],
+    *,
+    summary: bool = False,
+    known_user: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """Serialize a page of posts, hydrating every author with a single users query."""
+    if not summary:
+        await _attach_comments(db, posts)
+    user_ids: Set[ObjectId] = set()
+    for post in posts:
+        if summary:
+            user_ids.add(_normalize_object_id(post["author"]))
+        else:
+            _collect_post_user_ids(post, user_ids)
+    if known_user is not None:
+        user_ids.discard(known_user["_id"])
+    users_map = await _collect_users(db, user_ids)
+    if known_user is not None:
+        users_map[known_user["_id"]] = known_user
+    serialize = _serialize_post_summary if summary else _serialize_post
+    return [serialize(post, users_map) for post in posts]
+
+
+async def _build_post_response(
+    db, post: Dict[str, Any], *, known_user: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    responses = await _build_post_responses(db, [post], known_user=known_user)
+    return responses[0]
+
+
+async def _raise_comment_write_failed(db, post_object_id: ObjectId, comment_object_id: ObjectId) -> None:
+    # Only reached when the owner-filtered write matched nothing; work out why.
+    comment = await db["comments"].find_one({"_id": comment_object_id, "post_id": post_object_id}, {"_id": 1})
+    if comment:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    if not await _post_exists(db, post_object_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
+
+
+async def _post_exists(db, post_object_id: ObjectId) -> bool:
+    for collection in ("posts", ARCHIVE_COLLECTION):
+        if await db[collection].find_one({"_id": post_object_id}, {"_id": 1}):
+            return True
+    return False
+
+
+async def _find_own_hot_post(db, post_object_id: ObjectId, user_id: ObjectId) -> Dict[str, Any]:
+    """The caller's post as stored in ``posts``, restoring it from the archive first so it can be written.
+
+    Ownership of an archived post is checked on the archive document, so other
+    users cannot move it back to the hot collection.
+    """
+    post = await db["posts"].find_one({"_id": post_object_id}, POST_PROJECTION)
+    if post is None:
+        archived = await find_one_archived(db, post_object_id, {"author": 1})
+        if archived is not None and archived["author"] != user_id:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+        if archived is not None and await restore_post(db, post_object_id):
+            post = await db["posts"].find_one({"_id": post_object_id}, POST_PROJECTION)
+    if not post:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    if post["author"] != user_id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    return post
+
+
+async def _update_post_fields(
+    db, post_object_id: ObjectId, update: Dict[str, Any], *, full: bool
+) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """Apply ``update`` to a post, restoring it if archived; (matched, updated post when ``full``)."""
+    for attempt in range(2):
+        post = None
+        if full:
+            post = await db["posts"].find_one_and_update(
+                {"_id": post_object_id}, update, projection=POST_PROJECTION, return_document=ReturnDocument.AFTER
+            )
+            matched = post is not None
+        else:
+            matched = (await db["posts"].update_one({"_id": post_object_id}, update)).matched_count > 0
+        if matched or attempt or not await restore_post(db, post_object_id):
+            return matched, post
+    return False, None
+
+
+async def _find_listing(
+    db, collection: str, query: Dict[str, Any], projection: Dict[str, Any], field: str, limit: int
+) -> List[Dict[str, Any]]:
+    return (
+        await stale_ok(db, collection)
+        .find(query, projection)
+        .sort([(field, DESCENDING), ("_id", DESCENDING)])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+
+
+def _merge_descending(pages: List[List[Dict[str, Any]]], field: str, limit: int) -> List[Dict[str, Any]]:
+    """Merge pages that each sort by (field, _id) descending; missing values sort last."""
+    merged = heapq.merge(
+        *pages, key=lambda doc: (doc.get(field) is not None, doc.get(field), doc["_id"]), reverse=True
+    )
+    return list(itertools.islice(merged, limit))
+
+
+async def _find_post_page(
+    db,
+    *,
+    sort: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    summary: bool = False,
+    archived: bool = False,
+    author: Optional[ObjectId] = None,
+) -> Dict[str, Any]:
+    field = SORT_FIELDS.get(sort)
+    if field is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sort")
+
+    query: Dict[str, Any] = {}
+    if category is not None:
+        normalized = _normalize_category(category)
+        if normalized is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+        query["category"] = normalized
+    if author is not None:
+        query["author"] = author
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query.update(keyset_filter(field, value, last_id))
+
+    projection = SUMMARY_PROJECTION if summary else POST_PROJECTION
+    if archived:
+        # Each tier returns its own first limit + 1 in index order; the merged head is the page.
+        pages = await asyncio.gather(
+            *(_find_listing(db, name, query, projection, field, limit + 1) for name in ("posts", ARCHIVE_COLLECTION))
+        )
+        posts = [unpack(post) for post in _merge_descending(pages, field, limit + 1)]
+    else:
+        posts = await _find_listing(db, "posts", query, projection, field, limit + 1)
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    next_cursor = None
+    if has_more and posts:
+        last = posts[-1]
+        next_cursor = encode_cursor(last.get(field), last["_id"])
+    return {
+        "items": await _build_post_responses(db, posts, summary=summary),
+        "nextCursor": next_cursor,
     }
 
 
+async def _find_comment_page(
+    db, post_object_id: ObjectId, *, limit: Optional[int] = None, cursor: Optional[str] = None
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """One page of a post's comments, oldest first, plus the cursor of the next page."""
+    limit = min(limit or settings.COMMENTS_PAGE_SIZE, settings.POSTS_MAX_PAGE_SIZE)
+    query: Dict[str, Any] = {"post_id": post_object_id}
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query.update(keyset_filter("created_at", value, last_id, descending=False))
+    comments = (
+        await db["comments"]
+        .find(query)
+        .sort([("created_at", ASCENDING), ("_id", ASCENDING)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    if not comments and not cursor and not await _post_exists(db, post_object_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    next_cursor = encode_cursor(comments[-1]["created_at"], comments[-1]["_id"]) if has_more else None
+    return comments, next_cursor
+
+
+async def _record_views(db, post_object_ids: List[ObjectId]) -> Dict[ObjectId, int]:
+    """Buffer one view per existing post; returns post id -> view count including pending views.
+
+    Views of archived posts are counted in the archive; views alone do not restore them.
+    """
+    views: Dict[ObjectId, int] = {}
+    async for post in db["posts"].find({"_id": {"$in": post_object_ids}}, {"views": 1}):
+        view_counter.increment(post["_id"], "views")
+        views[post["_id"]] = post.get("views", 0) + view_counter.pending(post["_id"], "views")
+    missing = [post_id for post_id in post_object_ids if post_id not in views]
+    if missing:
+        for post in await find_archived(db, missing, {"views": 1}):
+            archive_view_counter.increment(post["_id"], "views")
+            views[post["_id"]] = post.get("views", 0) + archive_view_counter.pending(post["_id"], "views")
+    return views
+
+
 @router.get("/")
-async def list_posts(db=Depends(get_db)):
-    posts: List[Dict[str, Any]] = []
-    async for post in db["posts"].find().sort("created_at", -1):
-        posts.append(await _build_post_response(db, post))
-    return posts
+async def list_posts(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    sort: Optional[str] = None,
+    category: Optional[str] = None,
+    summary: bool = False,
+    archived: bool = False,
+    db=Depends(get_db),
+):
+    key = response_cache.list_key(request)
+    entry = await response_cache.get(key)
+    if entry is not None:
+        return await json_response(request, entry)
+    generation = response_cache.generation
+
+    paginated = (
+        limit is not None or cursor is not None or sort is not None or category is not None or summary or archived
+    )
+    if not paginated:
+        # Legacy clients expect the full, unpaginated array.
+        posts = await stale_ok(db, "posts").find({}, POST_PROJECTION).sort("created_at", -1).to_list(length=None)
+        data: Any = await _build_post_responses(db, posts)
+    else:
+        data = await _find_post_page(
+            db,
+            sort=sort or "latest",
+            limit=min(limit or settings.POSTS_PAGE_SIZE, settings.POSTS_MAX_PAGE_SIZE),
+            cursor=cursor,
+            category=category,
+            summary=summary,
+            archived=archived,
+        )
+    return await json_response(request, await response_cache.store(key, data, generation=generation))
+
+
+@router.get("/search")
+async def search_posts(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1),
+    cursor: Optional[str] = None,
+    category: Optional[str] = None,
+    archived: bool = False,
+    db=Depends(get_db),
+):
+    grams = query_grams(q)
+    if not grams:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing query")
+    limit = min(limit, settings.POSTS_MAX_PAGE_SIZE)
+
+    match: Dict[str, Any] = {"search_grams": {"$all": grams}}
+    if category is not None:
+        normalized = _normalize_category(category)
+        if normalized is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+        match["category"] = normalized
+
+    # Score only the newest matches (an index walk on search_grams_id), so common grams stay cheap.
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": match},
+        {"$sort": {"_id": DESCENDING}},
+        {"$limit": settings.SEARCH_MAX_CANDIDATES},
+        {"$project": {**SUMMARY_PROJECTION, "score": score_expression(grams, query_words(q))}},
+    ]
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        pipeline.append({"$match": keyset_filter("score", value, last_id)})
+    pipeline += [{"$sort": {"score": DESCENDING, "_id": DESCENDING}}, {"$limit": limit + 1}]
+
+    collections = ("posts", ARCHIVE_COLLECTION) if archived else ("posts",)
+    pages = await asyncio.gather(
+        *(
+            stale_ok(db, name).aggregate(pipeline, allowDiskUse=True).to_list(length=limit + 1)
+            for name in collections
+        )
+    )
+    posts = _merge_descending(pages, "score", limit + 1)
+    has_more = len(posts) > limit
+    posts = posts[:limit]
+    next_cursor = encode_cursor(posts[-1]["score"], posts[-1]["_id"]) if has_more and posts else None
+    return FastJSONResponse(
+        {"items": await _build_post_responses(db, posts, summary=True), "nextCursor": next_cursor}
+    )
 
 
-@router.post("/", status_code=status.HTTP_201_CREATED)
+@router.get("/popular")
+async def popular_posts(
+    request: Request,
+    limit: int = Query(10, ge=1),
+    category: Optional[str] = None,
+    db=Depends(get_db),
+):
+    key = response_cache.list_key(request)
+    entry = await response_cache.get(key)
+    if entry is not None:
+        return await json_response(request, entry)
+    generation = response_cache.generation
+
+    query: Dict[str, Any] = {}
+    if category is not None:
+        normalized = _normalize_category(category)
+        if normalized is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid category")
+        query["category"] = normalized
+    limit = min(limit, settings.POSTS_MAX_PAGE_SIZE)
+    # Scores are maintained by the ranker, so this is an index walk of `limit` entries.
+    posts = (
+        await stale_ok(db, "posts")
+        .find(query, {**SUMMARY_PROJECTION, SCORE_FIELD: 1})
+        .sort([(SCORE_FIELD, DESCENDING), ("_id", DESCENDING)])
+        .limit(limit)
+        .to_list(length=limit)
+    )
+    items = await _build_post_responses(db, posts, summary=True)
+    for item, post in zip(items, posts):
+        item["score"] = post.get(SCORE_FIELD, 0.0)
+    return await json_response(request, await response_cache.store(key, {"items": items}, generation=generation))
+
+
+@router.get("/{post_id}")
+async def get_post(post_id: str, request: Request, db=Depends(get_db)):
+    post_object_id = ensure_object_id(post_id, field="postId")
+    key = response_cache.post_key(post_object_id)
+    entry = await response_cache.get(key)
+    if entry is None:
+        generation = response_cache.generation
+        post = await db["posts"].find_one({"_id": post_object_id}, POST_PROJECTION)
+        if not post:
+            post = await find_one_archived(db, post_object_id, POST_PROJECTION)
+        if not post:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+        entry = await response_cache.store(key, await _build_post_response(db, post), generation=generation)
+    return await json_response(request, entry)
+
+
+@router.post(
+    "/", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("posts", per_user=True))]
+)
 async def create_post(
     payload: Dict[str, Any],
     db=Depends(get_db),
@@ -99,29 +506,40 @@ async def create_post(
     if not title or not body:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing fields")
 
-    now = datetime.utcnow()
+    now = utcnow_ms()
     doc = {
         "author": current_user["_id"],
         "title": title,
         "body": body,
         "imageUrl": image_url,
-        "comments": [],
-        "likes": payload.get("likes", 0) or 0,
-        "dislikes": payload.get("dislikes", 0) or 0,
-        "views": payload.get("views", 0) or 0,
+        "commentCount": 0,
+        # Counters are owned by the views/reactions endpoints, never by the client.
+        "likes": 0,
+        "dislikes": 0,
+        "views": 0,
         "category": category,
         "created_at": now,
         "updated_at": now,
+        **build_search_fields(title, body),
     }
-    result = await db["posts"].insert_one(doc)
-    inserted = await db["posts"].find_one({"_id": result.inserted_id})
-    return await _build_post_response(db, inserted)
-
-
-@router.post("/{post_id}/comments", status_code=status.HTTP_201_CREATED)
+    # Scored on insert so the post ranks right away instead of after the ranker's next pass.
+    doc[SCORE_FIELD] = popularity_score(doc)
+    await db["posts"].insert_one(doc)
+    await bump_user_count(db, current_user["_id"], POSTS)
+    await response_cache.invalidate_lists()
+    await broker.publish({"type": "post.created", "postId": str_object_id(doc["_id"])})
+    return await _build_post_response(db, doc, known_user=current_user)
+
+
+@router.post(
+    "/{post_id}/comments",
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(rate_limit("comments", per_user=True))],
+)
 async def add_comment(
     post_id: str,
     payload: Dict[str, Any],
+    full: bool = False,
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -130,23 +548,45 @@ async def add_comment(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing content")
 
     post_object_id = ensure_object_id(post_id, field="postId")
+    now = utcnow_ms()
     comment_doc = {
         "_id": ObjectId(),
+        "post_id": post_object_id,
         "author": current_user["_id"],
         "content": content,
-        "created_at": datetime.utcnow(),
-        "updated_at": datetime.utcnow(),
+        "created_at": now,
+        "updated_at": now,
     }
 
-    result = await db["posts"].update_one(
-        {"_id": post_object_id},
-        {"$push": {"comments": comment_doc}, "$set": {"updated_at": datetime.utcnow()}},
-    )
-    if result.matched_count == 0:
+    update = {"$inc": {"commentCount": 1}, "$set": {"updated_at": now}}
+    matched, post = await _update_post_fields(db, post_object_id, update, full=full)
+    if not matched:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    await db["comments"].insert_one(comment_doc)
+    await bump_user_count(db, current_user["_id"], COMMENTS)
+    rollups.record(post_object_id, "comments")
+    ranker.mark_dirty([post_object_id])
+    await response_cache.invalidate_post(post_object_id)
+    serialized = _serialize_comment(comment_doc, {current_user["_id"]: current_user})
+    await broker.publish({"type": "comment.added", "postId": str_object_id(post_object_id), "comment": serialized})
+
+    if full:
+        return await _build_post_response(db, post, known_user=current_user)
+    return serialized
 
-    post = await db["posts"].find_one({"_id": post_object_id})
-    return await _build_post_response(db, post)
+
+@router.get("/{post_id}/comments")
+async def list_comments(
+    post_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db=Depends(get_db),
+):
+    post_object_id = ensure_object_id(post_id, field="postId")
+    comments, next_cursor = await _find_comment_page(db, post_object_id, limit=limit, cursor=cursor)
+    users_map = await _collect_users(db, {_normalize_object_id(c["author"]) for c in comments})
+    items = [_serialize_comment(c, users_map) for c in comments]
+    return FastJSONResponse({"items": items, "nextCursor": next_cursor})
 
 
 @router.put("/{post_id}")
@@ -157,11 +597,7 @@ async def update_post(
     current_user=Depends(get_current_user),
 ):
     post_object_id = ensure_object_id(post_id, field="postId")
-    post = await db["posts"].find_one({"_id": post_object_id})
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    if post["author"] != current_user["_id"]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    post = await _find_own_hot_post(db, post_object_id, current_user["_id"])
 
     updates: Dict[str, Any] = {}
     if "title" in payload and (payload["title"] or "").strip():
@@ -174,12 +610,26 @@ async def update_post(
         updates["category"] = _normalize_category(payload.get("category"))
 
     if not updates:
-        return await _build_post_response(db, post)
+        return await _build_post_response(db, post, known_user=current_user)
 
-    updates["updated_at"] = datetime.utcnow()
-    await db["posts"].update_one({"_id": post_object_id}, {"$set": updates})
-    updated = await db["posts"].find_one({"_id": post_object_id})
-    return await _build_post_response(db, updated)
+    if "title" in updates or "body" in updates:
+        updates.update(
+            build_search_fields(updates.get("title", post.get("title", "")), updates.get("body", post.get("body", "")))
+        )
+    updates["updated_at"] = utcnow_ms()
+    updated = await db["posts"].find_one_and_update(
+        {"_id": post_object_id, "author": current_user["_id"]},
+        {"$set": updates},
+        projection=POST_PROJECTION,
+        return_document=ReturnDocument.AFTER,
+    )
+    if not updated:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    if "category" in updates:
+        rollups.forget_category(post_object_id)
+    await response_cache.invalidate_post(post_object_id)
+    await broker.publish({"type": "post.updated", "postId": str_object_id(post_object_id)})
+    return await _build_post_response(db, updated, known_user=current_user)
 
 
 @router.delete("/{post_id}")
@@ -189,13 +639,18 @@ async def delete_post(
     current_user=Depends(get_current_user),
 ):
     post_object_id = ensure_object_id(post_id, field="postId")
-    post = await db["posts"].find_one({"_id": post_object_id})
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    if post["author"] != current_user["_id"]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+    post = await _find_own_hot_post(db, post_object_id, current_user["_id"])
 
     await db["posts"].delete_one({"_id": post_object_id})
+    await bump_user_count(db, current_user["_id"], POSTS, -1)
+    commenters = db["comments"].aggregate(
+        [{"$match": {"post_id": post_object_id}}, {"$group": {"_id": "$author", "count": {"$sum": 1}}}]
+    )
+    await bump_user_counts(db, COMMENTS, {group["_id"]: -group["count"] async for group in commenters})
+    await db["comments"].delete_many({"post_id": post_object_id})
+    await db["reactions"].delete_many({"post_id": post_object_id})
+    await response_cache.invalidate_post(post_object_id)
+    await broker.publish({"type": "post.deleted", "postId": str_object_id(post_object_id)})
     return {"message": "Post deleted"}
 
 
@@ -203,44 +658,46 @@ async def delete_post(
 async def delete_comment(
     post_id: str,
     comment_id: str,
+    full: bool = False,
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
     post_object_id = ensure_object_id(post_id, field="postId")
     comment_object_id = ensure_object_id(comment_id, field="commentId")
 
-    post = await db["posts"].find_one({"_id": post_object_id})
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-
-    comment = next((c for c in post.get("comments", []) if c["_id"] == comment_object_id), None)
-    if not comment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    if comment["author"] != current_user["_id"]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
-
-    await db["posts"].update_one(
-        {"_id": post_object_id},
+    # Ownership is part of the filter, so check-and-delete is a single atomic write.
+    deleted = await db["comments"].find_one_and_delete(
+        {"_id": comment_object_id, "post_id": post_object_id, "author": current_user["_id"]},
+        projection={"_id": 1},
+    )
+    if not deleted:
+        await _raise_comment_write_failed(db, post_object_id, comment_object_id)
+    await bump_user_count(db, current_user["_id"], COMMENTS, -1)
+
+    update = {"$inc": {"commentCount": -1}, "$set": {"updated_at": utcnow_ms()}}
+    _, post = await _update_post_fields(db, post_object_id, update, full=full)
+    ranker.mark_dirty([post_object_id])
+    await response_cache.invalidate_post(post_object_id)
+    await broker.publish(
         {
-            "$pull": {"comments": {"_id": comment_object_id}},
-            "$set": {"updated_at": datetime.utcnow()},
-        },
+            "type": "comment.deleted",
+            "postId": str_object_id(post_object_id),
+            "commentId": str_object_id(comment_object_id),
+        }
     )
-    post = await db["posts"].find_one({"_id": post_object_id})
-    return await _build_post_response(db, post)
 
+    if full and post:
+        return await _build_post_response(db, post)
+    return {"message": "Comment deleted", "_id": comment_id, "id": comment_id}
 
-@router.post("/{post_id}/views")
+
+@router.post("/{post_id}/views", dependencies=[Depends(rate_limit("views", per_viewer=True))])
 async def increment_post_views(post_id: str, db=Depends(get_db)):
     post_object_id = ensure_object_id(post_id, field="postId")
-    updated = await db["posts"].find_one_and_update(
-        {"_id": post_object_id},
-        {"$inc": {"views": 1}, "$set": {"updated_at": datetime.utcnow()}},
-        return_document=ReturnDocument.AFTER,
-    )
-    if not updated:
+    views = await _record_views(db, [post_object_id])
+    if post_object_id not in views:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-    return await _build_post_response(db, updated)
+    return {"_id": post_id, "id": post_id, "views": views[post_object_id]}
 
 
 @router.put("/{post_id}/comments/{comment_id}")
@@ -248,6 +705,7 @@ async def update_comment(
     post_id: str,
     comment_id: str,
     payload: Dict[str, Any],
+    full: bool = False,
     db=Depends(get_db),
     current_user=Depends(get_current_user),
 ):
@@ -257,26 +715,20 @@ async def update_comment(
     if not content:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Missing content")
 
-    post = await db["posts"].find_one({"_id": post_object_id})
-    if not post:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
-
-    comment = next((c for c in post.get("comments", []) if c["_id"] == comment_object_id), None)
+    now = utcnow_ms()
+    comment = await db["comments"].find_one_and_update(
+        {"_id": comment_object_id, "post_id": post_object_id, "author": current_user["_id"]},
+        {"$set": {"content": content, "updated_at": now}},
+        return_document=ReturnDocument.AFTER,
+    )
     if not comment:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
-    if comment["author"] != current_user["_id"]:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized")
+        await _raise_comment_write_failed(db, post_object_id, comment_object_id)
 
-    await db["posts"].update_one(
-        {"_id": post_object_id, "comments._id": comment_object_id},
-        {
-            "$set": {
-                "comments.$.content": content,
-                "comments.$.updated_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow(),
-            }
-        },
-    )
+    _, post = await _update_post_fields(db, post_object_id, {"$set": {"updated_at": now}}, full=full)
+    await response_cache.invalidate_post(post_object_id)
+    serialized = _serialize_comment(comment, {current_user["_id"]: current_user})
+    await broker.publish({"type": "comment.updated", "postId": str_object_id(post_object_id), "comment": serialized})
 
-    post = await db["posts"].find_one({"_id": post_object_id})
-    return await _build_post_response(db, post)
+    if full and post:
+        return await _build_post_response(db, post)
+    return serialized
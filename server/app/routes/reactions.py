@@ -0,0 +1,119 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..archive import restore_post
+from ..counters import reaction_counter
+from ..database import get_db
+from ..dependencies import get_current_user
+from ..limits import rate_limit
+from ..settings import settings
+from ..utils import ensure_object_id, str_object_id
+
+router = APIRouter(prefix="/api/posts", tags=["reactions"])
+
+# Reaction type -> post counter field.
+REACTION_FIELDS = {"like": "likes", "dislike": "dislikes"}
+
+
+async def _load_counts(db, post_object_id: ObjectId) -> Dict[str, Any]:
+    post = await db["posts"].find_one({"_id": post_object_id}, {"likes": 1, "dislikes": 1})
+    if not post and await restore_post(db, post_object_id):
+        # Reacting to an archived post brings it back to the hot collection, where counters are flushed.
+        post = await db["posts"].find_one({"_id": post_object_id}, {"likes": 1, "dislikes": 1})
+    if not post:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    return post
+
+
+def _reaction_response(post: Dict[str, Any], reaction: Optional[str]) -> Dict[str, Any]:
+    post_id = post["_id"]
+    return {
+        "postId": str_object_id(post_id),
+        "reaction": reaction,
+        "likes": post.get("likes", 0) + reaction_counter.pending(post_id, "likes"),
+        "dislikes": post.get("dislikes", 0) + reaction_counter.pending(post_id, "dislikes"),
+    }
+
+
+def _apply_delta(post_id: ObjectId, previous: Optional[str], current: Optional[str]) -> None:
+    if previous == current:
+        return
+    if previous in REACTION_FIELDS:
+        reaction_counter.increment(post_id, REACTION_FIELDS[previous], -1)
+    if current in REACTION_FIELDS:
+        reaction_counter.increment(post_id, REACTION_FIELDS[current], 1)
+
+
+async def _viewer_reactions(db, user_id: ObjectId, post_ids: List[ObjectId]) -> Dict[str, Optional[str]]:
+    if len(post_ids) > settings.POSTS_MAX_PAGE_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Too many ids")
+    result: Dict[str, Optional[str]] = {str_object_id(post_id): None for post_id in post_ids}
+    cursor = db["reactions"].find({"post_id": {"$in": post_ids}, "user_id": user_id}, {"post_id": 1, "type": 1})
+    async for reaction in cursor:
+        result[str_object_id(reaction["post_id"])] = reaction["type"]
+    return result
+
+
+@router.get("/reactions/me")
+async def my_reactions(
+    ids: str = Query(..., description="Comma separated post ids"),
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    post_ids = [ensure_object_id(value, field="postId") for value in ids.split(",") if value.strip()]
+    return await _viewer_reactions(db, current_user["_id"], post_ids)
+
+
+@router.post("/{post_id}/reactions", dependencies=[Depends(rate_limit("reactions", per_user=True))])
+async def set_reaction(
+    post_id: str,
+    payload: Dict[str, Any],
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    reaction_type = (payload.get("type") or "").strip().lower()
+    if reaction_type not in REACTION_FIELDS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reaction")
+
+    post_object_id = ensure_object_id(post_id, field="postId")
+    post = await _load_counts(db, post_object_id)
+
+    key = {"post_id": post_object_id, "user_id": current_user["_id"]}
+    now = datetime.utcnow()
+    update = {"$set": {"type": reaction_type, "updated_at": now}, "$setOnInsert": {"created_at": now}}
+    # findAndModify on the unique (post_id, user_id) document serializes double clicks:
+    # each call sees the state the previous one left, so counter deltas never double count.
+    for attempt in range(2):
+        try:
+            previous = await db["reactions"].find_one_and_update(
+                key, update, projection={"type": 1}, upsert=True, return_document=ReturnDocument.BEFORE
+            )
+            break
+        except DuplicateKeyError:
+            # Two concurrent upserts raced to insert; the loser retries as a plain update.
+            if attempt:
+                raise
+
+    _apply_delta(post_object_id, previous["type"] if previous else None, reaction_type)
+    return _reaction_response(post, reaction_type)
+
+
+@router.delete("/{post_id}/reactions", dependencies=[Depends(rate_limit("reactions", per_user=True))])
+async def clear_reaction(
+    post_id: str,
+    db=Depends(get_db),
+    current_user=Depends(get_current_user),
+):
+    post_object_id = ensure_object_id(post_id, field="postId")
+    post = await _load_counts(db, post_object_id)
+
+    previous = await db["reactions"].find_one_and_delete(
+        {"post_id": post_object_id, "user_id": current_user["_id"]}, projection={"type": 1}
+    )
+    _apply_delta(post_object_id, previous["type"] if previous else None, None)
+    return _reaction_response(post, None)
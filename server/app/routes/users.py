@@ -0,0 +1,104 @@
+from typing import Any, Dict, Optional
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pymongo import DESCENDING
+
+from ..archive import find_archived
+from ..database import get_db, stale_ok
+from ..dependencies import get_optional_user
+from ..responses import FastJSONResponse
+from ..settings import settings
+from ..user_counts import COUNT_PROJECTION, user_counts
+from ..utils import build_author_payload, decode_cursor, encode_cursor, ensure_object_id, keyset_filter, str_object_id
+from .posts import _find_post_page, _serialize_comment
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+async def _load_user(db, user_id: str, current_user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """``me`` is the caller; anything else must be a user id."""
+    if user_id == "me":
+        if current_user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No token provided")
+        user_object_id = current_user["_id"]
+    else:
+        user_object_id = ensure_object_id(user_id, field="userId")
+    user = await db["users"].find_one({"_id": user_object_id}, {"username": 1, **COUNT_PROJECTION})
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    return user
+
+
+@router.get("/{user_id}/posts")
+async def list_user_posts(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    summary: bool = False,
+    archived: bool = False,
+    db=Depends(get_db),
+    current_user=Depends(get_optional_user),
+):
+    user = await _load_user(db, user_id, current_user)
+    page = await _find_post_page(
+        db,
+        sort="latest",
+        limit=min(limit or settings.POSTS_PAGE_SIZE, settings.POSTS_MAX_PAGE_SIZE),
+        cursor=cursor,
+        summary=summary,
+        archived=archived,
+        author=user["_id"],
+    )
+    counts = await user_counts(db, user)
+    return FastJSONResponse({**page, "user": build_author_payload(user), "count": counts["posts"]})
+
+
+@router.get("/{user_id}/comments")
+async def list_user_comments(
+    user_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    db=Depends(get_db),
+    current_user=Depends(get_optional_user),
+):
+    """The user's comments, newest first, each with the id and title of its post."""
+    user = await _load_user(db, user_id, current_user)
+    limit = min(limit or settings.COMMENTS_PAGE_SIZE, settings.POSTS_MAX_PAGE_SIZE)
+    query: Dict[str, Any] = {"author": user["_id"]}
+    if cursor:
+        value, last_id = decode_cursor(cursor)
+        query.update(keyset_filter("created_at", value, last_id))
+    comments = (
+        await stale_ok(db, "comments")
+        .find(query)
+        .sort([("created_at", DESCENDING), ("_id", DESCENDING)])
+        .limit(limit + 1)
+        .to_list(length=limit + 1)
+    )
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    next_cursor = encode_cursor(comments[-1]["created_at"], comments[-1]["_id"]) if has_more else None
+
+    post_ids = list({comment["post_id"] for comment in comments})
+    titles: Dict[ObjectId, str] = {}
+    async for post in db["posts"].find({"_id": {"$in": post_ids}}, {"title": 1}):
+        titles[post["_id"]] = post.get("title", "")
+    missing = [post_id for post_id in post_ids if post_id not in titles]
+    if missing:
+        for post in await find_archived(db, missing, {"title": 1}):
+            titles[post["_id"]] = post.get("title", "")
+
+    users_map = {user["_id"]: user}
+    items = [
+        {
+            **_serialize_comment(comment, users_map),
+            "postId": str_object_id(comment["post_id"]),
+            "postTitle": titles.get(comment["post_id"]),
+        }
+        for comment in comments
+    ]
+    counts = await user_counts(db, user)
+    return FastJSONResponse(
+        {"items": items, "nextCursor": next_cursor, "user": build_author_payload(user), "count": counts["comments"]}
+    )
@@ -0,0 +1,77 @@
+"""Character n-gram tokenization for post search.
+
+Korean text does not split cleanly on whitespace (particles attach directly
+to nouns), so posts are indexed by single characters plus overlapping
+character bigrams instead of words. A query matches a post when every one of
+its grams is present, which approximates the substring search the client used
+to do. Single-character query words fall back to the unigram entries.
+
+Matches are ranked by how many query grams hit the title (weighted) plus how
+many query words appear verbatim in the body, so body-only hits are ordered
+too. Only the newest ``SEARCH_MAX_CANDIDATES`` matches are scored.
+"""
+import re
+import unicodedata
+from typing import Any, Dict, Iterable, List, Set
+
+GRAM_SIZE = 2
+
+# A title gram hit outranks a body word hit.
+TITLE_GRAM_WEIGHT = 2
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(text: str) -> Iterable[str]:
+    normalized = unicodedata.normalize("NFKC", text or "").lower()
+    return _WORD_RE.findall(normalized)
+
+
+def _ngrams(word: str) -> Iterable[str]:
+    for start in range(len(word) - GRAM_SIZE + 1):
+        yield word[start : start + GRAM_SIZE]
+
+
+def index_grams(text: str) -> List[str]:
+    grams: Set[str] = set()
+    for word in _words(text):
+        grams.update(word)
+        grams.update(_ngrams(word))
+    return sorted(grams)
+
+
+def query_grams(text: str) -> List[str]:
+    grams: Set[str] = set()
+    for word in _words(text):
+        if len(word) < GRAM_SIZE:
+            grams.add(word)
+        else:
+            grams.update(_ngrams(word))
+    return sorted(grams)
+
+
+def query_words(text: str) -> List[str]:
+    return sorted(set(_words(text)))
+
+
+def score_expression(grams: List[str], words: List[str]) -> Dict[str, Any]:
+    """Aggregation expression scoring one candidate post against the query."""
+    title_hits = {"$size": {"$setIntersection": [{"$ifNull": ["$title_grams", []]}, grams]}}
+    # Archived posts may only have a compressed body, which scores no body hits.
+    body_hits = [
+        {"$cond": [{"$gte": [{"$indexOfCP": ["$$body", word]}, 0]}, 1, 0]} for word in words
+    ]
+    return {
+        "$let": {
+            "vars": {"body": {"$toLower": {"$ifNull": ["$body", ""]}}},
+            "in": {"$add": [{"$multiply": [TITLE_GRAM_WEIGHT, title_hits]}, *body_hits]},
+        }
+    }
+
+
+def build_search_fields(title: str, body: str) -> Dict[str, Any]:
+    title_grams = index_grams(title)
+    return {
+        "title_grams": title_grams,
+        "search_grams": sorted(set(title_grams) | set(index_grams(body))),
+    }
@@ -1,20 +1,58 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Callable, Dict, TypeVar
 
 import bcrypt
 import jwt
+from fastapi import HTTPException, status
 
 from .settings import settings
 
+T = TypeVar("T")
+
+# bcrypt releases the GIL while hashing, so a thread pool gives real parallelism.
+_bcrypt_executor = ThreadPoolExecutor(max_workers=settings.BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_bcrypt_capacity = settings.BCRYPT_WORKERS + settings.BCRYPT_MAX_QUEUE
+_bcrypt_in_flight = 0
+
 
 def hash_password(raw_password: str) -> str:
-    return bcrypt.hashpw(raw_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+    return bcrypt.hashpw(raw_password.encode("utf-8"), salt).decode("utf-8")
 
 
 def verify_password(raw_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(raw_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+async def _run_bcrypt(func: Callable[..., T], *args: Any) -> T:
+    global _bcrypt_in_flight
+    if _bcrypt_in_flight >= _bcrypt_capacity:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, try again",
+            headers={"Retry-After": "1"},
+        )
+    _bcrypt_in_flight += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_bcrypt_executor, func, *args)
+    finally:
+        _bcrypt_in_flight -= 1
+
+
+async def hash_password_async(raw_password: str) -> str:
+    return await _run_bcrypt(hash_password, raw_password)
+
+
+async def verify_password_async(raw_password: str, hashed_password: str) -> bool:
+    return await _run_bcrypt(verify_password, raw_password, hashed_password)
+
+
+def shutdown_password_pool() -> None:
+    _bcrypt_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(payload: Dict[str, Any]) -> str:
     data = payload.copy()
     data["exp"] = datetime.utcnow() + settings.JWT_EXPIRE_DELTA
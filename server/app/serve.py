@@ -0,0 +1,96 @@
+"""Production entry point: ``python -m app.serve [--workers N] [--host H] [--port P]``.
+
+Runs ``WEB_WORKERS`` uvicorn worker processes on one shared socket. Each
+worker warms up (connects, ensures indexes, replays ``WARMUP_PATHS``) before
+it accepts connections. On SIGTERM a worker fails ``/readyz`` and ends its
+event streams, keeps serving for ``DRAIN_DELAY`` seconds so the load balancer
+notices, then closes its listener and gives in-flight requests up to
+``DRAIN_TIMEOUT`` seconds before shutting down.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from typing import List, Optional
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from .health import health
+from .settings import settings
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class DrainingServer(uvicorn.Server):
+    async def shutdown(self, sockets: Optional[List] = None) -> None:
+        health.start_drain()
+        logger.info("Draining for %.1fs before closing listeners", settings.DRAIN_DELAY)
+        deadline = asyncio.get_running_loop().time() + settings.DRAIN_DELAY
+        # A second signal sets force_exit and skips the rest of the delay.
+        while not self.force_exit and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.1)
+        await super().shutdown(sockets)
+
+
+def split_pool_budget(workers: int) -> None:
+    """Give each worker an equal share of ``MONGO_POOL_BUDGET`` connections.
+
+    Spawned workers read it from the environment; the single-worker path
+    reuses this process's already-loaded settings.
+    """
+    if not settings.MONGO_POOL_BUDGET:
+        return
+    per_worker = max(1, settings.MONGO_POOL_BUDGET // workers)
+    min_pool = min(settings.MONGO_MIN_POOL_SIZE, per_worker)
+    os.environ["MONGO_MAX_POOL_SIZE"] = str(per_worker)
+    os.environ["MONGO_MIN_POOL_SIZE"] = str(min_pool)
+    settings.MONGO_MAX_POOL_SIZE = per_worker
+    settings.MONGO_MIN_POOL_SIZE = min_pool
+    logger.info("Mongo pool: %d connections per worker (%d workers)", per_worker, workers)
+
+
+def warn_per_worker_state(workers: int) -> None:
+    if workers < 2:
+        return
+    if settings.EVENTS_BACKEND != "mongo":
+        logger.warning(
+            "EVENTS_BACKEND=%s: clients only see changes made through their own worker", settings.EVENTS_BACKEND
+        )
+    if settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND != "mongo":
+        logger.warning(
+            "RATE_LIMIT_BACKEND=%s: each worker keeps its own buckets, so limits are %dx looser",
+            settings.RATE_LIMIT_BACKEND,
+            workers,
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument("--host", default=settings.WEB_HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    args = parser.parse_args(argv)
+    workers = max(1, args.workers)
+
+    config = uvicorn.Config(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        proxy_headers=True,
+        timeout_graceful_shutdown=int(settings.DRAIN_TIMEOUT) or None,
+    )
+    # After Config, which sets up uvicorn's logging; before any worker imports the app.
+    split_pool_budget(workers)
+    warn_per_worker_state(workers)
+    server = DrainingServer(config)
+    if workers == 1:
+        server.run()
+        return
+    sock = config.bind_socket()
+    Multiprocess(config, target=server.run, sockets=[sock]).run()
+
+
+if __name__ == "__main__":
+    main()
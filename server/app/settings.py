@@ -14,9 +14,139 @@ class Settings:
 
     PORT = int(os.getenv("PORT", "5000"))
     MONGO_URI = os.getenv("MONGO_URI", "mongodb://127.0.0.1:27017/memo-app")
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))  # 0 = no timeout
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")  # e.g. "zstd,snappy,zlib"
+    # List/search/popular reads; e.g. "secondaryPreferred" with a staleness bound (>= 90, -1 = none).
+    MONGO_READ_PREFERENCE = os.getenv("MONGO_READ_PREFERENCE", "primary")
+    MONGO_MAX_STALENESS_SECONDS = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "-1"))
+    # Commands slower than this are logged with their (redacted) shape; 0 disables.
+    MONGO_SLOW_QUERY_MS = int(os.getenv("MONGO_SLOW_QUERY_MS", "200"))
     JWT_SECRET = os.getenv("JWT_SECRET", "change_this_secret")
     JWT_ALGORITHM = "HS256"
     JWT_EXPIRE_DELTA = timedelta(days=7)
 
+    # Decoded tokens + user documents, reused until the token expires or the TTL lapses.
+    AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    AUTH_CACHE_TTL = float(os.getenv("AUTH_CACHE_TTL", "60"))
+
+    # Serialized GET /api/posts responses; the TTL bounds staleness of buffered view counts.
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "5"))
+
+    # Hot score: log10(likes - dislikes + w_v*views + w_c*comments) + created_at / time scale (seconds).
+    POPULAR_VIEW_WEIGHT = float(os.getenv("POPULAR_VIEW_WEIGHT", "0.1"))
+    POPULAR_COMMENT_WEIGHT = float(os.getenv("POPULAR_COMMENT_WEIGHT", "2"))
+    POPULAR_TIME_SCALE = float(os.getenv("POPULAR_TIME_SCALE", "45000"))
+    POPULAR_DIRTY_INTERVAL = float(os.getenv("POPULAR_DIRTY_INTERVAL", "5"))
+
+    # Server-sent change events. "mongo" shares events between workers via a capped collection.
+    EVENTS_BACKEND = os.getenv("EVENTS_BACKEND", "memory")
+    EVENTS_COLLECTION = os.getenv("EVENTS_COLLECTION", "events")
+    EVENTS_CAPPED_BYTES = int(os.getenv("EVENTS_CAPPED_BYTES", str(16 * 1024 * 1024)))
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+
+    # bcrypt runs on a bounded thread pool; requests beyond workers + queue get a 503.
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    BCRYPT_MAX_QUEUE = int(os.getenv("BCRYPT_MAX_QUEUE", "32"))
+
+    # Token buckets as "<burst>/<seconds>" per rule ("0" disables one). "mongo" shares buckets between workers.
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_COLLECTION = os.getenv("RATE_LIMIT_COLLECTION", "rate_limits")
+    RATE_LIMIT_STORE_SIZE = int(os.getenv("RATE_LIMIT_STORE_SIZE", "100000"))
+    RATE_LIMIT_LOGIN = os.getenv("RATE_LIMIT_LOGIN", "10/60")
+    RATE_LIMIT_REGISTER = os.getenv("RATE_LIMIT_REGISTER", "5/300")
+    RATE_LIMIT_POSTS = os.getenv("RATE_LIMIT_POSTS", "10/60")
+    RATE_LIMIT_COMMENTS = os.getenv("RATE_LIMIT_COMMENTS", "30/60")
+    # Views are per signed-in user, else per IP, where a NAT or campus network can put many readers
+    # behind one address. A batch posts.views operation is charged one view per id.
+    RATE_LIMIT_VIEWS = os.getenv("RATE_LIMIT_VIEWS", "300/60")
+    RATE_LIMIT_VIEWS_ANONYMOUS = os.getenv("RATE_LIMIT_VIEWS_ANONYMOUS", "3000/60")
+    RATE_LIMIT_REACTIONS = os.getenv("RATE_LIMIT_REACTIONS", "60/60")
+    RATE_LIMIT_UPLOADS = os.getenv("RATE_LIMIT_UPLOADS", "20/300")
+
+    # Response compression; brotli/zstd need their optional packages. Levels favour speed for dynamic bodies.
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+    COMPRESSION_ENCODINGS = os.getenv("COMPRESSION_ENCODINGS", "zstd,br,gzip")  # server preference order
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_THREAD_THRESHOLD = int(os.getenv("COMPRESSION_THREAD_THRESHOLD", str(64 * 1024)))
+    COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", "5"))
+    COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+    # Uploaded images, stored by content hash with a WebP thumbnail next to each.
+    MEDIA_DIR = os.getenv("MEDIA_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "media"))
+    MEDIA_MAX_BYTES = int(os.getenv("MEDIA_MAX_BYTES", str(10 * 1024 * 1024)))
+    MEDIA_THUMB_SIZE = int(os.getenv("MEDIA_THUMB_SIZE", "480"))
+    # Decoded size is width x height x up to 4 bytes, whatever the file size; 40 MP is ~160 MB.
+    MEDIA_MAX_PIXELS = int(os.getenv("MEDIA_MAX_PIXELS", str(40_000_000)))
+    MEDIA_WORKERS = int(os.getenv("MEDIA_WORKERS", str(min(2, os.cpu_count() or 1))))
+
+    # Global load shedding: at most N requests in flight; 503 after waiting this long for a slot (0 = off).
+    SHED_MAX_CONCURRENCY = int(os.getenv("SHED_MAX_CONCURRENCY", "256"))
+    SHED_MAX_QUEUE_MS = float(os.getenv("SHED_MAX_QUEUE_MS", "200"))
+
+    # Prometheus metrics at /metrics. Sampled requests also get per-request Mongo stats + Server-Timing.
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", "0.1"))
+
+    # POST /api/batch: most operations accepted in one request.
+    BATCH_MAX_OPERATIONS = int(os.getenv("BATCH_MAX_OPERATIONS", "20"))
+
+    # Production entry point (python -m app.serve). MONGO_POOL_BUDGET is split evenly across workers (0 = off).
+    WEB_HOST = os.getenv("WEB_HOST", "0.0.0.0")
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", str(os.cpu_count() or 1)))
+    MONGO_POOL_BUDGET = int(os.getenv("MONGO_POOL_BUDGET", "0"))
+    # After SIGTERM /readyz fails for DRAIN_DELAY seconds before listeners close, then in-flight
+    # requests get up to DRAIN_TIMEOUT seconds to finish.
+    DRAIN_DELAY = float(os.getenv("DRAIN_DELAY", "5"))
+    DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "30"))
+    # Requests replayed in-process before a worker reports ready, and the /readyz Mongo ping bound.
+    WARMUP_PATHS = os.getenv("WARMUP_PATHS", "/api/posts/?summary=true,/api/posts/popular")
+    WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "10"))
+    READY_PING_TIMEOUT = float(os.getenv("READY_PING_TIMEOUT", "1"))
+
+    # scripts/archive_posts.py moves posts past ARCHIVE_AFTER_DAYS and idle ARCHIVE_IDLE_DAYS into posts_archive.
+    ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "365"))
+    ARCHIVE_IDLE_DAYS = int(os.getenv("ARCHIVE_IDLE_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+    ARCHIVE_COMPRESS_BODY = os.getenv("ARCHIVE_COMPRESS_BODY", "true").lower() in ("1", "true", "yes")
+
+    # Per-minute/hour/day rollups of views, reactions and comments; minute and hour buckets expire.
+    ANALYTICS_ENABLED = os.getenv("ANALYTICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    ANALYTICS_COLLECTION = os.getenv("ANALYTICS_COLLECTION", "rollups")
+    ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "10"))
+    # (post, minute) entries plus retried bucket updates kept while flushes fail; later activity is dropped.
+    ANALYTICS_MAX_PENDING = int(os.getenv("ANALYTICS_MAX_PENDING", "50000"))
+    ANALYTICS_MINUTE_RETENTION_HOURS = int(os.getenv("ANALYTICS_MINUTE_RETENTION_HOURS", "48"))
+    ANALYTICS_HOUR_RETENTION_DAYS = int(os.getenv("ANALYTICS_HOUR_RETENTION_DAYS", "90"))
+    ANALYTICS_CATEGORY_CACHE_SIZE = int(os.getenv("ANALYTICS_CATEGORY_CACHE_SIZE", "10000"))
+    ANALYTICS_MAX_POINTS = int(os.getenv("ANALYTICS_MAX_POINTS", "1440"))
+
+    # GET /api/posts/search ranks at most this many of the newest matching posts.
+    SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+    POSTS_PAGE_SIZE = int(os.getenv("POSTS_PAGE_SIZE", "20"))
+    POSTS_MAX_PAGE_SIZE = int(os.getenv("POSTS_MAX_PAGE_SIZE", "100"))
+    COMMENTS_PAGE_SIZE = int(os.getenv("COMMENTS_PAGE_SIZE", "50"))
+
+    # Post views are buffered in memory; at most VIEW_FLUSH_MAX_PENDING can be lost on a crash.
+    VIEW_FLUSH_INTERVAL = float(os.getenv("VIEW_FLUSH_INTERVAL", "2.0"))
+    VIEW_FLUSH_MAX_PENDING = int(os.getenv("VIEW_FLUSH_MAX_PENDING", "1000"))
+    # Like/dislike counter deltas use the same write-behind scheme; reactions themselves are durable.
+    REACTION_FLUSH_INTERVAL = float(os.getenv("REACTION_FLUSH_INTERVAL", "1.0"))
+    REACTION_FLUSH_MAX_PENDING = int(os.getenv("REACTION_FLUSH_MAX_PENDING", "1000"))
+    # Failed flushes back off exponentially up to this many seconds; an update that keeps hitting a
+    # write error is dropped after FLUSH_RETRY_ATTEMPTS tries.
+    FLUSH_RETRY_MAX_DELAY = float(os.getenv("FLUSH_RETRY_MAX_DELAY", "60"))
+    FLUSH_RETRY_ATTEMPTS = int(os.getenv("FLUSH_RETRY_ATTEMPTS", "5"))
+
 
 settings = Settings()
@@ -0,0 +1,51 @@
+"""Per-user post and comment counts kept on the user document.
+
+Writes ``$inc`` the counters only once they exist, so a user whose counters
+were never initialised cannot end up with a partial count. Such users are
+counted from the author indexes instead (a ``COUNT_SCAN``, no documents are
+read) until ``scripts/backfill_user_counts.py`` sets the fields.
+"""
+from typing import Any, Dict
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from .archive import ARCHIVE_COLLECTION
+
+POSTS = "postCount"
+COMMENTS = "commentCount"
+COUNT_PROJECTION = {POSTS: 1, COMMENTS: 1}
+
+
+async def bump_user_count(db: AsyncIOMotorDatabase, user_id: ObjectId, field: str, delta: int = 1) -> None:
+    await db["users"].update_one({"_id": user_id, field: {"$exists": True}}, {"$inc": {field: delta}})
+
+
+async def bump_user_counts(db: AsyncIOMotorDatabase, field: str, deltas: Dict[ObjectId, int]) -> None:
+    operations = [
+        UpdateOne({"_id": user_id, field: {"$exists": True}}, {"$inc": {field: delta}})
+        for user_id, delta in deltas.items()
+    ]
+    if operations:
+        await db["users"].bulk_write(operations, ordered=False)
+
+
+async def count_posts(db: AsyncIOMotorDatabase, user_id: ObjectId) -> int:
+    # Archived posts still belong to their author.
+    hot = await db["posts"].count_documents({"author": user_id})
+    return hot + await db[ARCHIVE_COLLECTION].count_documents({"author": user_id})
+
+
+async def count_comments(db: AsyncIOMotorDatabase, user_id: ObjectId) -> int:
+    return await db["comments"].count_documents({"author": user_id})
+
+
+async def user_counts(db: AsyncIOMotorDatabase, user: Dict[str, Any]) -> Dict[str, int]:
+    """``{"posts": n, "comments": n}`` for a user document loaded with ``COUNT_PROJECTION``."""
+    posts = user.get(POSTS)
+    comments = user.get(COMMENTS)
+    return {
+        "posts": posts if posts is not None else await count_posts(db, user["_id"]),
+        "comments": comments if comments is not None else await count_comments(db, user["_id"]),
+    }
@@ -1,5 +1,7 @@
+import base64
+import json
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 from bson import ObjectId
 from fastapi import HTTPException, status
@@ -16,6 +18,15 @@ def str_object_id(value: ObjectId) -> str:
     return str(value)
 
 
+def utcnow_ms() -> datetime:
+    """Current UTC time at the millisecond precision BSON dates keep.
+
+    Responses built from an in-memory document then match what later reads return.
+    """
+    now = datetime.utcnow()
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+
 def isoformat(value: Optional[datetime]) -> Optional[str]:
     return value.isoformat() if value else None
 
@@ -27,3 +38,36 @@ def build_author_payload(user_doc: Optional[Dict[str, Any]]) -> Optional[Dict[st
         "_id": str_object_id(user_doc["_id"]),
         "username": user_doc.get("username", ""),
     }
+
+
+def encode_cursor(value: Any, object_id: ObjectId) -> str:
+    if isinstance(value, datetime):
+        raw = {"t": value.isoformat(), "id": str_object_id(object_id)}
+    else:
+        raw = {"v": value, "id": str_object_id(object_id)}
+    encoded = base64.urlsafe_b64encode(json.dumps(raw, separators=(",", ":")).encode("utf-8"))
+    return encoded.decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = datetime.fromisoformat(raw["t"]) if "t" in raw else raw.get("v")
+        return value, ObjectId(raw["id"])
+    except Exception as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def keyset_filter(field: str, value: Any, object_id: ObjectId, *, descending: bool = True) -> Dict[str, Any]:
+    """Match documents that sort strictly after ``(value, object_id)``."""
+    op = "$lt" if descending else "$gt"
+    tie = {field: value, "_id": {op: object_id}}
+    # Missing/null values sort lowest: last when descending, first when ascending.
+    if descending:
+        if value is None:
+            return tie
+        return {"$or": [{field: {op: value}}, tie, {field: None}]}
+    if value is None:
+        return {"$or": [tie, {field: {"$ne": None}}]}
+    return {"$or": [{field: {op: value}}, tie]}
@@ -0,0 +1,71 @@
+"""Move old, idle posts out of the hot ``posts`` collection into ``posts_archive``.
+
+Usage: python scripts/archive_posts.py [--dry-run] [--batch-size N] [--max-batches N]
+
+Eligible posts were created more than ``ARCHIVE_AFTER_DAYS`` ago and have not
+been written to (edits, comments) for ``ARCHIVE_IDLE_DAYS``. Each batch is
+copied before it is deleted, so the job can be stopped and rerun at any point.
+Run it from cron during quiet hours; archived posts stay readable by id and
+come back to the hot collection on their next write.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.archive import ARCHIVE_COLLECTION, archive_cutoffs, archive_posts  # noqa: E402
+from app.database import ensure_indexes  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+async def run(batch_size: int, max_batches: int, dry_run: bool):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    await ensure_indexes(db)
+    if dry_run:
+        eligible = await db["posts"].count_documents(archive_cutoffs())
+        print(f"{eligible} posts would be archived.")
+        client.close()
+        return
+
+    started = time.perf_counter()
+    moved = 0
+    batches = 0
+    while not max_batches or batches < max_batches:
+        count = await archive_posts(db, batch_size=batch_size)
+        if not count:
+            break
+        moved += count
+        batches += 1
+        print(f"Archived {moved} posts ({moved / (time.perf_counter() - started):.0f}/s)…")
+
+    hot = await db["posts"].estimated_document_count()
+    cold = await db[ARCHIVE_COLLECTION].estimated_document_count()
+    print(f"Archive complete: {moved} posts moved; {hot} hot, {cold} archived.")
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only count eligible posts")
+    parser.add_argument("--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--max-batches", type=int, default=0, help="stop after N batches (0 = until done)")
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size, args.max_batches, args.dry_run))
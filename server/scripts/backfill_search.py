@@ -0,0 +1,54 @@
+"""Populate search grams on posts created before search indexing existed."""
+
+import asyncio
+import os
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.database import ensure_indexes  # noqa: E402
+from app.search import build_search_fields  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+async def backfill(batch_size: int = 500, rebuild: bool = False):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    await ensure_indexes(db)
+    query = {} if rebuild else {"search_grams": {"$exists": False}}
+    cursor = db["posts"].find(query, {"title": 1, "body": 1})
+
+    updated = 0
+    batch = []
+    async for post in cursor:
+        fields = build_search_fields(post.get("title", ""), post.get("body", ""))
+        batch.append(UpdateOne({"_id": post["_id"]}, {"$set": fields}))
+        if len(batch) >= batch_size:
+            await db["posts"].bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+            print(f"Indexed {updated} posts…")
+    if batch:
+        await db["posts"].bulk_write(batch, ordered=False)
+        updated += len(batch)
+
+    print(f"Search backfill complete: {updated} posts indexed.")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(rebuild="--rebuild" in sys.argv[1:]))
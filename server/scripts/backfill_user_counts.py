@@ -0,0 +1,69 @@
+"""Set ``postCount``/``commentCount`` on every user from the posts and comments collections.
+
+Until a user has these fields the per-author endpoints count from the author
+indexes on every request, and writes leave the missing counters alone. Run
+once after upgrading (and again after bulk imports); posts or comments written
+while it runs may be off by one for their author, so prefer a quiet period.
+"""
+
+import asyncio
+import os
+import sys
+from collections import Counter
+from typing import Dict
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.archive import ARCHIVE_COLLECTION  # noqa: E402
+from app.database import ensure_indexes  # noqa: E402
+from app.settings import settings  # noqa: E402
+from app.user_counts import COMMENTS, POSTS  # noqa: E402
+
+
+async def counts_by_author(db: AsyncIOMotorDatabase, collection: str) -> Dict:
+    pipeline = [{"$group": {"_id": "$author", "count": {"$sum": 1}}}]
+    return {group["_id"]: group["count"] async for group in db[collection].aggregate(pipeline)}
+
+
+async def backfill(batch_size: int = 1000):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    await ensure_indexes(db)
+    posts = Counter(await counts_by_author(db, "posts"))
+    posts.update(await counts_by_author(db, ARCHIVE_COLLECTION))
+    comments = await counts_by_author(db, "comments")
+
+    updated = 0
+    batch = []
+    async for user in db["users"].find({}, {"_id": 1}):
+        counts = {POSTS: posts.get(user["_id"], 0), COMMENTS: comments.get(user["_id"], 0)}
+        batch.append(UpdateOne({"_id": user["_id"]}, {"$set": counts}))
+        if len(batch) >= batch_size:
+            await db["users"].bulk_write(batch, ordered=False)
+            updated += len(batch)
+            batch = []
+            print(f"Counted {updated} users…")
+    if batch:
+        await db["users"].bulk_write(batch, ordered=False)
+        updated += len(batch)
+
+    print(f"User count backfill complete: {updated} users updated.")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill())
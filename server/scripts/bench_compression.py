@@ -0,0 +1,58 @@
+"""Microbenchmark: bytes on the wire and CPU per response for each encoding and level.
+
+Usage: python scripts/bench_compression.py [posts] [comments_per_post] [repeats]
+
+Compresses the same synthetic post page as ``bench_serialization.py`` (no
+database needed) with every available codec at a range of levels and prints
+the compressed size, ratio and CPU time per compression. With the response
+cache on, that CPU cost is paid once per cached entry and encoding; uncached
+responses pay it on every request.
+"""
+
+import os
+import sys
+import time
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+from app.compression import CODECS  # noqa: E402
+from app.responses import dumps  # noqa: E402
+from bench_serialization import build_page  # noqa: E402
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 5, 9, 11), "zstd": (1, 3, 9, 19)}
+
+
+def measure(encoding: str, level: int, body: bytes, repeats: int) -> None:
+    codec = CODECS[encoding]
+    compressed = codec(body, level)
+    started = time.process_time()
+    for _ in range(repeats):
+        codec(body, level)
+    cpu_ms = (time.process_time() - started) / repeats * 1000
+    print(
+        f"{encoding:<5} {level:>3}   {len(compressed) / 1024:9.1f} KiB   "
+        f"{len(body) / len(compressed):6.1f}x   {cpu_ms:8.2f} ms CPU"
+    )
+
+
+def main(count: int, comments_per_post: int, repeats: int):
+    body = dumps(build_page(count, comments_per_post))
+    print(f"{count} posts x {comments_per_post} comments: identity {len(body) / 1024:.1f} KiB, {repeats} repeats")
+    print("codec level        size    ratio   per response")
+    for encoding, levels in LEVELS.items():
+        if encoding not in CODECS:
+            print(f"{encoding:<5} not installed")
+            continue
+        for level in levels:
+            measure(encoding, level, body, repeats)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 100,
+        int(args[1]) if len(args) > 1 else 5,
+        int(args[2]) if len(args) > 2 else 10,
+    )
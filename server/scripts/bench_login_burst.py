@@ -0,0 +1,88 @@
+"""Measure GET /api/posts latency while a burst of logins hits the server.
+
+Usage: python scripts/bench_login_burst.py [base_url] [logins] [concurrency]
+
+Start the API (``RATE_LIMIT_LOGIN=0 uvicorn app.main:app --port 5000``)
+against a seeded database first. Without ``RATE_LIMIT_LOGIN=0`` all but the
+first few logins from this one address are answered 429 before reaching
+bcrypt. With bcrypt on the event loop list latency climbs with the burst; with
+the worker pool it should stay close to the idle baseline.
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+
+
+async def sample_list_latency(client: httpx.AsyncClient, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await client.get("/api/posts/", params={"limit": 20, "summary": "true"})
+        samples.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.05)
+
+
+async def login_burst(client: httpx.AsyncClient, logins: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    statuses: dict = {}
+    # Register (ignoring "Username taken") so every login runs a full bcrypt check.
+    await client.post("/api/auth/register", json={"username": "bench-burst", "password": "password123"})
+
+    async def login(_: int):
+        async with semaphore:
+            res = await client.post("/api/auth/login", json={"username": "bench-burst", "password": "password123"})
+            statuses[res.status_code] = statuses.get(res.status_code, 0) + 1
+
+    await asyncio.gather(*(login(i) for i in range(logins)))
+    return statuses
+
+
+def summarize(label: str, samples: list) -> None:
+    if not samples:
+        print(f"{label:<10} no samples")
+        return
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(
+        f"{label:<10} n={len(ordered):<5} p50={statistics.median(ordered):7.1f} ms "
+        f"p95={p95:7.1f} ms max={ordered[-1]:7.1f} ms"
+    )
+
+
+async def main(base_url: str, logins: int, concurrency: int):
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        idle: list = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_list_latency(client, stop, idle))
+        await asyncio.sleep(2)
+        stop.set()
+        await sampler
+
+        busy: list = []
+        stop = asyncio.Event()
+        sampler = asyncio.create_task(sample_list_latency(client, stop, busy))
+        started = time.perf_counter()
+        statuses = await login_burst(client, logins, concurrency)
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await sampler
+
+    print(f"{logins} logins at concurrency {concurrency} in {elapsed:.2f}s, statuses={statuses}")
+    if statuses.get(429):
+        print("warning: logins were rate limited; restart the server with RATE_LIMIT_LOGIN=0")
+    summarize("idle", idle)
+    summarize("burst", busy)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(
+        main(
+            args[0] if args else "http://localhost:5000",
+            int(args[1]) if len(args) > 1 else 200,
+            int(args[2]) if len(args) > 2 else 50,
+        )
+    )
@@ -0,0 +1,66 @@
+"""Requests per second for GET /api/posts with a cold vs warm response cache.
+
+Usage: python scripts/bench_response_cache.py [requests] [concurrency]
+
+Runs the app in-process over ASGI against the configured MongoDB, so seed it
+first with ``scripts/seed.py``.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.database import close_mongo_connection, connect_to_mongo  # noqa: E402
+from app.main import app  # noqa: E402
+from app.response_cache import response_cache  # noqa: E402
+
+# The router's own path; "/api/posts" answers with a 307 redirect and no ETag.
+LIST_PATH = "/api/posts/"
+
+
+async def run(client: httpx.AsyncClient, total: int, concurrency: int, *, cold: bool, etag: str = "") -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"If-None-Match": etag} if etag else {}
+
+    async def one():
+        async with semaphore:
+            if cold:
+                await response_cache.clear()
+            res = await client.get(LIST_PATH, headers=headers)
+            assert res.status_code in (200, 304), res.status_code
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return total / (time.perf_counter() - started)
+
+
+async def main(total: int, concurrency: int):
+    await connect_to_mongo()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        first = await client.get(LIST_PATH)
+        print(f"list payload: {len(first.content) / 1024:.1f} KiB")
+        print(f"cold        {await run(client, total, concurrency, cold=True):8.1f} req/s")
+        await client.get(LIST_PATH)
+        print(f"warm        {await run(client, total, concurrency, cold=False):8.1f} req/s")
+        etag = (await client.get(LIST_PATH)).headers["etag"]
+        print(f"warm + 304  {await run(client, total, concurrency, cold=False, etag=etag):8.1f} req/s")
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 500, int(args[1]) if len(args) > 1 else 20))
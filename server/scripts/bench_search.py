@@ -0,0 +1,73 @@
+"""Compare n-gram indexed search against the old download-and-filter scan.
+
+Usage: python scripts/bench_search.py "검색어" [repeats]
+Run ``scripts/seed.py`` and ``scripts/backfill_search.py`` first.
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import bson
+import orjson
+from motor.motor_asyncio import AsyncIOMotorClient
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.routes.posts import POST_PROJECTION, search_posts  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+async def full_scan(db, keyword: str):
+    # Mirrors the client: download every post, then substring-match titles.
+    posts = await db["posts"].find({}, POST_PROJECTION).to_list(length=None)
+    size = sum(len(bson.encode(p)) for p in posts)
+    lowered = keyword.lower()
+    return [p for p in posts if lowered in (p.get("title") or "").lower()], size
+
+
+async def bench(keyword: str, repeats: int = 20):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    scan_times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        matches, size = await full_scan(db, keyword)
+        scan_times.append(time.perf_counter() - started)
+
+    search_times = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        response = await search_posts(q=keyword, limit=20, cursor=None, category=None, db=db)
+        search_times.append(time.perf_counter() - started)
+    page = orjson.loads(response.body)
+
+    def report(label, samples):
+        samples = sorted(samples)
+        median = samples[len(samples) // 2] * 1000
+        print(f"{label:<12} median {median:8.2f} ms   max {samples[-1] * 1000:8.2f} ms")
+
+    print(f"query={keyword!r} repeats={repeats}")
+    report("full scan", scan_times)
+    print(f"{'':<12} {len(matches)} title matches, {size / 1024:.1f} KiB transferred")
+    report("indexed", search_times)
+    print(f"{'':<12} {len(page['items'])} ranked results on first page")
+    client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit(__doc__)
+    asyncio.run(bench(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 20))
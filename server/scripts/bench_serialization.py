@@ -0,0 +1,111 @@
+"""Microbenchmark: stdlib JSONResponse path vs the orjson FastJSONResponse path.
+
+Usage: python scripts/bench_serialization.py [posts] [comments_per_post] [repeats]
+
+Serializes a synthetic page of fully hydrated posts (no database needed) and
+reports CPU time and peak allocations per encode for:
+
+* ``stdlib``  – what FastAPI did before: ``jsonable_encoder`` then ``json.dumps``
+* ``orjson``  – ``FastJSONResponse``/``dumps`` on the same data, no encoder walk
+"""
+
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+from app.responses import dumps  # noqa: E402
+from app.routes.posts import _serialize_post  # noqa: E402
+
+
+def build_page(count: int, comments_per_post: int):
+    users = {}
+    for i in range(50):
+        user_id = ObjectId()
+        users[user_id] = {"_id": user_id, "username": f"user{i}"}
+    user_ids = list(users)
+    now = datetime.utcnow()
+    posts = []
+    for i in range(count):
+        created = now - timedelta(minutes=i)
+        posts.append(
+            {
+                "_id": ObjectId(),
+                "author": user_ids[i % len(user_ids)],
+                "title": f"게시글 제목 {i} – benchmark title",
+                "body": "본문 내용입니다. Lorem ipsum dolor sit amet. " * 20,
+                "imageUrl": f"https://example.com/{i}.png",
+                "category": ("game", "study", "dev", None)[i % 4],
+                "views": i * 7,
+                "likes": i % 50,
+                "dislikes": i % 7,
+                "created_at": created,
+                "updated_at": created,
+                "comments": [
+                    {
+                        "_id": ObjectId(),
+                        "author": user_ids[(i + j) % len(user_ids)],
+                        "content": f"댓글 {j} for post {i}",
+                        "created_at": created + timedelta(seconds=j),
+                        "updated_at": created + timedelta(seconds=j),
+                    }
+                    for j in range(comments_per_post)
+                ],
+            }
+        )
+    return [_serialize_post(post, users) for post in posts]
+
+
+def stdlib_path(data):
+    return json.dumps(
+        jsonable_encoder(data), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def orjson_path(data):
+    return dumps(data)
+
+
+def measure(label, func, data, repeats):
+    func(data)  # warm up
+    started = time.process_time()
+    for _ in range(repeats):
+        body = func(data)
+    cpu_ms = (time.process_time() - started) / repeats * 1000
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{label:<8} {cpu_ms:8.2f} ms CPU/encode   peak alloc {peak / 1024:9.1f} KiB   "
+        f"body {len(body) / 1024:8.1f} KiB"
+    )
+    return cpu_ms
+
+
+def main(count: int, comments_per_post: int, repeats: int):
+    data = build_page(count, comments_per_post)
+    print(f"{count} posts x {comments_per_post} comments, {repeats} repeats")
+    assert json.loads(stdlib_path(data)) == json.loads(orjson_path(data)), "encoders disagree"
+    baseline = measure("stdlib", stdlib_path, data, repeats)
+    fast = measure("orjson", orjson_path, data, repeats)
+    print(f"speedup  {baseline / fast:8.1f}x")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(
+        int(args[0]) if args else 1000,
+        int(args[1]) if len(args) > 1 else 5,
+        int(args[2]) if len(args) > 2 else 20,
+    )
@@ -0,0 +1,46 @@
+"""Fail if any route query's winning plan is a COLLSCAN.
+
+Ensures indexes first, then explains every entry in
+``app.query_guard.ROUTE_QUERIES`` against the configured database.
+Exit status is 1 when at least one query scans a whole collection.
+"""
+
+import asyncio
+import os
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.database import ensure_indexes  # noqa: E402
+from app.query_guard import ROUTE_QUERIES, find_collscans  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+
+async def check() -> int:
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    await ensure_indexes(db)
+    offenders = await find_collscans(db)
+    client.close()
+
+    for query in ROUTE_QUERIES:
+        marker = "COLLSCAN" if query in offenders else "ok"
+        print(f"{marker:<9} {query.name:<26} {query.collection}.find({query.filter})")
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(check()))
@@ -0,0 +1,391 @@
+"""Generate, export and import board data in streaming batches.
+
+Usage:
+  python scripts/datatool.py generate [--users 5] [--posts-per-user 4] [--comments-per-post 3]
+                                      [--workers N] [--batch-size 1000] [--append]
+  python scripts/datatool.py export DIR [--collections users,posts,comments,reactions] [--resume]
+  python scripts/datatool.py import DIR [--collections ...] [--resume] [--drop]
+
+``generate`` hashes every password (distinct salts, like real sign-ups) in a
+process pool while the previous batch is being inserted, and writes users,
+posts and comments with unordered ``insert_many``. Without ``--append`` it
+wipes the collections first.
+
+``export`` writes one ``<collection>.ndjson`` file per collection in MongoDB
+extended JSON, walking ``_id`` order with a cursor so memory stays flat.
+``import`` streams those files back with unordered ``insert_many``. Both
+record their position in ``DIR/.export-checkpoint.json`` or
+``DIR/.import-checkpoint.json`` after every batch;
+``--resume`` continues from there after an interruption, and already imported
+documents are skipped as duplicate keys.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId, json_util
+from faker import Faker
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.database import ensure_indexes  # noqa: E402
+from app.routes.posts import VALID_CATEGORIES  # noqa: E402
+from app.search import build_search_fields  # noqa: E402
+from app.security import hash_password  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+COLLECTIONS = ("users", "posts", "posts_archive", "comments", "reactions")
+DUPLICATE_KEY = 11000
+
+fake = Faker()
+
+
+class Progress:
+    """Prints a throttled ``label: done/total (rate/s)`` line."""
+
+    def __init__(self, label: str, total: Optional[int] = None, done: int = 0) -> None:
+        self.label = label
+        self.total = total
+        self.done = done
+        self._started_done = done
+        self._started = time.perf_counter()
+        self._last_print = 0.0
+
+    def update(self, count: int) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self._last_print >= 1:
+            self._last_print = now
+            self._print("\r")
+
+    def finish(self) -> None:
+        self._print("\r")
+        print()
+
+    def _print(self, prefix: str) -> None:
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        rate = (self.done - self._started_done) / elapsed
+        total = f"/{self.total}" if self.total is not None else ""
+        print(f"{prefix}{self.label}: {self.done}{total} docs ({rate:,.0f}/s)", end="", flush=True)
+
+
+def open_database(client: AsyncIOMotorClient) -> AsyncIOMotorDatabase:
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+    return db
+
+
+async def insert_batch(collection, documents: List[Dict[str, Any]]) -> int:
+    """Unordered insert that treats duplicate keys as already imported."""
+    if not documents:
+        return 0
+    try:
+        result = await collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as exc:
+        errors = exc.details.get("writeErrors", [])
+        if any(error.get("code") != DUPLICATE_KEY for error in errors):
+            raise
+        return exc.details.get("nInserted", 0)
+
+
+# -- generate ---------------------------------------------------------------
+
+
+def _fake_user(password_hash: str) -> Dict[str, Any]:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "username": fake.unique.user_name(),
+        "password": password_hash,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _fake_post(author_id: ObjectId, user_ids: List[ObjectId], comments_per_post: int):
+    created_at = datetime.utcnow() - timedelta(days=fake.random_int(min=0, max=30))
+    post_id = ObjectId()
+    comments = []
+    for _ in range(comments_per_post):
+        comment_time = created_at + timedelta(hours=fake.random_int(min=1, max=48))
+        comments.append(
+            {
+                "_id": ObjectId(),
+                "post_id": post_id,
+                "author": fake.random_element(user_ids),
+                "content": fake.sentence(nb_words=18),
+                "created_at": comment_time,
+                "updated_at": comment_time,
+            }
+        )
+    title = fake.sentence(nb_words=6)
+    body = "\n\n".join(fake.paragraphs(nb=3))
+    post = {
+        "_id": post_id,
+        "author": author_id,
+        "title": title,
+        "body": body,
+        "category": fake.random_element(sorted(VALID_CATEGORIES)),
+        "imageUrl": fake.image_url(width=960, height=540),
+        "views": 0,
+        "likes": fake.random_int(min=0, max=150),
+        "dislikes": fake.random_int(min=0, max=30),
+        "commentCount": len(comments),
+        "created_at": created_at,
+        "updated_at": created_at,
+        **build_search_fields(title, body),
+    }
+    return post, comments
+
+
+async def generate(
+    users: int = 5,
+    posts_per_user: int = 4,
+    comments_per_post: int = 3,
+    *,
+    password: str = "password123",
+    batch_size: int = 1000,
+    workers: Optional[int] = None,
+    append: bool = False,
+) -> None:
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = open_database(client)
+    if not append:
+        print("Clearing existing data…")
+        for name in COLLECTIONS:
+            await db[name].delete_many({})
+    await ensure_indexes(db)
+
+    loop = asyncio.get_running_loop()
+    user_ids: List[ObjectId] = []
+    progress = Progress("users", users)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        def hash_batch(size: int) -> "asyncio.Future[List[str]]":
+            return asyncio.gather(*(loop.run_in_executor(pool, hash_password, password) for _ in range(size)))
+
+        # Hash the next batch while the current one is being inserted.
+        remaining = users
+        pending = hash_batch(min(batch_size, remaining)) if remaining else None
+        while pending is not None:
+            hashes = await pending
+            remaining -= len(hashes)
+            pending = hash_batch(min(batch_size, remaining)) if remaining else None
+            batch = [_fake_user(password_hash) for password_hash in hashes]
+            await insert_batch(db["users"], batch)
+            user_ids.extend(doc["_id"] for doc in batch)
+            progress.update(len(batch))
+    progress.finish()
+
+    progress = Progress("posts", len(user_ids) * posts_per_user)
+    posts: List[Dict[str, Any]] = []
+    comments: List[Dict[str, Any]] = []
+    for author_id in user_ids:
+        for _ in range(posts_per_user):
+            post, post_comments = _fake_post(author_id, user_ids, comments_per_post)
+            posts.append(post)
+            comments.extend(post_comments)
+            if len(posts) >= batch_size:
+                await insert_batch(db["posts"], posts)
+                progress.update(len(posts))
+                posts = []
+            if len(comments) >= batch_size:
+                await insert_batch(db["comments"], comments)
+                comments = []
+    await insert_batch(db["posts"], posts)
+    await insert_batch(db["comments"], comments)
+    progress.update(len(posts))
+    progress.finish()
+
+    print(f"Generation complete!\nLogin with any generated username and password '{password}'.")
+    client.close()
+
+
+# -- export / import ----------------------------------------------------------
+
+
+def checkpoint_path(directory: str, command: str) -> str:
+    return os.path.join(directory, f".{command}-checkpoint.json")
+
+
+def load_checkpoint(path: str) -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def save_checkpoint(path: str, checkpoint: Dict[str, Dict[str, Any]]) -> None:
+    with open(path + ".tmp", "w", encoding="utf-8") as handle:
+        json.dump(checkpoint, handle)
+    os.replace(path + ".tmp", path)
+
+
+async def export_collection(
+    db: AsyncIOMotorDatabase, directory: str, name: str, checkpoint: Dict[str, Dict[str, Any]], batch_size: int
+) -> None:
+    checkpoint_file = checkpoint_path(directory, "export")
+    state = checkpoint.setdefault(name, {"offset": 0, "count": 0, "last_id": None, "done": False})
+    if state["done"]:
+        print(f"{name}: already exported")
+        return
+    query: Dict[str, Any] = {}
+    if state["last_id"]:
+        query["_id"] = {"$gt": json_util.loads(state["last_id"])}
+
+    path = os.path.join(directory, f"{name}.ndjson")
+    progress = Progress(f"export {name}", await db[name].estimated_document_count(), state["count"])
+    with open(path, "r+b" if os.path.exists(path) else "wb") as handle:
+        # Drop anything written after the last checkpoint; it is re-exported below.
+        handle.seek(state["offset"])
+        handle.truncate()
+        buffered = 0
+        last_id = None
+        async for doc in db[name].find(query, batch_size=batch_size).sort("_id", 1):
+            handle.write(json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS).encode("utf-8") + b"\n")
+            last_id = doc["_id"]
+            buffered += 1
+            if buffered >= batch_size:
+                handle.flush()
+                state.update(offset=handle.tell(), count=state["count"] + buffered, last_id=json_util.dumps(last_id))
+                save_checkpoint(checkpoint_file, checkpoint)
+                progress.update(buffered)
+                buffered = 0
+        handle.flush()
+        state.update(offset=handle.tell(), count=state["count"] + buffered, done=True)
+        if last_id is not None:
+            state["last_id"] = json_util.dumps(last_id)
+        save_checkpoint(checkpoint_file, checkpoint)
+        progress.update(buffered)
+    progress.finish()
+
+
+async def import_collection(
+    db: AsyncIOMotorDatabase, directory: str, name: str, checkpoint: Dict[str, Dict[str, Any]], batch_size: int
+) -> None:
+    checkpoint_file = checkpoint_path(directory, "import")
+    path = os.path.join(directory, f"{name}.ndjson")
+    if not os.path.exists(path):
+        print(f"{name}: no {name}.ndjson, skipped")
+        return
+    state = checkpoint.setdefault(name, {"offset": 0, "count": 0, "done": False})
+    if state["done"]:
+        print(f"{name}: already imported")
+        return
+
+    progress = Progress(f"import {name}", None, state["count"])
+    with open(path, "rb") as handle:
+        handle.seek(state["offset"])
+        batch: List[Dict[str, Any]] = []
+        while True:
+            line = handle.readline()
+            if line.strip():
+                batch.append(json_util.loads(line))
+            if batch and (len(batch) >= batch_size or not line):
+                await insert_batch(db[name], batch)
+                state.update(offset=handle.tell(), count=state["count"] + len(batch))
+                save_checkpoint(checkpoint_file, checkpoint)
+                progress.update(len(batch))
+                batch = []
+            if not line:
+                break
+    state["done"] = True
+    save_checkpoint(checkpoint_file, checkpoint)
+    progress.finish()
+
+
+async def export_data(directory: str, collections: List[str], *, resume: bool, batch_size: int) -> None:
+    os.makedirs(directory, exist_ok=True)
+    checkpoint_file = checkpoint_path(directory, "export")
+    checkpoint = load_checkpoint(checkpoint_file) if resume else {}
+    if not resume:
+        for name in collections:
+            open(os.path.join(directory, f"{name}.ndjson"), "wb").close()
+        save_checkpoint(checkpoint_file, checkpoint)
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = open_database(client)
+    for name in collections:
+        await export_collection(db, directory, name, checkpoint, batch_size)
+    client.close()
+
+
+async def import_data(directory: str, collections: List[str], *, resume: bool, drop: bool, batch_size: int) -> None:
+    checkpoint = load_checkpoint(checkpoint_path(directory, "import")) if resume else {}
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = open_database(client)
+    if drop and not resume:
+        for name in collections:
+            await db[name].delete_many({})
+    await ensure_indexes(db)
+    for name in collections:
+        await import_collection(db, directory, name, checkpoint, batch_size)
+    client.close()
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="generate fake users, posts and comments")
+    gen.add_argument("--users", type=int, default=5)
+    gen.add_argument("--posts-per-user", type=int, default=4)
+    gen.add_argument("--comments-per-post", type=int, default=3)
+    gen.add_argument("--password", default="password123")
+    gen.add_argument("--workers", type=int, help="password hashing processes (default: CPU count)")
+    gen.add_argument("--append", action="store_true", help="keep existing data")
+
+    for command in ("export", "import"):
+        sub = commands.add_parser(command, help=f"{command} NDJSON files")
+        sub.add_argument("directory")
+        sub.add_argument("--collections", default=",".join(COLLECTIONS))
+        sub.add_argument("--resume", action="store_true", help=f"continue from DIR/.{command}-checkpoint.json")
+        if command == "import":
+            sub.add_argument("--drop", action="store_true", help="wipe the target collections first")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> None:
+    args = parse_args(argv)
+    if args.command == "generate":
+        coroutine = generate(
+            args.users,
+            args.posts_per_user,
+            args.comments_per_post,
+            password=args.password,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            append=args.append,
+        )
+    else:
+        collections = [name.strip() for name in args.collections.split(",") if name.strip()]
+        if args.command == "export":
+            coroutine = export_data(args.directory, collections, resume=args.resume, batch_size=args.batch_size)
+        else:
+            coroutine = import_data(
+                args.directory, collections, resume=args.resume, drop=args.drop, batch_size=args.batch_size
+            )
+    asyncio.run(coroutine)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,390 @@
+"""Seed a benchmark dataset and load-test the API with reproducible JSON results.
+
+Usage:
+  python scripts/loadtest.py seed [--users 10000] [--posts 100000]
+  python scripts/loadtest.py run [--target URL] [--mock] [--concurrency 20]
+                                 [--requests 2000] [--scenarios list,view,login,comment]
+                                 [--output results.json]
+  python scripts/loadtest.py compare baseline.json candidate.json
+
+``seed`` wipes the configured database and bulk-inserts bench users (all with
+password ``password123``), posts, and a long-tail comment distribution: most
+posts get a few comments, a handful get hundreds. ``run`` drives each scenario
+with a fixed number of concurrent workers and prints throughput and
+p50/p95/p99 latency. By default the app runs in-process over ASGI (with its
+lifespan, so counters and the ranker behave as in production); ``--target``
+points at a running server instead, and ``--mock`` runs in-process against
+mongomock-motor (``pip install mongomock-motor``) with a smaller seeded
+dataset. ``--seed`` fixes the random choices so runs are comparable.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from bson import ObjectId
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.routes.posts import VALID_CATEGORIES  # noqa: E402
+from app.search import build_search_fields  # noqa: E402
+from app.security import hash_password  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+PASSWORD = "password123"
+BATCH_SIZE = 1000
+WORDS = (
+    "async mongo index cursor latency cache python react memo post comment view 서버 데이터 검색 성능 "
+    "개발 일상 여행 음식 사진 benchmark worker queue event stream token"
+).split()
+SCENARIOS = ("list", "view", "login", "comment")
+
+
+def bench_username(index: int) -> str:
+    return f"bench-user-{index}"
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _comment_count(rng: random.Random) -> int:
+    # Pareto tail: median around 1, a few posts with hundreds of comments.
+    return min(int(rng.paretovariate(1.2)) - 1, 500)
+
+
+async def _insert_batches(collection, documents: List[Dict[str, Any]]) -> None:
+    for start in range(0, len(documents), BATCH_SIZE):
+        await collection.insert_many(documents[start:start + BATCH_SIZE], ordered=False)
+
+
+async def seed_dataset(db, users: int, posts: int, rng: random.Random) -> Dict[str, int]:
+    for name in ("users", "posts", "comments", "reactions"):
+        await db[name].delete_many({})
+
+    # One bcrypt hash shared by every bench user: hashing 10k passwords would dominate seeding.
+    password = hash_password(PASSWORD)
+    now = datetime.utcnow()
+    user_docs = [
+        {"_id": ObjectId(), "username": bench_username(i), "password": password, "created_at": now, "updated_at": now}
+        for i in range(users)
+    ]
+    await _insert_batches(db["users"], user_docs)
+    user_ids = [doc["_id"] for doc in user_docs]
+
+    comment_total = 0
+    post_batch: List[Dict[str, Any]] = []
+    comment_batch: List[Dict[str, Any]] = []
+    for _ in range(posts):
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))
+        title = _sentence(rng, 6)
+        body = _sentence(rng, 80)
+        post_id = ObjectId()
+        comments = _comment_count(rng)
+        for _ in range(comments):
+            comment_time = created_at + timedelta(minutes=rng.randint(1, 60 * 48))
+            comment_batch.append(
+                {
+                    "_id": ObjectId(),
+                    "post_id": post_id,
+                    "author": rng.choice(user_ids),
+                    "content": _sentence(rng, 15),
+                    "created_at": comment_time,
+                    "updated_at": comment_time,
+                }
+            )
+        comment_total += comments
+        post_batch.append(
+            {
+                "_id": post_id,
+                "author": rng.choice(user_ids),
+                "title": title,
+                "body": body,
+                "category": rng.choice(sorted(VALID_CATEGORIES)),
+                "views": int(rng.paretovariate(1.1) * 10),
+                "likes": rng.randint(0, 150),
+                "dislikes": rng.randint(0, 30),
+                "commentCount": comments,
+                "created_at": created_at,
+                "updated_at": created_at,
+                **build_search_fields(title, body),
+            }
+        )
+        if len(post_batch) >= BATCH_SIZE:
+            await _insert_batches(db["posts"], post_batch)
+            post_batch = []
+        if len(comment_batch) >= BATCH_SIZE:
+            await _insert_batches(db["comments"], comment_batch)
+            comment_batch = []
+    await _insert_batches(db["posts"], post_batch)
+    await _insert_batches(db["comments"], comment_batch)
+    return {"users": users, "posts": posts, "comments": comment_total}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def drive(
+    total: int, concurrency: int, operation: Callable[[int], Awaitable[httpx.Response]]
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    counter = iter(range(total))
+
+    async def worker() -> None:
+        for index in counter:
+            started = time.perf_counter()
+            try:
+                res = await operation(index)
+                ok = res.is_success
+                key = str(res.status_code)
+            except httpx.HTTPError as exc:
+                ok, key = False, type(exc).__name__
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not ok:
+                errors[key] = errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        "requests": total,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+    }
+
+
+async def _login(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    return await client.post("/api/auth/login", json={"username": username, "password": PASSWORD})
+
+
+async def _sample_post_ids(client: httpx.AsyncClient, pages: int = 5) -> List[str]:
+    ids: List[str] = []
+    cursor: Optional[str] = None
+    for _ in range(pages):
+        params = {"limit": settings.POSTS_MAX_PAGE_SIZE, "summary": "true"}
+        if cursor:
+            params["cursor"] = cursor
+        res = await client.get("/api/posts/", params=params)
+        res.raise_for_status()
+        page = res.json()
+        ids.extend(item["_id"] for item in page["items"])
+        cursor = page.get("nextCursor")
+        if not cursor:
+            break
+    return ids
+
+
+async def run_scenarios(client: httpx.AsyncClient, args: argparse.Namespace, users: int) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    post_ids = await _sample_post_ids(client)
+    if not post_ids:
+        raise SystemExit("No posts found; run `loadtest.py seed` first")
+
+    tokens: List[str] = []
+    if "comment" in args.scenarios:
+        for index in rng.sample(range(users), min(users, args.concurrency)):
+            res = await _login(client, bench_username(index))
+            res.raise_for_status()
+            tokens.append(res.json()["token"])
+
+    async def list_posts(_: int) -> httpx.Response:
+        return await client.get("/api/posts/", params={"limit": settings.POSTS_PAGE_SIZE, "summary": "true"})
+
+    async def view_post(_: int) -> httpx.Response:
+        post_id = rng.choice(post_ids)
+        res = await client.get(f"/api/posts/{post_id}")
+        if not res.is_success:
+            return res
+        return await client.post(f"/api/posts/{post_id}/views")
+
+    async def login(_: int) -> httpx.Response:
+        return await _login(client, bench_username(rng.randrange(users)))
+
+    async def comment(index: int) -> httpx.Response:
+        headers = {"Authorization": f"Bearer {tokens[index % len(tokens)]}"}
+        return await client.post(
+            f"/api/posts/{rng.choice(post_ids)}/comments", json={"content": _sentence(rng, 12)}, headers=headers
+        )
+
+    operations = {"list": list_posts, "view": view_post, "login": login, "comment": comment}
+    results = {}
+    for name in args.scenarios:
+        # Logins are bcrypt bound; a tenth of the request budget keeps runs short.
+        total = max(args.requests // 10, args.concurrency) if name == "login" else args.requests
+        if args.warmup:
+            await drive(min(args.warmup, total), args.concurrency, operations[name])
+        results[name] = await drive(total, args.concurrency, operations[name])
+        print(
+            f"{name:<8} {results[name]['rps']:8.1f} req/s  p50={results[name]['p50_ms']:7.2f} "
+            f"p95={results[name]['p95_ms']:7.2f} p99={results[name]['p99_ms']:7.2f} ms  "
+            f"errors={results[name]['errors']}"
+        )
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _in_process(args: argparse.Namespace, body: Callable[[httpx.AsyncClient], Awaitable[Any]]) -> Any:
+    from app.database import mongo
+    from app.main import app, lifespan
+
+    # Every in-process request shares one client address; per-IP limits would turn the run into a 429 benchmark.
+    settings.RATE_LIMIT_ENABLED = False
+
+    if args.mock:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("--mock needs mongomock-motor: pip install mongomock-motor")
+        mongo.client = AsyncMongoMockClient()
+        mongo.db = mongo.client["memo-bench"]
+        await seed_dataset(mongo.db, args.users, args.posts, random.Random(args.seed))
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            return await body(client)
+
+
+async def cmd_run(args: argparse.Namespace) -> None:
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    if args.mock and args.target:
+        raise SystemExit("--mock runs in-process; drop --target")
+
+    async def body(client: httpx.AsyncClient) -> Dict[str, Any]:
+        return await run_scenarios(client, args, args.users)
+
+    if args.target:
+        async with httpx.AsyncClient(base_url=args.target, timeout=60) as client:
+            results = await body(client)
+    else:
+        results = await _in_process(args, body)
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "target": args.target or ("in-process/mock" if args.mock else "in-process"),
+        "python": platform.python_version(),
+        "config": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "users": args.users,
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "response_cache": settings.RESPONSE_CACHE_ENABLED,
+            "rate_limits": settings.RATE_LIMIT_ENABLED if not args.target else None,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"Results written to {args.output}")
+
+
+async def cmd_seed(args: argparse.Namespace) -> None:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+    started = time.perf_counter()
+    counts = await seed_dataset(db, args.users, args.posts, random.Random(args.seed))
+    client.close()
+    print(
+        f"Seeded {counts['users']} users, {counts['posts']} posts, {counts['comments']} comments "
+        f"in {time.perf_counter() - started:.1f}s (password '{PASSWORD}')"
+    )
+
+
+def cmd_compare(args: argparse.Namespace) -> None:
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.candidate, encoding="utf-8") as handle:
+        candidate = json.load(handle)
+    print(f"{'scenario':<8} {'metric':<7} {baseline.get('commit') or 'base':>10} {candidate.get('commit') or 'new':>10}")
+    for name, before in baseline["scenarios"].items():
+        after = candidate["scenarios"].get(name)
+        if not after:
+            continue
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            change = (after[metric] - before[metric]) / before[metric] * 100 if before[metric] else 0.0
+            print(f"{name:<8} {metric:<7} {before[metric]:>10} {after[metric]:>10} {change:+7.1f}%")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed = commands.add_parser("seed", help="wipe and bulk-seed the configured database")
+    seed.add_argument("--users", type=int, default=10_000)
+    seed.add_argument("--posts", type=int, default=100_000)
+    seed.add_argument("--seed", type=int, default=42)
+
+    run = commands.add_parser("run", help="drive the scenarios and report latency percentiles")
+    run.add_argument("--target", help="base URL of a running server (default: in-process)")
+    run.add_argument("--mock", action="store_true", help="in-process against mongomock-motor")
+    run.add_argument("--users", type=int, help="seeded user count (default 10000, 500 with --mock)")
+    run.add_argument("--posts", type=int, default=2_000, help="posts to seed with --mock")
+    run.add_argument("--concurrency", type=int, default=20)
+    run.add_argument("--requests", type=int, default=2_000, help="requests per scenario")
+    run.add_argument("--warmup", type=int, default=100, help="unmeasured requests per scenario")
+    run.add_argument("--scenarios", default=",".join(SCENARIOS))
+    run.add_argument("--seed", type=int, default=42)
+    run.add_argument("--output", help="write the JSON report here")
+
+    compare = commands.add_parser("compare", help="diff two JSON reports")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+
+    args = parser.parse_args(argv)
+    if args.command == "run" and args.users is None:
+        args.users = 500 if args.mock else 10_000
+    return args
+
+
+if __name__ == "__main__":
+    parsed = parse_args(sys.argv[1:])
+    if parsed.command == "compare":
+        cmd_compare(parsed)
+    else:
+        asyncio.run(cmd_seed(parsed) if parsed.command == "seed" else cmd_run(parsed))
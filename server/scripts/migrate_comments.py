@@ -0,0 +1,83 @@
+"""Move comments embedded in posts into the ``comments`` collection.
+
+Safe to re-run: comments keep their original ``_id`` so duplicates from an
+interrupted batch are skipped, and a post's embedded array is only removed
+after its comments have been written.
+"""
+
+import asyncio
+import os
+import sys
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SERVER_DIR not in sys.path:
+    sys.path.insert(0, SERVER_DIR)
+
+ENV_PATH = os.path.join(SERVER_DIR, ".env")
+if os.path.exists(ENV_PATH):
+    from dotenv import load_dotenv  # noqa: E402
+
+    load_dotenv(ENV_PATH)
+
+from app.database import ensure_indexes  # noqa: E402
+from app.settings import settings  # noqa: E402
+
+DUPLICATE_KEY = 11000
+
+
+async def insert_comments(collection, comments):
+    try:
+        await collection.insert_many(comments, ordered=False)
+    except BulkWriteError as exc:
+        errors = [e for e in exc.details.get("writeErrors", []) if e.get("code") != DUPLICATE_KEY]
+        if errors:
+            raise
+
+
+async def migrate(batch_size: int = 200):
+    client = AsyncIOMotorClient(settings.MONGO_URI)
+    db = client.get_default_database()
+    if db is None:
+        db = client["memo-app"]
+
+    await ensure_indexes(db)
+    posts = db["posts"]
+    comments = db["comments"]
+
+    migrated_posts = 0
+    migrated_comments = 0
+    while True:
+        batch = await posts.find({"comments": {"$exists": True}}, {"comments": 1}).limit(batch_size).to_list(
+            length=batch_size
+        )
+        if not batch:
+            break
+
+        docs = []
+        updates = []
+        for post in batch:
+            embedded = post.get("comments") or []
+            for comment in embedded:
+                docs.append({**comment, "post_id": post["_id"]})
+            # $inc keeps counts correct if comments were added through the new routes meanwhile.
+            updates.append(
+                UpdateOne({"_id": post["_id"]}, {"$unset": {"comments": ""}, "$inc": {"commentCount": len(embedded)}})
+            )
+        if docs:
+            await insert_comments(comments, docs)
+        await posts.bulk_write(updates, ordered=False)
+
+        migrated_posts += len(batch)
+        migrated_comments += len(docs)
+        print(f"Migrated {migrated_posts} posts / {migrated_comments} comments…")
+
+    print(f"Comment migration complete: {migrated_posts} posts, {migrated_comments} comments.")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
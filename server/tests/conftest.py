@@ -0,0 +1,47 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import AutoReconnect, BulkWriteError
+
+
+class FlakyBulk:
+    """Stands in for a collection's ``bulk_write`` and sums the ``$inc`` updates it applies.
+
+    Totals are kept per ``key(selector)`` of each update. Operations at the
+    positions in ``fail`` come back as write errors, and every call raises
+    while ``down`` is set.
+    """
+
+    def __init__(self, key=lambda selector: selector["_id"]):
+        self.key = key
+        self.totals = {}
+        self.fail = set()
+        self.down = False
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.down:
+            raise AutoReconnect("connection refused")
+        errors = []
+        for index, operation in enumerate(operations):
+            if index in self.fail:
+                errors.append({"index": index, "code": 14, "errmsg": "Cannot apply $inc"})
+                continue
+            doc = self.totals.setdefault(self.key(operation._filter), {})
+            for field, amount in operation._doc["$inc"].items():
+                doc[field] = doc.get(field, 0) + amount
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": 0})
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient()["memo-test"]
+
+
+@pytest.fixture
+def flaky_bulk():
+    return FlakyBulk
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from bson import ObjectId
+from starlette.requests import Request
+
+from app.analytics import RollupWriter
+from app.response_cache import response_cache
+from app.routes.analytics import post_series, trending_posts
+
+
+def _request(query: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/analytics/trending",
+            "query_string": query.encode(),
+            "headers": [],
+        }
+    )
+
+
+async def _record(db, activity):
+    """Flushes ``(post, metric, amount, at)`` tuples through a rollup writer into ``db``."""
+    writer = RollupWriter()
+    writer._db = db
+    for post_id, metric, amount, at in activity:
+        writer.record(post_id, metric, amount, at=at)
+    await writer.flush()
+
+
+@pytest.mark.anyio
+async def test_post_series_fills_empty_buckets_with_zeros(db):
+    post = ObjectId()
+    await db["posts"].insert_one({"_id": post, "category": "dev"})
+    await _record(
+        db, [(post, "views", 4, datetime(2026, 3, 1, 9, 15)), (post, "comments", 1, datetime(2026, 3, 1, 11))]
+    )
+
+    response = await post_series(
+        str(post), granularity="hour", start=datetime(2026, 3, 1, 8, 30), end=datetime(2026, 3, 1, 11, 30), db=db
+    )
+
+    series = orjson.loads(response.body)
+    assert series["granularity"] == "hour"
+    assert [(point["views"], point["comments"], point["likes"]) for point in series["points"]] == [
+        (0, 0, 0),
+        (4, 0, 0),
+        (0, 0, 0),
+        (0, 1, 0),
+    ]
+    assert series["points"][0]["t"].startswith("2026-03-01T08:00:00")
+
+
+@pytest.mark.anyio
+async def test_trending_ranks_window_activity_and_filters_by_category(db):
+    author = {"_id": ObjectId(), "username": "alice"}
+    await db["users"].insert_one(author)
+    dev, game, quiet, stale = ObjectId(), ObjectId(), ObjectId(), ObjectId()
+    await db["posts"].insert_many(
+        [
+            {"_id": dev, "author": author["_id"], "title": "dev", "category": "dev"},
+            {"_id": game, "author": author["_id"], "title": "game", "category": "game"},
+            {"_id": quiet, "author": author["_id"], "title": "quiet", "category": "dev"},
+            {"_id": stale, "author": author["_id"], "title": "stale", "category": "dev"},
+        ]
+    )
+    now = datetime.utcnow()
+    await _record(
+        db,
+        [
+            (dev, "views", 5, now),
+            (game, "views", 9, now - timedelta(hours=2)),
+            (quiet, "likes", 3, now),
+            # Busiest of all, but outside a one-day window.
+            (stale, "views", 50, now - timedelta(days=3)),
+        ],
+    )
+    await response_cache.clear()
+
+    everything = await trending_posts(
+        _request("window=day"), window="day", metric="views", category=None, limit=10, db=db
+    )
+    dev_only = await trending_posts(
+        _request("window=day&category=dev"), window="day", metric="views", category="dev", limit=10, db=db
+    )
+
+    assert [(item["title"], item["trend"]) for item in orjson.loads(everything.body)["items"]] == [
+        ("game", 9),
+        ("dev", 5),
+    ]
+    assert [(item["title"], item["trend"]) for item in orjson.loads(dev_only.body)["items"]] == [("dev", 5)]
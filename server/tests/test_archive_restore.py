@@ -0,0 +1,43 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.archive import ARCHIVE_COLLECTION, pack
+from app.routes.posts import delete_post, update_post
+
+
+@pytest.fixture
+async def archived(db):
+    post = {"_id": ObjectId(), "author": ObjectId(), "title": "old", "body": "x", "views": 10, "likes": 0}
+    post["created_at"] = post["updated_at"] = datetime(2020, 1, 1)
+    await db[ARCHIVE_COLLECTION].insert_one(pack(post, datetime(2021, 1, 1)))
+    return post
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("write", ["update", "delete"])
+async def test_other_users_cannot_restore_archived_posts(db, archived, write):
+    intruder = {"_id": ObjectId(), "username": "mallory"}
+    with pytest.raises(HTTPException) as error:
+        if write == "update":
+            await update_post(str(archived["_id"]), {"title": "mine"}, db=db, current_user=intruder)
+        else:
+            await delete_post(str(archived["_id"]), db=db, current_user=intruder)
+
+    assert error.value.status_code == 403
+    assert await db["posts"].find_one({"_id": archived["_id"]}) is None
+    assert await db[ARCHIVE_COLLECTION].find_one({"_id": archived["_id"]}) is not None
+
+
+@pytest.mark.anyio
+async def test_author_edit_restores_archived_post(db, archived):
+    author = {"_id": archived["author"], "username": "alice"}
+    await db["users"].insert_one(author)
+
+    updated = await update_post(str(archived["_id"]), {"title": "new"}, db=db, current_user=author)
+
+    assert updated["title"] == "new"
+    assert await db[ARCHIVE_COLLECTION].find_one({"_id": archived["_id"]}) is None
+    assert (await db["posts"].find_one({"_id": archived["_id"]}))["title"] == "new"
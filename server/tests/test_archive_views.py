@@ -0,0 +1,42 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.archive import ARCHIVE_COLLECTION, pack, restore_post
+from app.counters import archive_view_counter
+from app.routes.posts import _record_views
+
+
+@pytest.fixture
+async def archived(db, monkeypatch):
+    post = {"_id": ObjectId(), "author": ObjectId(), "title": "old", "body": "x", "views": 10, "likes": 0}
+    post["created_at"] = post["updated_at"] = datetime(2020, 1, 1)
+    await db[ARCHIVE_COLLECTION].insert_one(pack(post, datetime(2021, 1, 1)))
+    # Flushed by hand; the counter's own task is not started.
+    monkeypatch.setattr(archive_view_counter, "_db", db)
+    monkeypatch.setattr(archive_view_counter, "_pending", {})
+    return post["_id"]
+
+
+@pytest.mark.anyio
+async def test_views_of_archived_posts_keep_counting(db, archived):
+    assert await _record_views(db, [archived]) == {archived: 11}
+    assert await _record_views(db, [archived]) == {archived: 12}
+
+    await archive_view_counter.flush()
+
+    stored = await db[ARCHIVE_COLLECTION].find_one({"_id": archived})
+    assert stored["views"] == 12
+    assert await db["posts"].find_one({"_id": archived}) is None
+
+
+@pytest.mark.anyio
+async def test_restore_keeps_buffered_archive_views(db, archived):
+    await _record_views(db, [archived])
+
+    assert await restore_post(db, archived)
+    await archive_view_counter.flush()
+
+    restored = await db["posts"].find_one({"_id": archived})
+    assert restored["views"] == 11
@@ -0,0 +1,34 @@
+import pytest
+from bson import ObjectId
+
+from app.routes.batch import BatchContext, _get_posts
+from app.routes.posts import _collect_users
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("summary", [False, True])
+async def test_get_posts_handles_embedded_comments(db, summary):
+    author = {"_id": ObjectId(), "username": "alice"}
+    commenter = {"_id": ObjectId(), "username": "bob"}
+    await db["users"].insert_many([author, commenter])
+    post = {
+        "_id": ObjectId(),
+        "author": author["_id"],
+        "title": "legacy",
+        "body": "x",
+        "comments": [{"_id": ObjectId(), "author": commenter["_id"], "content": "hi"}],
+    }
+    await db["posts"].insert_one(post)
+    ctx = BatchContext(db, request=None, user=None)
+
+    render = await _get_posts(ctx, {"ids": [str(post["_id"])], "summary": summary})
+    result = render(await _collect_users(db, ctx.user_ids))
+
+    [item] = result["items"]
+    assert item["author"]["username"] == "alice"
+    if summary:
+        assert ctx.user_ids == {author["_id"]}
+        assert item["commentCount"] == 1
+    else:
+        assert ctx.user_ids == {author["_id"], commenter["_id"]}
+        assert item["comments"][0]["author"]["username"] == "bob"
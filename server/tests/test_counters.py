@@ -0,0 +1,80 @@
+import pytest
+from bson import ObjectId
+
+from app.counters import WriteBehindCounter
+from app.metrics import WRITE_BEHIND_DROPPED
+
+
+def _counter(collection, max_pending=100):
+    counter = WriteBehindCounter("test", "posts", interval=1, max_pending=max_pending)
+    counter._db = {"posts": collection}
+    return counter
+
+
+@pytest.mark.anyio
+async def test_partial_failure_requeues_only_failed_updates(flaky_bulk):
+    collection = flaky_bulk()
+    counter = _counter(collection)
+    first, second = ObjectId(), ObjectId()
+    counter.increment(first, "views", 3)
+    counter.increment(second, "views", 5)
+    written = []
+
+    async def listener(batch):
+        written.append(batch)
+
+    counter.flush_listeners = [listener]
+    collection.fail = {1}
+
+    assert await counter.flush() == 1
+    assert collection.totals == {first: {"views": 3}}
+    assert written == [{first: {"views": 3}}]
+    assert counter.pending(first, "views") == 0
+    assert counter.pending(second, "views") == 5
+    assert counter._backoff.failing
+
+    collection.fail = set()
+    assert await counter.flush() == 1
+    assert collection.totals == {first: {"views": 3}, second: {"views": 5}}
+    assert not counter._backoff.failing
+
+
+@pytest.mark.anyio
+async def test_outage_backs_off_and_caps_the_buffer(flaky_bulk):
+    collection = flaky_bulk()
+    counter = _counter(collection, max_pending=10)
+    post = ObjectId()
+    counter.increment(post, "views", 4)
+    collection.down = True
+
+    assert await counter.flush() == 0
+    assert counter.pending(post, "views") == 4
+    first_delay = counter._backoff.delay()
+    await counter.flush()
+    assert counter._backoff.delay() == 2 * first_delay
+
+    dropped_before = WRITE_BEHIND_DROPPED._values.get(("test",), 0)
+    for _ in range(20):
+        counter.increment(post, "views")
+    assert counter.pending(post, "views") == 10
+    assert WRITE_BEHIND_DROPPED._values[("test",)] - dropped_before == 14
+
+    collection.down = False
+    await counter.flush()
+    assert collection.totals == {post: {"views": 10}}
+    assert counter.pending(post, "views") == 0
+
+
+@pytest.mark.anyio
+async def test_update_that_keeps_failing_is_dropped(monkeypatch, flaky_bulk):
+    monkeypatch.setattr("app.counters.settings.FLUSH_RETRY_ATTEMPTS", 3)
+    collection = flaky_bulk()
+    counter = _counter(collection)
+    post = ObjectId()
+    counter.increment(post, "views")
+    collection.fail = {0}
+
+    for _ in range(3):
+        await counter.flush()
+    assert counter.pending(post, "views") == 0
+    assert collection.totals == {}
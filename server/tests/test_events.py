@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from app.events import SHUTDOWN_EVENT, EventBroker
+from app.routes.events import _event_stream
+
+
+@pytest.mark.anyio
+async def test_shutdown_reaches_a_client_with_a_full_queue(monkeypatch):
+    monkeypatch.setattr("app.events.settings.EVENTS_QUEUE_SIZE", 2)
+    broker = EventBroker()
+    subscriber = broker.subscribe()
+    for number in range(2):
+        broker._deliver({"type": "post.updated", "postId": str(number)})
+    assert subscriber.queue.full()
+
+    broker.close_streams()
+
+    assert await subscriber.next_event(timeout=1) == SHUTDOWN_EVENT
+    broker._deliver({"type": "post.updated", "postId": "late"})
+    assert await subscriber.next_event(timeout=1) == SHUTDOWN_EVENT
+
+
+@pytest.mark.anyio
+async def test_close_wakes_an_idle_stream(monkeypatch):
+    broker = EventBroker()
+    monkeypatch.setattr("app.routes.events.broker", broker)
+    stream = _event_stream()
+    assert await stream.__anext__() == "retry: 3000\n\n"
+
+    pending = asyncio.ensure_future(stream.__anext__())
+    await asyncio.sleep(0)
+    broker.close_streams()
+
+    assert (await asyncio.wait_for(pending, 1)).startswith("event: shutdown\n")
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert broker.subscriber_count == 0
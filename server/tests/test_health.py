@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from app import health as health_module
+from app.health import Health, warm_up
+from app.settings import settings
+
+
+class SlowDatabase:
+    async def command(self, name):
+        await asyncio.sleep(1)
+
+
+def _use_db(monkeypatch, db):
+    async def get_db():
+        return db
+
+    monkeypatch.setattr(health_module, "get_db", get_db)
+
+
+@pytest.mark.anyio
+async def test_ready_only_after_warm_up_and_until_drain(db, monkeypatch):
+    _use_db(monkeypatch, db)
+    closed = []
+    monkeypatch.setattr(health_module.broker, "close_streams", lambda: closed.append(True))
+    state = Health()
+
+    assert (await state.readiness())["ok"] is False
+    state.warmed_up = True
+    assert await state.readiness() == {"ok": True, "warmedUp": True, "draining": False, "mongo": True}
+
+    state.start_drain()
+    state.start_drain()
+    assert await state.readiness() == {"ok": False, "warmedUp": True, "draining": True, "mongo": True}
+    assert closed == [True]
+
+
+@pytest.mark.anyio
+async def test_slow_ping_fails_readiness(monkeypatch):
+    _use_db(monkeypatch, SlowDatabase())
+    monkeypatch.setattr(settings, "READY_PING_TIMEOUT", 0.01)
+    state = Health()
+    state.warmed_up = True
+
+    assert await state.readiness() == {"ok": False, "warmedUp": True, "draining": False, "mongo": False}
+
+
+def _app(seen):
+    app = FastAPI()
+
+    @app.get("/fast")
+    async def fast(page: int = 0):
+        seen.append(("fast", page))
+        return {}
+
+    @app.get("/broken")
+    async def broken():
+        raise HTTPException(status_code=500)
+
+    @app.get("/slow")
+    async def slow():
+        await asyncio.sleep(1)
+        seen.append(("slow", None))
+
+    return app
+
+
+@pytest.mark.anyio
+async def test_warm_up_replays_paths_and_marks_the_worker_warm(monkeypatch, caplog):
+    seen = []
+    monkeypatch.setattr(health_module, "health", Health())
+    monkeypatch.setattr(settings, "WARMUP_PATHS", "/fast?page=2, /broken,,")
+
+    await warm_up(_app(seen))
+
+    assert seen == [("fast", 2)]
+    assert "Warm-up request /broken answered 500" in caplog.text
+    assert health_module.health.warmed_up
+
+
+@pytest.mark.anyio
+async def test_warm_up_that_times_out_still_serves(monkeypatch, caplog):
+    seen = []
+    monkeypatch.setattr(health_module, "health", Health())
+    monkeypatch.setattr(settings, "WARMUP_PATHS", "/slow")
+    monkeypatch.setattr(settings, "WARMUP_TIMEOUT", 0.01)
+
+    await warm_up(_app(seen))
+
+    assert seen == []
+    assert "serving cold" in caplog.text
+    assert health_module.health.warmed_up
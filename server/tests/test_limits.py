@@ -0,0 +1,26 @@
+import pytest
+from starlette.requests import Request
+
+from app.limits import MemoryStore, Rule, viewer_bucket
+
+
+def _request(host: str) -> Request:
+    return Request({"type": "http", "client": (host, 1234), "headers": []})
+
+
+@pytest.mark.anyio
+async def test_cost_is_charged_all_or_nothing():
+    store = MemoryStore(100)
+    rule = Rule(burst=10, per_second=1)
+
+    assert await store.take("views:a", rule, now=0, cost=8) == 0
+    assert await store.take("views:a", rule, now=0, cost=3) == pytest.approx(1)
+    assert await store.take("views:a", rule, now=0, cost=2) == 0
+
+
+def test_viewer_bucket_keys_users_apart_from_their_address():
+    request = _request("10.0.0.1")
+
+    assert viewer_bucket("views", request, {"_id": "u1"}) == ("views", "u1")
+    assert viewer_bucket("views", request, {"_id": "u2"}) == ("views", "u2")
+    assert viewer_bucket("views", request, None) == ("views_anonymous", "10.0.0.1")
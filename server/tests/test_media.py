@@ -0,0 +1,74 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.media import ImageTooLarge, process_image, shutdown_media_pool, store_upload
+from app.routes.media import RangeNotSatisfiable, _parse_range
+from app.settings import settings
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("bytes=0-9", (0, 9)),
+        ("bytes=90-", (90, 99)),
+        ("bytes=-10", (90, 99)),
+        ("bytes=50-500", (50, 99)),
+        ("bytes=-500", (0, 99)),
+        ("bytes=abc", None),
+        ("bytes=-", None),
+        ("bytes=9-3", None),
+        ("bytes=0-1,5-6", None),
+        ("items=0-9", None),
+    ],
+)
+def test_parse_range(header, expected):
+    assert _parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        _parse_range(header, 100)
+
+
+def _png(size) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+@pytest.mark.filterwarnings("ignore::PIL.Image.DecompressionBombWarning")
+def test_process_image_rejects_declared_size_before_decoding(tmp_path, monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", Image.MAX_IMAGE_PIXELS)
+    source = tmp_path / "upload"
+    source.write_bytes(_png((20, 20)))
+
+    with pytest.raises(ImageTooLarge):
+        process_image(str(source), "ab" * 32, str(tmp_path), 8, max_pixels=399)
+    assert source.exists()
+
+
+@pytest.mark.anyio
+async def test_store_upload_streams_file_part(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_DIR", str(tmp_path))
+    image = _png((4, 3))
+    body = (
+        b"--b\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.png\"\r\n"
+        b"Content-Type: image/png\r\n\r\n" + image + b"\r\n--b--\r\n"
+    )
+
+    async def stream():
+        for offset in range(0, len(body), 7):
+            yield body[offset : offset + 7]
+
+    try:
+        stored = await store_upload("multipart/form-data; boundary=b", stream())
+    finally:
+        shutdown_media_pool()
+
+    assert (stored["size"], stored["width"], stored["height"]) == (len(image), 4, 3)
+    assert os.listdir(tmp_path / "tmp") == []
+    assert (tmp_path / stored["id"][:2] / f"{stored['id']}.png").read_bytes() == image
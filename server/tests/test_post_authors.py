@@ -0,0 +1,83 @@
+from collections import Counter
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.routes.posts import _build_post_responses
+
+QUERY_METHODS = {"find", "find_one", "aggregate", "count_documents", "distinct"}
+
+
+class CountingCollection:
+    def __init__(self, collection, name, queries):
+        self._collection = collection
+        self._name = name
+        self._queries = queries
+
+    def __getattr__(self, attr):
+        value = getattr(self._collection, attr)
+        if attr not in QUERY_METHODS:
+            return value
+
+        def counted(*args, **kwargs):
+            self._queries[self._name] += 1
+            return value(*args, **kwargs)
+
+        return counted
+
+
+class CountingDatabase:
+    """Passes everything through to ``db`` and counts the queries sent to each collection."""
+
+    def __init__(self, db):
+        self._db = db
+        self.queries = Counter()
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __getitem__(self, name):
+        return CountingCollection(self._db[name], name, self.queries)
+
+
+async def _seed_page(db, size):
+    now = datetime.utcnow()
+    authors = [{"_id": ObjectId(), "username": f"author{i}"} for i in range(size)]
+    commenters = [{"_id": ObjectId(), "username": f"commenter{i}"} for i in range(size)]
+    await db["users"].insert_many(authors + commenters)
+    posts = [
+        {"_id": ObjectId(), "author": author["_id"], "title": f"post {i}", "body": "", "created_at": now}
+        for i, author in enumerate(authors)
+    ]
+    comments = [
+        {"_id": ObjectId(), "post_id": post["_id"], "author": commenter["_id"], "content": "hi", "created_at": now}
+        for post, commenter in zip(posts, commenters)
+    ]
+    await db["comments"].insert_many(comments)
+    return posts, authors, commenters
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("size", [1, 5, 50])
+@pytest.mark.parametrize("summary", [False, True])
+async def test_queries_per_page_do_not_grow_with_page_size(db, size, summary):
+    posts, authors, commenters = await _seed_page(db, size)
+    counting = CountingDatabase(db)
+
+    items = await _build_post_responses(counting, posts, summary=summary)
+
+    assert counting.queries == ({"users": 1} if summary else {"users": 1, "comments": 1})
+    assert [item["author"]["username"] for item in items] == [author["username"] for author in authors]
+    if not summary:
+        assert [item["comments"][0]["author"]["username"] for item in items] == [
+            commenter["username"] for commenter in commenters
+        ]
+
+
+@pytest.mark.anyio
+async def test_empty_page_sends_no_queries(db):
+    counting = CountingDatabase(db)
+
+    assert await _build_post_responses(counting, [], summary=True) == []
+    assert counting.queries == {}
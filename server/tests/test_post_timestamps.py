@@ -0,0 +1,30 @@
+import pytest
+from bson import ObjectId
+
+from app.routes.posts import add_comment, create_post
+
+
+@pytest.fixture
+async def author(db):
+    user = {"_id": ObjectId(), "username": "alice"}
+    await db["users"].insert_one(user)
+    return user
+
+
+@pytest.mark.anyio
+async def test_created_post_matches_later_reads(db, author):
+    created = await create_post({"title": "hello", "body": "world"}, db=db, current_user=author)
+    stored = await db["posts"].find_one({"_id": ObjectId(created["id"])})
+
+    assert stored["created_at"].microsecond % 1000 == 0
+    assert created["createdAt"] == stored["created_at"].isoformat()
+    assert created["updatedAt"] == stored["updated_at"].isoformat()
+
+
+@pytest.mark.anyio
+async def test_added_comment_matches_later_reads(db, author):
+    created = await create_post({"title": "hello", "body": "world"}, db=db, current_user=author)
+    comment = await add_comment(created["id"], {"content": "hi"}, db=db, current_user=author)
+    stored = await db["comments"].find_one({"_id": ObjectId(comment["id"])})
+
+    assert comment["createdAt"] == stored["created_at"].isoformat()
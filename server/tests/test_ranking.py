@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.ranking import SCORE_FIELD, PopularityRanker, popularity_score
+from app.routes.posts import create_post
+
+
+def test_score_is_fixed_for_fixed_counters():
+    created = datetime(2026, 1, 1)
+    post = {"likes": 10, "views": 100, "created_at": created}
+    assert popularity_score(post) == popularity_score(dict(post))
+
+
+def test_newer_posts_need_fewer_points():
+    now = datetime(2026, 1, 1)
+    old = {"likes": 50, "created_at": now - timedelta(days=2)}
+    new = {"likes": 5, "created_at": now}
+    assert popularity_score(new) > popularity_score(old)
+    assert popularity_score({"likes": 6, "created_at": now}) > popularity_score(new)
+
+
+def test_embedded_and_counted_comments_both_score():
+    created = datetime(2026, 1, 1)
+    embedded = [{"_id": ObjectId()} for _ in range(2)]
+    mixed = {"commentCount": 3, "comments": embedded, "created_at": created}
+    assert popularity_score(mixed) == popularity_score({"commentCount": 5, "created_at": created})
+
+
+@pytest.mark.anyio
+async def test_only_dirty_posts_are_rewritten(db):
+    now = datetime.utcnow()
+    posts = [{"_id": ObjectId(), "likes": i, "created_at": now} for i in range(3)]
+    for post in posts:
+        post[SCORE_FIELD] = popularity_score(post)
+    await db["posts"].insert_many(posts)
+    ranker = PopularityRanker()
+    ranker._db = db
+
+    await db["posts"].update_one({"_id": posts[0]["_id"]}, {"$inc": {"likes": 100}})
+    ranker.mark_dirty([posts[0]["_id"]])
+    assert await ranker._rescore({"_id": {"$in": list(ranker._dirty)}}) == 1
+    assert await ranker.backfill() == 0
+
+    top = await db["posts"].find().sort(SCORE_FIELD, -1).to_list(length=None)
+    assert top[0]["_id"] == posts[0]["_id"]
+
+
+@pytest.mark.anyio
+async def test_new_posts_are_scored_on_insert(db):
+    author = {"_id": ObjectId(), "username": "alice"}
+    await db["users"].insert_one(author)
+    created = await create_post({"title": "hello", "body": "world"}, db=db, current_user=author)
+    stored = await db["posts"].find_one({"_id": ObjectId(created["id"])})
+    # Mongo keeps created_at to the millisecond, so the stored score may differ in the last digits.
+    assert stored[SCORE_FIELD] == pytest.approx(popularity_score(stored))
+
+
+@pytest.mark.anyio
+async def test_failed_rescore_keeps_posts_dirty(db, monkeypatch):
+    ranker = PopularityRanker()
+    ranker._db = db
+    post_id = ObjectId()
+    await db["posts"].insert_one({"_id": post_id, "likes": 3, "created_at": datetime.utcnow()})
+    ranker.mark_dirty([post_id])
+
+    async def fail(query):
+        raise RuntimeError("primary stepped down")
+
+    monkeypatch.setattr(ranker, "_rescore", fail)
+    with pytest.raises(RuntimeError):
+        await ranker.rescore_dirty()
+    assert ranker._dirty == {post_id}
+
+    monkeypatch.undo()
+    await ranker.rescore_dirty()
+    assert ranker._dirty == set()
+    assert SCORE_FIELD in await db["posts"].find_one({"_id": post_id})
@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+
+from app.analytics import RollupWriter
+from app.metrics import WRITE_BEHIND_DROPPED
+from app.settings import settings
+
+
+def _bucket_key(bucket):
+    return bucket["g"], bucket["scope"], bucket["key"]
+
+
+def _writer(collection, post):
+    writer = RollupWriter()
+    writer._db = {settings.ANALYTICS_COLLECTION: collection}
+    # Uncategorized, so each recorded minute becomes one update per granularity.
+    writer._categories.set(post, "")
+    return writer
+
+
+@pytest.mark.anyio
+async def test_partial_failure_retries_only_failed_updates(flaky_bulk):
+    collection = flaky_bulk(_bucket_key)
+    post = ObjectId()
+    writer = _writer(collection, post)
+    writer.record(post, "views", 3)
+    collection.fail = {1}
+
+    assert await writer.flush() == 2
+    assert collection.totals == {("minute", "post", post): {"views": 3}, ("day", "post", post): {"views": 3}}
+    assert writer.pending_count == 1
+
+    collection.fail = set()
+    assert await writer.flush() == 1
+    assert collection.totals[("hour", "post", post)] == {"views": 3}
+    assert writer.pending_count == 0
+    assert not writer._backoff.failing
+
+
+@pytest.mark.anyio
+async def test_outage_backs_off_and_caps_the_buffer(monkeypatch, flaky_bulk):
+    monkeypatch.setattr(settings, "ANALYTICS_MAX_PENDING", 3)
+    collection = flaky_bulk(_bucket_key)
+    post = ObjectId()
+    writer = _writer(collection, post)
+    writer.record(post, "views", 2)
+    collection.down = True
+
+    assert await writer.flush() == 0
+    first_delay = writer._backoff.delay()
+    await writer.flush()
+    assert writer._backoff.delay() == 2 * first_delay
+
+    dropped_before = WRITE_BEHIND_DROPPED._values.get(("rollups",), 0)
+    writer.record(post, "likes")
+    assert writer.pending_count == 3
+    assert WRITE_BEHIND_DROPPED._values[("rollups",)] - dropped_before == 1
+
+    collection.down = False
+    assert await writer.flush() == 3
+    assert collection.totals[("minute", "post", post)] == {"views": 2}
+    assert writer.pending_count == 0
+
+
+@pytest.mark.anyio
+async def test_flush_fans_out_to_every_granularity_and_the_category(db):
+    post = ObjectId()
+    await db["posts"].insert_one({"_id": post, "category": "dev"})
+    writer = RollupWriter()
+    writer._db = db
+    writer.record(post, "views", 2, at=datetime(2026, 3, 1, 10, 30, 15))
+    writer.record(post, "views", 1, at=datetime(2026, 3, 1, 10, 31))
+    writer.record(post, "likes", at=datetime(2026, 3, 1, 10, 31, 59))
+
+    # Minutes 10:30 and 10:31, hour 10:00 and the day, once for the post and once for "dev".
+    assert await writer.flush() == 8
+    buckets = await db[settings.ANALYTICS_COLLECTION].find({}, {"_id": 0}).to_list(length=None)
+    totals = {(b["g"], b["scope"], b["key"], b["t"]): (b.get("views", 0), b.get("likes", 0)) for b in buckets}
+    for scope, key in (("post", post), ("category", "dev")):
+        assert totals[("minute", scope, key, datetime(2026, 3, 1, 10, 30))] == (2, 0)
+        assert totals[("minute", scope, key, datetime(2026, 3, 1, 10, 31))] == (1, 1)
+        assert totals[("hour", scope, key, datetime(2026, 3, 1, 10))] == (3, 1)
+        assert totals[("day", scope, key, datetime(2026, 3, 1))] == (3, 1)
+    assert {b["category"] for b in buckets if b["scope"] == "post"} == {"dev"}
+
+
+@pytest.mark.anyio
+async def test_only_minute_and_hour_buckets_expire(db):
+    post = ObjectId()
+    await db["posts"].insert_one({"_id": post})
+    writer = RollupWriter()
+    writer._db = db
+    writer.record(post, "views", at=datetime(2026, 3, 1, 10, 30, 15))
+    await writer.flush()
+
+    expiry = {
+        bucket["g"]: bucket.get("expires_at")
+        async for bucket in db[settings.ANALYTICS_COLLECTION].find({"scope": "post"})
+    }
+    minute_kept = timedelta(hours=settings.ANALYTICS_MINUTE_RETENTION_HOURS)
+    hour_kept = timedelta(days=settings.ANALYTICS_HOUR_RETENTION_DAYS)
+    assert expiry == {
+        "minute": datetime(2026, 3, 1, 10, 31) + minute_kept,
+        "hour": datetime(2026, 3, 1, 11) + hour_kept,
+        "day": None,
+    }
+    # Uncategorized posts only get their own buckets.
+    assert await db[settings.ANALYTICS_COLLECTION].count_documents({"scope": "category"}) == 0
@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from app.serve import split_pool_budget
+from app.settings import settings
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    """Lets split_pool_budget write settings and environment; both are restored afterwards."""
+    for name in ("MONGO_MAX_POOL_SIZE", "MONGO_MIN_POOL_SIZE"):
+        monkeypatch.setattr(settings, name, getattr(settings, name))
+        monkeypatch.setenv(name, str(getattr(settings, name)))
+    return monkeypatch
+
+
+def test_budget_is_split_evenly_between_workers(pool_settings):
+    pool_settings.setattr(settings, "MONGO_POOL_BUDGET", 100)
+    pool_settings.setattr(settings, "MONGO_MIN_POOL_SIZE", 10)
+
+    split_pool_budget(4)
+
+    assert (settings.MONGO_MAX_POOL_SIZE, settings.MONGO_MIN_POOL_SIZE) == (25, 10)
+    assert (os.environ["MONGO_MAX_POOL_SIZE"], os.environ["MONGO_MIN_POOL_SIZE"]) == ("25", "10")
+
+
+def test_every_worker_keeps_at_least_one_connection(pool_settings):
+    pool_settings.setattr(settings, "MONGO_POOL_BUDGET", 10)
+    pool_settings.setattr(settings, "MONGO_MIN_POOL_SIZE", 5)
+
+    split_pool_budget(32)
+
+    assert (settings.MONGO_MAX_POOL_SIZE, settings.MONGO_MIN_POOL_SIZE) == (1, 1)
+
+
+def test_no_budget_leaves_the_pool_alone(pool_settings):
+    pool_settings.setattr(settings, "MONGO_POOL_BUDGET", 0)
+    pool_settings.setattr(settings, "MONGO_MAX_POOL_SIZE", 100)
+    pool_settings.setenv("MONGO_MAX_POOL_SIZE", "100")
+
+    split_pool_budget(4)
+
+    assert settings.MONGO_MAX_POOL_SIZE == 100
+    assert os.environ["MONGO_MAX_POOL_SIZE"] == "100"
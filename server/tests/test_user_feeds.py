@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.archive import ARCHIVE_COLLECTION, pack
+from app.routes.users import list_user_comments, list_user_posts
+from app.user_counts import COMMENTS, POSTS, bump_user_count, bump_user_counts, user_counts
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+async def alice(db):
+    """Alice wrote posts 0-2 (post 0 is archived) and commented once on each; Bob wrote one post."""
+    user = {"_id": ObjectId(), "username": "alice", POSTS: 3, COMMENTS: 3}
+    bob = {"_id": ObjectId(), "username": "bob"}
+    await db["users"].insert_many([user, bob])
+    posts = [
+        {"_id": ObjectId(), "author": user["_id"], "title": f"post {i}", "created_at": START + timedelta(hours=i)}
+        for i in range(3)
+    ]
+    await db[ARCHIVE_COLLECTION].insert_one(pack(posts[0], START))
+    await db["posts"].insert_many(
+        posts[1:] + [{"_id": ObjectId(), "author": bob["_id"], "title": "bob's", "created_at": START}]
+    )
+    comments = [
+        {
+            "_id": ObjectId(),
+            "post_id": post["_id"],
+            "author": user["_id"],
+            "content": f"on {post['title']}",
+            "created_at": START + timedelta(days=1, hours=i),
+        }
+        for i, post in enumerate(posts)
+    ]
+    await db["comments"].insert_many(comments)
+    return user
+
+
+async def _page(route, user_id, db, current_user=None, **params):
+    response = await route(user_id, db=db, current_user=current_user, **params)
+    return orjson.loads(response.body)
+
+
+@pytest.mark.anyio
+async def test_user_posts_are_paged_newest_first(db, alice):
+    first = await _page(list_user_posts, str(alice["_id"]), db, limit=1, cursor=None, summary=True, archived=False)
+    second = await _page(
+        list_user_posts, str(alice["_id"]), db, limit=1, cursor=first["nextCursor"], summary=True, archived=False
+    )
+    everything = await _page(list_user_posts, "me", db, alice, limit=10, cursor=None, summary=True, archived=True)
+
+    assert [item["title"] for item in first["items"] + second["items"]] == ["post 2", "post 1"]
+    assert second["nextCursor"] is None
+    assert [item["title"] for item in everything["items"]] == ["post 2", "post 1", "post 0"]
+    assert everything["user"]["username"] == "alice"
+    assert everything["count"] == 3
+
+
+@pytest.mark.anyio
+async def test_me_needs_a_login(db, alice):
+    with pytest.raises(HTTPException) as error:
+        await list_user_posts("me", limit=None, cursor=None, summary=False, archived=False, db=db, current_user=None)
+    assert error.value.status_code == 401
+
+
+@pytest.mark.anyio
+async def test_user_comments_carry_their_post(db, alice):
+    first = await _page(list_user_comments, str(alice["_id"]), db, limit=2, cursor=None)
+    rest = await _page(list_user_comments, str(alice["_id"]), db, limit=2, cursor=first["nextCursor"])
+
+    items = first["items"] + rest["items"]
+    assert [item["content"] for item in items] == ["on post 2", "on post 1", "on post 0"]
+    # The last one belongs to the archived post.
+    assert [item["postTitle"] for item in items] == ["post 2", "post 1", "post 0"]
+    assert rest["nextCursor"] is None
+    assert first["count"] == 3
+
+
+@pytest.mark.anyio
+async def test_counts_are_bumped_only_once_initialised(db, alice):
+    bob = await db["users"].find_one({"username": "bob"})
+
+    await bump_user_count(db, alice["_id"], POSTS)
+    await bump_user_count(db, bob["_id"], POSTS)
+    await bump_user_counts(db, COMMENTS, {alice["_id"]: -2, bob["_id"]: 5})
+
+    stored = {user["username"]: user async for user in db["users"].find()}
+    assert (stored["alice"][POSTS], stored["alice"][COMMENTS]) == (4, 1)
+    assert POSTS not in stored["bob"] and COMMENTS not in stored["bob"]
+
+
+@pytest.mark.anyio
+async def test_uninitialised_counts_fall_back_to_counting(db, alice):
+    await db["users"].update_one({"_id": alice["_id"]}, {"$unset": {POSTS: "", COMMENTS: ""}})
+    # Stored counters win even when they disagree with the collections.
+    assert await user_counts(db, {"_id": alice["_id"], POSTS: 7, COMMENTS: 0}) == {"posts": 7, "comments": 0}
+
+    user = await db["users"].find_one({"_id": alice["_id"]})
+    assert await user_counts(db, user) == {"posts": 3, "comments": 3}
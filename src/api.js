@@ -11,7 +11,10 @@ if (typeof window !== 'undefined' && process.env.NODE_ENV === 'development') {
 
 async function request(path, options = {}) {
   const headers = options.headers || {};
-  headers['Content-Type'] = headers['Content-Type'] || 'application/json';
+  // Let the browser set the multipart boundary for uploads.
+  if (!(options.body instanceof FormData)) {
+    headers['Content-Type'] = headers['Content-Type'] || 'application/json';
+  }
   const token = localStorage.getItem('mp_token');
   if (token) headers['Authorization'] = `Bearer ${token}`;
   const res = await fetch(API_BASE + path, { ...options, headers });
@@ -45,8 +48,48 @@ export async function login(username, password) {
   });
 }
 
-export async function fetchPosts() {
-  return request('/api/posts');
+// Paginated list: resolves to { items, nextCursor }. Pass nextCursor back to
+// load the following page.
+export async function fetchPostPage({ limit, cursor, sort, category, summary } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (cursor) params.set('cursor', cursor);
+  if (sort) params.set('sort', sort);
+  if (category) params.set('category', category);
+  if (summary) params.set('summary', 'true');
+  if (![...params.keys()].length) params.set('sort', 'latest');
+  // Trailing slash: the list route answers the bare path with a redirect.
+  return request(`/api/posts/?${params.toString()}`);
+}
+
+// A user's posts, newest first: { items, nextCursor, count }. Pass 'me' for the logged in user.
+export async function fetchUserPosts(userId, { limit, cursor, summary } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (cursor) params.set('cursor', cursor);
+  if (summary) params.set('summary', 'true');
+  const query = params.toString();
+  return request(`/api/users/${userId}/posts${query ? `?${query}` : ''}`);
+}
+
+export async function fetchPopularPosts({ limit, category } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (category) params.set('category', category);
+  const query = params.toString();
+  return request(`/api/posts/popular${query ? `?${query}` : ''}`);
+}
+
+export async function fetchPost(id) {
+  return request(`/api/posts/${id}`);
+}
+
+export async function searchPosts(q, { limit, cursor, category } = {}) {
+  const params = new URLSearchParams({ q });
+  if (limit) params.set('limit', String(limit));
+  if (cursor) params.set('cursor', cursor);
+  if (category) params.set('category', category);
+  return request(`/api/posts/search?${params.toString()}`);
 }
 
 export async function createPost(title, body, imageUrl, category) {
@@ -63,6 +106,18 @@ export async function createPost(title, body, imageUrl, category) {
   });
 }
 
+// Upload an image; returns absolute `url` and `thumbnailUrl` usable as imageUrl.
+export async function uploadImage(file) {
+  const form = new FormData();
+  form.append('file', file);
+  const data = await request('/api/media', { method: 'POST', body: form });
+  return {
+    ...data,
+    url: API_BASE + data.url,
+    thumbnailUrl: API_BASE + data.thumbnailUrl,
+  };
+}
+
 export async function editPost(id, updates) {
   const payload = { ...updates };
   if (Object.prototype.hasOwnProperty.call(payload, 'imageUrl')) {
@@ -85,6 +140,41 @@ export async function incrementPostViews(id) {
   return request(`/api/posts/${id}/views`, { method: 'POST' });
 }
 
+export async function fetchComments(postId, { limit, cursor } = {}) {
+  const params = new URLSearchParams();
+  if (limit) params.set('limit', String(limit));
+  if (cursor) params.set('cursor', cursor);
+  const query = params.toString();
+  return request(`/api/posts/${postId}/comments${query ? `?${query}` : ''}`);
+}
+
+// Run several reads in one round trip. Each operation gets back { id, status, data | error }.
+export const BATCH_MAX_OPERATIONS = 20;
+
+export async function runBatch(operations) {
+  return request('/api/batch', {
+    method: 'POST',
+    body: JSON.stringify({ operations }),
+  });
+}
+
+export async function setReaction(postId, type) {
+  return request(`/api/posts/${postId}/reactions`, {
+    method: 'POST',
+    body: JSON.stringify({ type }),
+  });
+}
+
+export async function clearReaction(postId) {
+  return request(`/api/posts/${postId}/reactions`, { method: 'DELETE' });
+}
+
+// Resolves to { [postId]: 'like' | 'dislike' | null } for the signed-in user.
+export async function fetchMyReactions(postIds) {
+  const params = new URLSearchParams({ ids: postIds.join(',') });
+  return request(`/api/posts/reactions/me?${params.toString()}`);
+}
+
 export async function addComment(postId, content) {
   return request(`/api/posts/${postId}/comments`, {
     method: 'POST',
@@ -107,4 +197,32 @@ export async function deleteComment(postId, commentId) {
   });
 }
 
+// Server-sent change events. `onEvent` receives the parsed event object
+// ({ type, postId, ... }). Returns a function that closes the stream.
+export function subscribeEvents(onEvent) {
+  if (typeof window === 'undefined' || typeof EventSource === 'undefined') {
+    return () => {};
+  }
+  const source = new EventSource(`${API_BASE}/api/events`);
+  const types = [
+    'post.created',
+    'post.updated',
+    'post.deleted',
+    'comment.added',
+    'comment.updated',
+    'comment.deleted',
+    'counters',
+    'resync',
+  ];
+  const handler = (evt) => {
+    try {
+      onEvent(JSON.parse(evt.data));
+    } catch (e) {
+      /* ignore malformed events */
+    }
+  };
+  types.forEach((type) => source.addEventListener(type, handler));
+  return () => source.close();
+}
+
 export default { request };
@@ -12,7 +12,7 @@ const TEXT = {
   remove: '삭제',
 };
 
-function CommentList({ comments, postId, currentUser, onRefresh }) {
+function CommentList({ comments, postId, currentUser, onEdited, onDeleted }) {
   const [editingId, setEditingId] = useState(null);
   const [editText, setEditText] = useState('');
 
@@ -24,7 +24,7 @@ function CommentList({ comments, postId, currentUser, onRefresh }) {
     if (!window.confirm(TEXT.confirmDelete)) return;
     try {
       await deleteComment(postId, comment._id || comment.id);
-      if (onRefresh) onRefresh();
+      if (onDeleted) onDeleted(comment);
     } catch (err) {
       alert(err.response?.message || err.message || TEXT.deleteFail);
     }
@@ -42,10 +42,14 @@ function CommentList({ comments, postId, currentUser, onRefresh }) {
 
   const submitEdit = async (comment) => {
     try {
-      await editComment(postId, comment._id || comment.id, editText);
+      const updated = await editComment(
+        postId,
+        comment._id || comment.id,
+        editText,
+      );
       setEditingId(null);
       setEditText('');
-      if (onRefresh) onRefresh();
+      if (onEdited && updated) onEdited(updated);
     } catch (err) {
       alert(err.response?.message || err.message || TEXT.editFail);
     }
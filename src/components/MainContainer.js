@@ -37,7 +37,7 @@ function PostCard({
     previewSource.length > 120
       ? `${previewSource.slice(0, 120)}...`
       : previewSource;
-  const thumbnail = post.imageUrl ? post.imageUrl : jungleLogo;
+  const thumbnail = post.thumbnailUrl || post.imageUrl || jungleLogo;
 
   return (
     <li className="post-card-horizontal">
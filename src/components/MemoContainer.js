@@ -1,4 +1,4 @@
-import React, { useCallback, useEffect, useMemo, useState } from 'react';
+import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import '../App.css';
 import MainContainer from './MainContainer';
 import AuthModal from './AuthModal';
@@ -7,9 +7,23 @@ import PostView from './PostView';
 import Pagination from './Pagination';
 import PopularPosts from './PopularPosts';
 import { getUser, clearAuth } from '../auth';
-import { fetchPosts, deletePost, incrementPostViews } from '../api';
-
-const PAGE_SIZE = 5;
+import {
+  fetchPostPage,
+  fetchPopularPosts,
+  fetchPost,
+  fetchUserPosts,
+  searchPosts,
+  deletePost,
+  incrementPostViews,
+  subscribeEvents,
+  setReaction,
+  clearReaction,
+  runBatch,
+  BATCH_MAX_OPERATIONS,
+} from '../api';
+
+const FEED_PAGE_SIZE = 10;
+const POPULAR_LIMIT = 6;
 
 const CATEGORY_VIEW_MAP = {
   gameBoard: 'game',
@@ -23,6 +37,28 @@ const POPULAR_SORT_OPTIONS = [
   { id: 'likes', labelKey: 'sortLikes' },
 ];
 
+// The server-side list a view shows; null when the view has no post feed.
+function feedFor(view, { popularSort, isLoggedIn, searchTerm }) {
+  if (view === 'support') return null;
+  if (view === 'search') return searchTerm ? { q: searchTerm } : null;
+  if (view === 'myPosts') return isLoggedIn ? { userId: 'me' } : null;
+  if (view === 'popular') {
+    return { sort: popularSort === 'likes' ? 'likes' : 'views' };
+  }
+  const category = CATEGORY_VIEW_MAP[view];
+  return category ? { sort: 'latest', category } : { sort: 'latest' };
+}
+
+function fetchFeedPage(feed, cursor) {
+  if (feed.q) {
+    return searchPosts(feed.q, { limit: FEED_PAGE_SIZE, cursor });
+  }
+  if (feed.userId) {
+    return fetchUserPosts(feed.userId, { limit: FEED_PAGE_SIZE, cursor });
+  }
+  return fetchPostPage({ ...feed, limit: FEED_PAGE_SIZE, cursor });
+}
+
 const VIEW_LABEL = {
   home: '메인 피드',
   today: '오늘의 소식',
@@ -42,8 +78,8 @@ const TEXT = {
   todaySubtitle: '따끈따끈한 최신글을 바로 만나보세요.',
   popularTitle: '인기글',
   popularSubtitle: '조회순과 좋아요순 중 원하는 기준으로 정렬해보세요.',
-  searchTitle: '제목으로 검색',
-  searchSubtitle: '키워드를 입력하면 제목에 포함된 글을 찾아드릴게요.',
+  searchTitle: '제목·본문 검색',
+  searchSubtitle: '키워드를 입력하면 제목이나 본문에 포함된 글을 찾아드릴게요.',
   searchPlaceholder: '예: Jungle 업데이트',
   searchEmptyTitle: '검색어를 입력해 주세요.',
   searchEmptyBody: '검색은 최소 1글자 이상 입력해야 해요.',
@@ -74,9 +110,13 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
   const [authOpen, setAuthOpen] = useState(false);
   const [currentUser, setCurrentUser] = useState(() => getUser());
   const [posts, setPosts] = useState([]);
+  const [popularPosts, setPopularPosts] = useState([]);
+  // A post opened from outside the current feed (the popular section).
+  const [openedPost, setOpenedPost] = useState(null);
   const [selectedPostId, setSelectedPostId] = useState(null);
   const [showEditor, setShowEditor] = useState(false);
-  const [page, setPage] = useState(1);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [reactions, setReactions] = useState(() => {
     try {
       const stored = localStorage.getItem('mp_post_reactions');
@@ -90,6 +130,8 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
   const [searchInput, setSearchInput] = useState('');
   const [searchTerm, setSearchTerm] = useState('');
   const [popularSort, setPopularSort] = useState('views');
+  // Latest comment.* event; the open PostView applies those for its post.
+  const [commentEvent, setCommentEvent] = useState(null);
 
   const currentUsername =
     currentUser && (currentUser.username || currentUser) ?
@@ -119,6 +161,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
       body: post.body || '',
       content: post.body || '',
       imageUrl: post.imageUrl || (post.assets && post.assets.cover) || '',
+      thumbnailUrl: post.thumbnailUrl || '',
       author:
         post.author && post.author.username
           ? post.author.username
@@ -144,7 +187,8 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
           : typeof post.reactions?.dislikes === 'number'
           ? post.reactions.dislikes
           : 0,
-      comments: Array.isArray(post.comments) ? post.comments : [],
+      // Search results come without a body; opening one loads the full post.
+      isSummary: typeof post.body !== 'string',
     };
   }, []);
 
@@ -156,11 +200,150 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
     }
   }, []);
 
+  // Keyed by value so switching views that share a feed does not reload it.
+  const feedKey = JSON.stringify(
+    feedFor(activeView, { popularSort, isLoggedIn, searchTerm }),
+  );
+  const feed = useMemo(() => JSON.parse(feedKey), [feedKey]);
+  // The feed the loaded pages belong to; responses for an older feed are dropped.
+  const feedRef = useRef(feed);
+
+  const loadPosts = useCallback(async () => {
+    const current = feedRef.current;
+    if (!current) return;
+    try {
+      const data = await fetchFeedPage(current, null);
+      if (feedRef.current !== current) return;
+      setPosts(
+        (data.items || []).map(mapServerPost).filter((post) => post && post.id),
+      );
+      setNextCursor(data.nextCursor || null);
+    } catch (err) {
+      console.error('Failed to load posts', err);
+    }
+  }, [mapServerPost]);
+
+  const loadMorePosts = async () => {
+    const current = feedRef.current;
+    if (!current || !nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const data = await fetchFeedPage(current, nextCursor);
+      if (feedRef.current !== current) return;
+      const mapped = (data.items || [])
+        .map(mapServerPost)
+        .filter((post) => post && post.id);
+      setPosts((prev) => {
+        const seen = new Set(prev.map((post) => post.id));
+        return [...prev, ...mapped.filter((post) => !seen.has(post.id))];
+      });
+      setNextCursor(data.nextCursor || null);
+    } catch (err) {
+      console.error('Failed to load more posts', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
+    feedRef.current = feed;
+    setPosts([]);
+    setNextCursor(null);
     loadPosts();
-    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [feed, loadPosts]);
+
+  const refreshPost = useCallback(
+    async (postId, isNew = false) => {
+      try {
+        const mapped = mapServerPost(await fetchPost(postId));
+        if (!mapped || !mapped.id) return;
+        const current = feedRef.current;
+        // New posts only belong at the top of a newest-first feed they match;
+        // "my posts" takes the caller's own, wherever they were written.
+        const listsNewPosts =
+          isNew &&
+          current &&
+          (current.userId === 'me'
+            ? mapped.author === currentUsername
+            : current.sort === 'latest' &&
+              (!current.category || current.category === mapped.category));
+        setPosts((prev) => {
+          const exists = prev.some((item) => item.id === mapped.id);
+          if (!exists) return listsNewPosts ? [mapped, ...prev] : prev;
+          return prev.map((item) => (item.id === mapped.id ? mapped : item));
+        });
+        setPopularPosts((prev) =>
+          prev.map((item) => (item.id === mapped.id ? mapped : item)),
+        );
+        setOpenedPost((prev) => (prev && prev.id === mapped.id ? mapped : prev));
+      } catch (err) {
+        console.error('Failed to refresh post', err);
+      }
+    },
+    [mapServerPost, currentUsername],
+  );
+
+  // Applies `update` to every post held in state; returning null removes it.
+  const updateKnownPosts = useCallback((update) => {
+    const apply = (list) => list.map(update).filter(Boolean);
+    setPosts(apply);
+    setPopularPosts(apply);
+    setOpenedPost((prev) => (prev ? update(prev) : prev));
   }, []);
 
+  const loadPopular = useCallback(async () => {
+    try {
+      const data = await fetchPopularPosts({ limit: POPULAR_LIMIT });
+      setPopularPosts(
+        (data.items || []).map(mapServerPost).filter((post) => post && post.id),
+      );
+    } catch (err) {
+      console.error('Failed to load popular posts', err);
+    }
+  }, [mapServerPost]);
+
+  useEffect(() => {
+    if (activeView === 'home') loadPopular();
+  }, [activeView, loadPopular]);
+
+  useEffect(() => {
+    return subscribeEvents((event) => {
+      switch (event.type) {
+        case 'counters':
+          updateKnownPosts((item) => {
+            const deltas = event.posts && event.posts[item.id];
+            if (!deltas) return item;
+            const next = { ...item };
+            Object.keys(deltas).forEach((field) => {
+              next[field] = (next[field] || 0) + deltas[field];
+            });
+            return next;
+          });
+          break;
+        case 'post.deleted':
+          updateKnownPosts((item) => (item.id === event.postId ? null : item));
+          break;
+        case 'post.created':
+          refreshPost(event.postId, true);
+          break;
+        case 'post.updated':
+          refreshPost(event.postId);
+          break;
+        case 'comment.added':
+        case 'comment.updated':
+        case 'comment.deleted':
+          setCommentEvent(event);
+          break;
+        case 'resync':
+          loadPosts();
+          loadPopular();
+          break;
+        default:
+          break;
+      }
+    });
+  }, [refreshPost, loadPosts, loadPopular, updateKnownPosts]);
+
   useEffect(() => {
     if (currentUser) {
       try {
@@ -176,9 +359,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
   useEffect(() => {
     setShowEditor(false);
     setSelectedPostId(null);
-    if (activeView !== 'home') {
-      setPage(1);
-    }
+    setOpenedPost(null);
     if (activeView !== 'search') {
       setSearchInput('');
       setSearchTerm('');
@@ -193,25 +374,16 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
     }
   }, [reactions]);
 
-  async function loadPosts() {
-    try {
-      const data = await fetchPosts();
-      const mapped = (data || [])
-        .map(mapServerPost)
-        .filter((post) => post && post.id);
-      setPosts(mapped);
-    } catch (err) {
-      console.error('Failed to load posts', err);
-    }
-  }
-
-  const totalPages = Math.max(1, Math.ceil(posts.length / PAGE_SIZE));
-
-  useEffect(() => {
-    if (page > totalPages) {
-      setPage(totalPages);
-    }
-  }, [page, totalPages]);
+  // Every post on screen: the feed, the popular section and an opened post.
+  const knownPosts = useMemo(() => {
+    const byId = new Map();
+    [...posts, ...popularPosts, ...(openedPost ? [openedPost] : [])].forEach(
+      (post) => {
+        if (!byId.has(post.id)) byId.set(post.id, post);
+      },
+    );
+    return [...byId.values()];
+  }, [posts, popularPosts, openedPost]);
 
   useEffect(() => {
     setReactions((prev) => {
@@ -219,7 +391,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
       let changed = false;
       const postIds = new Set();
 
-      posts.forEach((post) => {
+      knownPosts.forEach((post) => {
         const id = post.id;
         if (!id) return;
         postIds.add(id);
@@ -279,11 +451,44 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
 
       return changed ? next : prev;
     });
-  }, [posts]);
+  }, [knownPosts]);
 
+  useEffect(() => {
+    if (!isLoggedIn || knownPosts.length === 0) return undefined;
+    let cancelled = false;
+    const ids = knownPosts.map((post) => post.id).filter(Boolean);
+    const operations = [];
+    for (let i = 0; i < ids.length; i += 100) {
+      operations.push({ op: 'reactions.mine', ids: ids.slice(i, i + 100) });
+    }
+    const batches = [];
+    for (let i = 0; i < operations.length; i += BATCH_MAX_OPERATIONS) {
+      batches.push(operations.slice(i, i + BATCH_MAX_OPERATIONS));
+    }
+    Promise.all(batches.map((batch) => runBatch(batch)))
+      .then((responses) => {
+        if (cancelled) return;
+        const results = responses.flatMap((response) => response.results);
+        const viewerById = Object.assign(
+          {},
+          ...results.filter((result) => result.status === 200).map((result) => result.data),
+        );
+        setReactions((prev) => {
+          const next = { ...prev };
+          Object.keys(viewerById).forEach((id) => {
+            if (next[id]) next[id] = { ...next[id], viewer: viewerById[id] };
+          });
+          return next;
+        });
+      })
+      .catch((err) => console.error('Failed to load reactions', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [knownPosts, isLoggedIn]);
 
-  const decoratedPosts = useMemo(() => {
-    return posts.map((post) => {
+  const decoratePost = useCallback(
+    (post) => {
       const reaction = reactions[post.id] || {};
       return {
         ...post,
@@ -306,79 +511,19 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
             ? reaction.viewer
             : null,
       };
-    });
-  }, [posts, reactions]);
-
-  const myPosts = useMemo(() => {
-    if (!currentUsername) return [];
-    return decoratedPosts.filter((post) => {
-      const authorName =
-        post.author ||
-        post.authorObj?.username ||
-        post.authorObj?.name ||
-        '';
-      return authorName === currentUsername;
-    });
-  }, [decoratedPosts, currentUsername]);
-
-  const getCategoryPosts = useCallback(
-    (viewId) => {
-      const categoryValue = CATEGORY_VIEW_MAP[viewId];
-      if (!categoryValue) return [];
-      return decoratedPosts.filter(
-        (post) => post.category === categoryValue,
-      );
     },
-    [decoratedPosts],
+    [reactions],
   );
 
-  const visiblePosts = useMemo(() => {
-    const start = (page - 1) * PAGE_SIZE;
-    return decoratedPosts.slice(start, start + PAGE_SIZE);
-  }, [page, decoratedPosts]);
-
-  const latestPosts = useMemo(() => {
-    return [...decoratedPosts].sort(
-      (a, b) => new Date(b.createdAt) - new Date(a.createdAt),
-    );
-  }, [decoratedPosts]);
-
-  const popularFeed = useMemo(() => {
-    const activeSort = popularSort === 'likes' ? 'likes' : 'views';
-    const getTime = (value) => {
-      const time = value ? new Date(value).getTime() : 0;
-      return Number.isFinite(time) ? time : 0;
-    };
-
-    return [...decoratedPosts].sort((a, b) => {
-      const aLikes = typeof a.likes === 'number' ? a.likes : 0;
-      const bLikes = typeof b.likes === 'number' ? b.likes : 0;
-      const aViews = typeof a.views === 'number' ? a.views : 0;
-      const bViews = typeof b.views === 'number' ? b.views : 0;
-
-      if (activeSort === 'likes') {
-        const likeDiff = bLikes - aLikes;
-        if (likeDiff !== 0) return likeDiff;
-        const viewDiff = bViews - aViews;
-        if (viewDiff !== 0) return viewDiff;
-      } else {
-        const viewDiff = bViews - aViews;
-        if (viewDiff !== 0) return viewDiff;
-        const likeDiff = bLikes - aLikes;
-        if (likeDiff !== 0) return likeDiff;
-      }
-
-      return getTime(b.createdAt) - getTime(a.createdAt);
-    });
-  }, [decoratedPosts, popularSort]);
+  const decoratedPosts = useMemo(
+    () => posts.map(decoratePost),
+    [posts, decoratePost],
+  );
 
-  const searchResults = useMemo(() => {
-    if (!searchTerm) return [];
-    const keyword = searchTerm.toLowerCase();
-    return decoratedPosts.filter((post) =>
-      (post.title || '').toLowerCase().includes(keyword),
-    );
-  }, [searchTerm, decoratedPosts]);
+  const decoratedPopular = useMemo(
+    () => popularPosts.map(decoratePost),
+    [popularPosts, decoratePost],
+  );
 
   useEffect(() => {
     const timer = setTimeout(() => {
@@ -388,10 +533,13 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
   }, [searchInput]);
 
   useEffect(() => {
-    if (selectedPostId && !posts.some((post) => post.id === selectedPostId)) {
+    if (
+      selectedPostId &&
+      !knownPosts.some((post) => post.id === selectedPostId)
+    ) {
       setSelectedPostId(null);
     }
-  }, [posts, selectedPostId]);
+  }, [knownPosts, selectedPostId]);
 
   const toggleEditor = () => {
     if (!currentUser) {
@@ -420,7 +568,6 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
   const handlePostSaved = async (post) => {
     await loadPosts();
     setShowEditor(false);
-    setPage(1);
     onChangeView('home');
     if (post && (post._id || post.id)) {
       setSelectedPostId(post._id || post.id);
@@ -436,7 +583,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
     if (!window.confirm(TEXT.confirmDelete)) return;
     try {
       await deletePost(post._id || post.id);
-      await loadPosts();
+      updateKnownPosts((item) => (item.id === post.id ? null : item));
       setSelectedPostId(null);
     } catch (err) {
       alert(err.response?.message || err.message || TEXT.deleteFail);
@@ -447,39 +594,48 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
     if (!post || !post.id) return;
     setShowEditor(false);
     setSelectedPostId(post.id);
+    if (!posts.some((item) => item.id === post.id)) setOpenedPost(post);
+    if (post.isSummary) refreshPost(post.id);
     try {
       const updated = await incrementPostViews(post.id);
-      const mapped = mapServerPost(updated);
-      if (mapped && mapped.id) {
-        let replaced = false;
-        setPosts((prev) => {
-          const next = prev.map((item) => {
-            if (item.id === mapped.id) {
-              replaced = true;
-              return { ...item, ...mapped };
-            }
-            return item;
-          });
-          return replaced ? next : prev;
-        });
-        if (!replaced) {
-          await loadPosts();
-        }
-      } else {
-        await loadPosts();
+      if (updated && updated.id && typeof updated.views === 'number') {
+        updateKnownPosts((item) =>
+          item.id === updated.id ? { ...item, views: updated.views } : item,
+        );
       }
     } catch (err) {
       console.error('Failed to increment post views', err);
     }
   };
 
-  const handleClosePost = () => setSelectedPostId(null);
+  const handleClosePost = () => {
+    setSelectedPostId(null);
+    setOpenedPost(null);
+  };
 
   const handleReactPost = (postId, action) => {
     if (!postId || (action !== 'like' && action !== 'dislike')) return;
+    if (isLoggedIn) {
+      const toggledOff = (reactions[postId] || {}).viewer === action;
+      const call = toggledOff ? clearReaction(postId) : setReaction(postId, action);
+      call
+        .then((res) => {
+          if (!res) return;
+          setReactions((prev) => ({
+            ...prev,
+            [postId]: {
+              likes: res.likes,
+              dislikes: res.dislikes,
+              viewer: res.reaction,
+            },
+          }));
+        })
+        .catch((err) => console.error('Failed to save reaction', err));
+    }
     setReactions((prev) => {
       const current = prev[postId] || {};
-      const decorated = decoratedPosts.find((post) => post.id === postId);
+      const known = knownPosts.find((post) => post.id === postId);
+      const decorated = known ? decoratePost(known) : null;
       const baseLikes =
         typeof current.likes === 'number'
           ? current.likes
@@ -536,8 +692,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
     });
   };
 
-  const showPagination =
-    !showEditor && !selectedPostId && activeView === 'home' && totalPages > 1;
+  const showPagination = !showEditor && !selectedPostId && Boolean(feed);
 
   const viewTitle = VIEW_LABEL[activeView] || VIEW_LABEL.home;
 
@@ -550,19 +705,21 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
         onCancel={() => setShowEditor(false)}
         currentUser={currentUser}
         editing={
-          selectedPostId ? posts.find((p) => p.id === selectedPostId) : null
+          selectedPostId
+            ? knownPosts.find((p) => p.id === selectedPostId)
+            : null
         }
       />
     );
   } else if (selectedPostId) {
-    const selectedPost =
-      decoratedPosts.find((post) => post.id === selectedPostId) || null;
+    const selected = knownPosts.find((post) => post.id === selectedPostId);
+    const selectedPost = selected ? decoratePost(selected) : null;
     mainView = (
       <PostView
         post={selectedPost}
         currentUser={currentUser}
+        commentEvent={commentEvent}
         onBack={handleClosePost}
-        onRefresh={loadPosts}
         onRequestLogin={() => setAuthOpen(true)}
         onEditPost={handleEditPost}
         onDeletePost={handleDeletePost}
@@ -579,7 +736,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               <p>{TEXT.todaySubtitle}</p>
             </div>
             <MainContainer
-              posts={latestPosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -614,7 +771,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               </div>
             </div>
             <MainContainer
-              posts={popularFeed}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -632,7 +789,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               <p>{TEXT.myPostsSubtitle}</p>
             </div>
             <MainContainer
-              posts={myPosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -656,7 +813,6 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
         );
         break;
       case 'gameBoard': {
-        const boardPosts = getCategoryPosts('gameBoard');
         mainView = (
           <>
             <div className="content-card info-card">
@@ -664,7 +820,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               <p>{TEXT.gameSubtitle}</p>
             </div>
             <MainContainer
-              posts={boardPosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -676,7 +832,6 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
         break;
       }
       case 'studyBoard': {
-        const boardPosts = getCategoryPosts('studyBoard');
         mainView = (
           <>
             <div className="content-card info-card">
@@ -684,7 +839,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               <p>{TEXT.studySubtitle}</p>
             </div>
             <MainContainer
-              posts={boardPosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -696,7 +851,6 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
         break;
       }
       case 'devBoard': {
-        const boardPosts = getCategoryPosts('devBoard');
         mainView = (
           <>
             <div className="content-card info-card">
@@ -704,7 +858,7 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               <p>{TEXT.devSubtitle}</p>
             </div>
             <MainContainer
-              posts={boardPosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -729,9 +883,9 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
               />
             </div>
             {searchTerm ? (
-              searchResults.length > 0 ? (
+              decoratedPosts.length > 0 ? (
                 <MainContainer
-                  posts={searchResults}
+                  posts={decoratedPosts}
                   onOpenPost={handleOpenPost}
                   onEditPost={handleEditPost}
                   onDeletePost={handleDeletePost}
@@ -766,14 +920,9 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
       default:
         mainView = (
           <>
-            <PopularPosts
-              posts={decoratedPosts}
-              onOpenPost={handleOpenPost}
-              sortMode={popularSort}
-              onSortChange={setPopularSort}
-            />
+            <PopularPosts posts={decoratedPopular} onOpenPost={handleOpenPost} />
             <MainContainer
-              posts={visiblePosts}
+              posts={decoratedPosts}
               onOpenPost={handleOpenPost}
               onEditPost={handleEditPost}
               onDeletePost={handleDeletePost}
@@ -840,7 +989,11 @@ function MemoContainer({ activeView = 'home', onChangeView = () => {} }) {
         {mainView}
 
         {showPagination && (
-          <Pagination page={page} totalPages={totalPages} onChange={setPage} />
+          <Pagination
+            hasMore={Boolean(nextCursor)}
+            loading={loadingMore}
+            onLoadMore={loadMorePosts}
+          />
         )}
       </div>
 
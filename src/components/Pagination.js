@@ -1,26 +1,18 @@
 import React from 'react';
 
 const TEXT = {
-  prev: '이전',
-  next: '다음',
+  more: '더 보기',
+  loading: '불러오는 중...',
 };
 
-function Pagination({ page, totalPages, onChange }) {
-  if (totalPages <= 1) return null;
-
-  const goPrev = () => onChange(Math.max(1, page - 1));
-  const goNext = () => onChange(Math.min(totalPages, page + 1));
+// Cursor pagination: the server returns nextCursor until the list runs out.
+function Pagination({ hasMore, loading, onLoadMore }) {
+  if (!hasMore) return null;
 
   return (
     <div className="pagination">
-      <button type="button" onClick={goPrev} disabled={page === 1}>
-        {TEXT.prev}
-      </button>
-      <span className="pagination__page">
-        {page} / {totalPages}
-      </span>
-      <button type="button" onClick={goNext} disabled={page === totalPages}>
-        {TEXT.next}
+      <button type="button" onClick={onLoadMore} disabled={loading}>
+        {loading ? TEXT.loading : TEXT.more}
       </button>
     </div>
   );
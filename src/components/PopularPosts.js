@@ -1,55 +1,17 @@
-import React, { useMemo } from 'react';
+import React from 'react';
 
 const TEXT = {
   title: '인기글',
-  subtitle: '원하는 인기 기준으로 상위 글을 확인해보세요.',
+  subtitle: '조회와 좋아요가 몰리는 최신 글을 모아봤어요.',
   previewFallback: '내용 미리보기가 아직 없어요.',
   anonymous: '익명',
   like: '좋아요',
   views: '조회수',
-  sortViews: '조회순',
-  sortLikes: '좋아요순',
 };
 
-function PopularPosts({
-  posts = [],
-  onOpenPost = () => {},
-  sortMode = 'views',
-  onSortChange = () => {},
-}) {
-  const activeSort = sortMode === 'likes' ? 'likes' : 'views';
-
-  const popularList = useMemo(() => {
-    if (!Array.isArray(posts)) return [];
-    const getTime = (value) => {
-      const time = value ? new Date(value).getTime() : 0;
-      return Number.isFinite(time) ? time : 0;
-    };
-
-    return [...posts]
-      .map((post) => ({
-        ...post,
-        likes: typeof post.likes === 'number' ? post.likes : 0,
-        views: typeof post.views === 'number' ? post.views : 0,
-      }))
-      .sort((a, b) => {
-        if (activeSort === 'likes') {
-          const likeDiff = b.likes - a.likes;
-          if (likeDiff !== 0) return likeDiff;
-          const viewDiff = b.views - a.views;
-          if (viewDiff !== 0) return viewDiff;
-        } else {
-          const viewDiff = b.views - a.views;
-          if (viewDiff !== 0) return viewDiff;
-          const likeDiff = b.likes - a.likes;
-          if (likeDiff !== 0) return likeDiff;
-        }
-        return getTime(b.createdAt) - getTime(a.createdAt);
-      })
-      .slice(0, 6);
-  }, [posts, activeSort]);
-
-  if (!popularList.length) return null;
+// Renders the server-ranked popular posts in the order they were given.
+function PopularPosts({ posts = [], onOpenPost = () => {} }) {
+  if (!Array.isArray(posts) || !posts.length) return null;
 
   return (
     <section className="popular-section content-card">
@@ -58,28 +20,10 @@ function PopularPosts({
           <h2>{TEXT.title}</h2>
           <span className="popular-section__subtitle">{TEXT.subtitle}</span>
         </div>
-        <div className="popular-section__controls">
-          {['views', 'likes'].map((option) => {
-            const isActive = activeSort === option;
-            const label = option === 'views' ? TEXT.sortViews : TEXT.sortLikes;
-            return (
-              <button
-                key={option}
-                type="button"
-                className={`popular-sort-button${
-                  isActive ? ' is-active' : ''
-                }`}
-                onClick={() => onSortChange(option)}
-              >
-                {label}
-              </button>
-            );
-          })}
-        </div>
       </header>
 
       <div className="popular-grid">
-        {popularList.map((post, index) => {
+        {posts.map((post, index) => {
           const previewSource = post.content || post.body || '';
           const preview =
             previewSource.length > 80
@@ -102,10 +46,10 @@ function PopularPosts({
                     {post.author || TEXT.anonymous}
                   </span>
                   <span className="popular-card__metric popular-card__metric--views">
-                    {TEXT.views} {post.views.toLocaleString()}
+                    {TEXT.views} {(post.views || 0).toLocaleString()}
                   </span>
                   <span className="popular-card__metric popular-card__metric--likes">
-                    {TEXT.like} {post.likes.toLocaleString()}
+                    {TEXT.like} {(post.likes || 0).toLocaleString()}
                   </span>
                 </div>
               </div>
@@ -118,5 +62,3 @@ function PopularPosts({
 }
 
 export default PopularPosts;
-
-
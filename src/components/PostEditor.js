@@ -1,5 +1,5 @@
 import React, { useState, useEffect } from 'react';
-import { createPost, editPost } from '../api';
+import { createPost, editPost, uploadImage } from '../api';
 
 const TEXT = {
   loginRequired: '로그인 후 게시글을 작성할 수 있어요.',
@@ -8,6 +8,9 @@ const TEXT = {
   titlePlaceholder: '제목을 입력해주세요',
   imagePlaceholder: '대표 이미지 URL을 입력해주세요 (선택)',
   previewAlt: '미리보기',
+  uploadImage: '이미지 업로드',
+  uploading: '업로드 중...',
+  uploadFailed: '이미지 업로드 실패',
   contentPlaceholder: '내용을 입력해주세요',
   cancel: '취소',
   submit: '게시하기',
@@ -28,6 +31,7 @@ function PostEditor({ onSave, onCancel, currentUser, editing }) {
   const [title, setTitle] = useState('');
   const [content, setContent] = useState('');
   const [imageUrl, setImageUrl] = useState('');
+  const [uploading, setUploading] = useState(false);
   const [category, setCategory] = useState('');
 
   useEffect(() => {
@@ -93,6 +97,21 @@ function PostEditor({ onSave, onCancel, currentUser, editing }) {
     }
   };
 
+  const handleUpload = async (event) => {
+    const file = event.target.files && event.target.files[0];
+    event.target.value = '';
+    if (!file) return;
+    setUploading(true);
+    try {
+      const uploaded = await uploadImage(file);
+      setImageUrl(uploaded.url);
+    } catch (err) {
+      alert(err.response?.detail || err.message || TEXT.uploadFailed);
+    } finally {
+      setUploading(false);
+    }
+  };
+
   const handleCancel = () => {
     setTitle('');
     setContent('');
@@ -119,6 +138,15 @@ function PostEditor({ onSave, onCancel, currentUser, editing }) {
         onChange={(event) => setImageUrl(event.target.value)}
         placeholder={TEXT.imagePlaceholder}
       />
+      <label className="post-editor__label">
+        <span>{uploading ? TEXT.uploading : TEXT.uploadImage}</span>
+        <input
+          type="file"
+          accept="image/jpeg,image/png,image/gif,image/webp"
+          disabled={uploading}
+          onChange={handleUpload}
+        />
+      </label>
       <label className="post-editor__label" htmlFor="post-editor-category">
         <span>{TEXT.categoryLabel}</span>
         <select
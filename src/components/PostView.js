@@ -1,6 +1,6 @@
-import React, { useState } from 'react';
+import React, { useEffect, useState } from 'react';
 import CommentList from './CommentList';
-import { addComment } from '../api';
+import { addComment, fetchComments } from '../api';
 import jungleLogo from '../asset/jungle.png';
 
 const TEXT = {
@@ -14,25 +14,99 @@ const TEXT = {
   commentPlaceholder: '댓글을 입력해주세요',
   commentSubmit: '등록',
   commentFail: '댓글 등록 실패',
+  moreComments: '댓글 더 보기',
   anonymous: '익명',
   separator: '·',
   views: '조회수',
 };
 
+const COMMENT_PAGE_SIZE = 20;
+
+const commentId = (comment) => comment._id || comment.id;
+
+// Replace a comment we already show; append a new one only once the last page is loaded.
+function mergeComment(comments, comment, atEnd) {
+  const id = commentId(comment);
+  if (comments.some((item) => commentId(item) === id)) {
+    return comments.map((item) => (commentId(item) === id ? comment : item));
+  }
+  return atEnd ? [...comments, comment] : comments;
+}
+
 function PostView({
   post,
   currentUser,
+  commentEvent,
   onBack,
-  onRefresh,
   onRequestLogin,
   onEditPost,
   onDeletePost,
   onReact,
 }) {
   const [text, setText] = useState('');
+  const [comments, setComments] = useState([]);
+  const [commentCursor, setCommentCursor] = useState(null);
+  const [loadingComments, setLoadingComments] = useState(false);
+  const postId = post ? post._id || post.id : null;
+
+  useEffect(() => {
+    if (!postId) return undefined;
+    let cancelled = false;
+    setComments([]);
+    setCommentCursor(null);
+    fetchComments(postId, { limit: COMMENT_PAGE_SIZE })
+      .then((page) => {
+        if (cancelled) return;
+        setComments(page.items || []);
+        setCommentCursor(page.nextCursor || null);
+      })
+      .catch((err) => console.error('Failed to load comments', err));
+    return () => {
+      cancelled = true;
+    };
+  }, [postId]);
+
+  // Live comment events for this post, including our own writes echoed back.
+  useEffect(() => {
+    if (!commentEvent || commentEvent.postId !== postId) return;
+    if (commentEvent.type === 'comment.deleted') {
+      setComments((prev) =>
+        prev.filter((item) => commentId(item) !== commentEvent.commentId),
+      );
+    } else if (commentEvent.comment) {
+      setComments((prev) =>
+        mergeComment(prev, commentEvent.comment, !commentCursor),
+      );
+    }
+    // Only new events matter; the cursor is read as of their arrival.
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [commentEvent, postId]);
 
   if (!post) return null;
 
+  const loadMoreComments = async () => {
+    if (!commentCursor || loadingComments) return;
+    setLoadingComments(true);
+    try {
+      const page = await fetchComments(postId, {
+        limit: COMMENT_PAGE_SIZE,
+        cursor: commentCursor,
+      });
+      setComments((prev) => {
+        const seen = new Set(prev.map(commentId));
+        return [
+          ...prev,
+          ...(page.items || []).filter((item) => !seen.has(commentId(item))),
+        ];
+      });
+      setCommentCursor(page.nextCursor || null);
+    } catch (err) {
+      console.error('Failed to load comments', err);
+    } finally {
+      setLoadingComments(false);
+    }
+  };
+
   const handleComment = async () => {
     const trimmed = text.trim();
     if (!trimmed) return;
@@ -41,8 +115,8 @@ function PostView({
       return;
     }
     try {
-      await addComment(post._id || post.id, trimmed);
-      if (onRefresh) onRefresh();
+      const created = await addComment(postId, trimmed);
+      setComments((prev) => mergeComment(prev, created, !commentCursor));
       setText('');
     } catch (err) {
       alert(err.response?.message || err.message || TEXT.commentFail);
@@ -141,11 +215,29 @@ function PostView({
 
       <h4 className="post-view__comments-title">{TEXT.comments}</h4>
       <CommentList
-        comments={post.comments || []}
-        postId={post._id || post.id}
+        comments={comments}
+        postId={postId}
         currentUser={currentUser}
-        onRefresh={onRefresh}
+        onEdited={(updated) =>
+          setComments((prev) => mergeComment(prev, updated, false))
+        }
+        onDeleted={(removed) =>
+          setComments((prev) =>
+            prev.filter((item) => commentId(item) !== commentId(removed)),
+          )
+        }
       />
+      {commentCursor && (
+        <div className="pagination">
+          <button
+            type="button"
+            onClick={loadMoreComments}
+            disabled={loadingComments}
+          >
+            {TEXT.moreComments}
+          </button>
+        </div>
+      )}
 
       <div className="post-view__comment-form">
         <input